@@ -0,0 +1,87 @@
+"""
+Mede logins/s (verificação Argon2 + rehash) para combinações de parâmetros
+do Argon2 e tamanhos do executor de hash.
+
+Uso:
+    python benchmark_login.py
+    python benchmark_login.py --logins 200 --executores 1,2,4 \
+        --parametros 2:19456:1,3:65536:4 --tipo thread
+"""
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from passlib.context import CryptContext
+import argparse
+import multiprocessing
+import time
+
+SENHA = "senha-de-benchmark-123"
+
+_contexto = None
+
+
+def _iniciar_contexto(time_cost: int, memory_cost: int, parallelism: int):
+    global _contexto
+    _contexto = CryptContext(schemes=["argon2"],
+                             deprecated="auto",
+                             argon2__time_cost=time_cost,
+                             argon2__memory_cost=memory_cost,
+                             argon2__parallelism=parallelism)
+
+
+def _login(senha_hash: str) -> bool:
+    valida, _ = _contexto.verify_and_update(SENHA, senha_hash)
+    return valida
+
+
+def medir(time_cost: int, memory_cost: int, parallelism: int,
+          executores: int, logins: int, tipo: str) -> dict:
+    _iniciar_contexto(time_cost, memory_cost, parallelism)
+    senha_hash = _contexto.hash(SENHA)
+
+    if tipo == "process":
+        executor = ProcessPoolExecutor(max_workers=executores,
+                                       mp_context=multiprocessing.get_context("spawn"),
+                                       initializer=_iniciar_contexto,
+                                       initargs=(time_cost, memory_cost, parallelism))
+    else:
+        executor = ThreadPoolExecutor(max_workers=executores)
+
+    with executor:
+        # Aquecimento (sobe processos/threads antes de medir)
+        list(executor.map(_login, [senha_hash] * executores))
+
+        inicio = time.perf_counter()
+        resultados = list(executor.map(_login, [senha_hash] * logins))
+        duracao = time.perf_counter() - inicio
+
+    assert all(resultados), "Falha ao verificar a senha"
+    return {
+        "logins_por_segundo": logins / duracao,
+        "latencia_media_ms": duracao / logins * executores * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de login com Argon2")
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--executores", default="1,2,4",
+                        help="Tamanhos do executor, separados por vírgula")
+    parser.add_argument("--parametros", default="2:19456:1,3:65536:4",
+                        help="time_cost:memory_cost_kib:parallelism, separados por vírgula")
+    parser.add_argument("--tipo", choices=["thread", "process"], default="thread")
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print(f"🔐 Benchmark de login Argon2 ({args.logins} logins, executor {args.tipo})")
+    print("=" * 72)
+    print(f"{'time':>5} {'memória KiB':>12} {'paral.':>7} {'execs':>6} {'logins/s':>10} {'latência ms':>12}")
+
+    for parametro in args.parametros.split(","):
+        time_cost, memory_cost, parallelism = [int(p) for p in parametro.split(":")]
+        for executores in [int(e) for e in args.executores.split(",")]:
+            r = medir(time_cost, memory_cost, parallelism, executores, args.logins, args.tipo)
+            print(f"{time_cost:>5} {memory_cost:>12} {parallelism:>7} {executores:>6} "
+                  f"{r['logins_por_segundo']:>10.1f} {r['latencia_media_ms']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Mede o custo de subir um worker: tempo de import de metavida_app (que monta
+o app do perfil APP_PERFIL) e RSS do processo, com e sem o pré-carregamento
+das dependências pesadas.
+
+Cada worker é um processo Python novo (como um worker do uvicorn).
+
+Uso:
+    python benchmark_startup.py
+    python benchmark_startup.py --workers 4 --precarregar "",todas --saida startup.json
+    python benchmark_startup.py --perfil reservas
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Executado em cada worker: importa o app, aplica o warm-up e reporta as medidas
+SCRIPT_WORKER = """
+import json, resource, sys, time
+inicio = time.perf_counter()
+import metavida_app
+from vivio.app import precarregar_dependencias
+import_ms = (time.perf_counter() - inicio) * 1000
+tempos = precarregar_dependencias()
+total_ms = (time.perf_counter() - inicio) * 1000
+carregadas = [n for n in ("pandas", "sklearn", "matplotlib", "reportlab") if n in sys.modules]
+print(json.dumps({
+    "import_ms": round(import_ms, 1),
+    "warmup_ms": tempos,
+    "total_ms": round(total_ms, 1),
+    "rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    "modulos_pesados": carregadas,
+}))
+"""
+
+
+def medir_worker(precarregar: str, perfil: str) -> dict:
+    env = dict(os.environ, PRECARREGAR_DEPENDENCIAS=precarregar, APP_PERFIL=perfil)
+    resultado = subprocess.run([sys.executable, "-c", SCRIPT_WORKER],
+                               env=env, capture_output=True, text=True, check=True)
+    # A última linha é o JSON (as anteriores são logs do app)
+    return json.loads(resultado.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de startup dos workers")
+    parser.add_argument("--workers", type=int, default=3,
+                        help="Workers medidos por cenário")
+    parser.add_argument("--precarregar", default=",todas",
+                        help="Valores de PRECARREGAR_DEPENDENCIAS, separados por vírgula (vazio = sob demanda)")
+    parser.add_argument("--perfil", default="completo",
+                        help="APP_PERFIL dos workers (completo, reservas, api, tarefas)")
+    parser.add_argument("--saida", help="Grava os resultados em JSON neste arquivo")
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print(f"🚀 Benchmark de startup ({args.workers} worker(s) por cenário, perfil {args.perfil})")
+    print("=" * 72)
+    print(f"{'cenário':>12} {'worker':>7} {'import ms':>10} {'total ms':>10} {'RSS MB':>8}  módulos pesados")
+
+    resultados = []
+    for precarregar in args.precarregar.split(","):
+        cenario = precarregar or "sob demanda"
+        for worker in range(1, args.workers + 1):
+            r = medir_worker(precarregar, args.perfil)
+            r.update({"cenario": cenario, "perfil": args.perfil, "worker": worker})
+            resultados.append(r)
+            print(f"{cenario:>12} {worker:>7} {r['import_ms']:>10.1f} {r['total_ms']:>10.1f} "
+                  f"{r['rss_mb']:>8.1f}  {', '.join(r['modulos_pesados']) or '-'}")
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+        print(f"\n✅ Resultados gravados em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,44 +1,40 @@
 #!/usr/bin/env python3
 """
 Simple script to check and display database contents
+(uses the app engine, so it honours DATABASE_URL)
 """
-import sqlite3
+from sqlalchemy import inspect, text
 import sys
 
+from vivio.database import engine
+
 def main():
     try:
-        conn = sqlite3.connect('gym_wellness.db')
-        cursor = conn.cursor()
-        
-        # Get all tables
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
-        tables = cursor.fetchall()
-        
-        print("=== DATABASE TABLES ===")
-        for table in tables:
-            table_name = table[0]
-            print(f"\n📋 Table: {table_name}")
+        with engine.connect() as conn:
+            inspector = inspect(conn)
             
-            # Get row count
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-            count = cursor.fetchone()[0]
-            print(f"   Rows: {count}")
+            # Get all tables
+            tables = sorted(inspector.get_table_names())
             
-            # Show first few rows if any exist
-            if count > 0 and table_name in ['usuarios', 'unidades', 'programas']:
-                cursor.execute(f"SELECT * FROM {table_name} LIMIT 3")
-                rows = cursor.fetchall()
+            print("=== DATABASE TABLES ===")
+            for table_name in tables:
+                print(f"\n📋 Table: {table_name}")
                 
-                # Get column names
-                cursor.execute(f"PRAGMA table_info({table_name})")
-                columns = [col[1] for col in cursor.fetchall()]
+                # Get row count
+                count = conn.execute(text(f"SELECT COUNT(*) FROM {table_name}")).scalar()
+                print(f"   Rows: {count}")
                 
-                print(f"   Columns: {', '.join(columns)}")
-                print(f"   Sample data:")
-                for row in rows:
-                    print(f"      {row}")
-        
-        conn.close()
+                # Show first few rows if any exist
+                if count > 0 and table_name in ['usuarios', 'unidades', 'programas']:
+                    rows = conn.execute(text(f"SELECT * FROM {table_name} LIMIT 3")).all()
+                    
+                    # Get column names
+                    columns = [col["name"] for col in inspector.get_columns(table_name)]
+                    
+                    print(f"   Columns: {', '.join(columns)}")
+                    print(f"   Sample data:")
+                    for row in rows:
+                        print(f"      {tuple(row)}")
         
     except Exception as e:
         print(f"Error: {e}")
@@ -1,4 +1,6 @@
-from metavida_app import SessionLocal, Contrato, Jornada, EtapaJornada, Unidade
+from vivio.database import SessionLocal
+from vivio.migracoes import aplicar_migracoes
+from vivio.models import Contrato, Jornada, EtapaJornada, Unidade
 from datetime import datetime, timedelta
 import json
 
@@ -6,6 +8,7 @@ print("=" * 60)
 print("🚀 Populando Contratos e Jornadas de Renovação B2B")
 print("=" * 60)
 
+aplicar_migracoes()
 db = SessionLocal()
 
 unidade = db.query(Unidade).first()
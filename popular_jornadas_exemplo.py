@@ -3,42 +3,36 @@
 """
 Script para popular jornadas de exemplo no banco de dados
 """
-import sqlite3
+from vivio.database import SessionLocal
+from vivio.migracoes import aplicar_migracoes
+from vivio.models import Jornada, EtapaJornada
 import json
-from datetime import datetime
 
 def criar_jornada_onboarding():
     """Cria jornada de onboarding para novos usuários"""
-    conn = sqlite3.connect("gym_wellness.db")
-    cursor = conn.cursor()
+    db = SessionLocal()
     
     # Criar jornada de onboarding
-    cursor.execute("""
-        INSERT INTO jornadas (nome, descricao, gatilho_evento, ativa, unidade_id, data_criacao, data_atualizacao)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, (
-        "Onboarding Aluno Novo",
-        "Jornada automática de boas-vindas e integração para novos alunos",
-        "USUARIO_CRIADO",
-        1,  # ativa
-        1,  # unidade_id
-        datetime.utcnow().isoformat(),
-        datetime.utcnow().isoformat()
-    ))
-    
-    jornada_id = cursor.lastrowid
+    jornada = Jornada(
+        nome="Onboarding Aluno Novo",
+        descricao="Jornada automática de boas-vindas e integração para novos alunos",
+        gatilho_evento="USUARIO_CRIADO",
+        ativa=True,
+        unidade_id=1
+    )
+    db.add(jornada)
+    db.flush()
+    
+    jornada_id = jornada.id
     print(f"✅ Jornada criada com ID: {jornada_id}")
     
     # Etapa 1: Enviar email de boas-vindas
-    cursor.execute("""
-        INSERT INTO etapas_jornada (jornada_id, nome, ordem, acao_tipo, acao_config)
-        VALUES (?, ?, ?, ?, ?)
-    """, (
-        jornada_id,
-        "Enviar Email de Boas-Vindas",
-        1,
-        "ENVIAR_EMAIL",
-        json.dumps({
+    db.add(EtapaJornada(
+        jornada_id=jornada_id,
+        nome="Enviar Email de Boas-Vindas",
+        ordem=1,
+        acao_tipo="ENVIAR_EMAIL",
+        acao_config=json.dumps({
             "assunto": "Bem-vindo ao VIVIO CRM! 🎉",
             "corpo": "Olá {usuario_nome},\n\nSeja muito bem-vindo(a) à nossa academia! Estamos muito felizes em tê-lo(a) conosco.\n\nSeu cadastro foi realizado com sucesso e você já pode começar a aproveitar todos os nossos serviços.\n\nQualquer dúvida, estamos à disposição!\n\nAtenciosamente,\nEquipe VIVIO"
         })
@@ -46,23 +40,20 @@ def criar_jornada_onboarding():
     print("✅ Etapa 1 criada: Enviar Email de Boas-Vindas")
     
     # Etapa 2: Criar tarefa de acompanhamento
-    cursor.execute("""
-        INSERT INTO etapas_jornada (jornada_id, nome, ordem, acao_tipo, acao_config)
-        VALUES (?, ?, ?, ?, ?)
-    """, (
-        jornada_id,
-        "Criar Tarefa de Acompanhamento",
-        2,
-        "CRIAR_TAREFA",
-        json.dumps({
+    db.add(EtapaJornada(
+        jornada_id=jornada_id,
+        nome="Criar Tarefa de Acompanhamento",
+        ordem=2,
+        acao_tipo="CRIAR_TAREFA",
+        acao_config=json.dumps({
             "titulo": "Fazer contato com novo aluno",
             "descricao": "Ligar ou enviar mensagem para verificar se o aluno teve uma boa primeira experiência e oferecer ajuda para montar o treino inicial."
         })
     ))
     print("✅ Etapa 2 criada: Criar Tarefa de Acompanhamento")
     
-    conn.commit()
-    conn.close()
+    db.commit()
+    db.close()
     
     print(f"\n🎉 Jornada 'Onboarding Aluno Novo' criada com sucesso!")
     print(f"   - ID: {jornada_id}")
@@ -73,36 +64,29 @@ def criar_jornada_onboarding():
 
 def criar_jornada_retencao_churn():
     """Cria jornada de retenção para usuários com risco de churn"""
-    conn = sqlite3.connect("gym_wellness.db")
-    cursor = conn.cursor()
+    db = SessionLocal()
     
     # Criar jornada de retenção
-    cursor.execute("""
-        INSERT INTO jornadas (nome, descricao, gatilho_evento, ativa, unidade_id, data_criacao, data_atualizacao)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, (
-        "Retenção - Alto Risco de Churn",
-        "Jornada automática para engajar usuários com alto risco de abandono",
-        "CHURN_ALERTA",
-        1,  # ativa
-        1,  # unidade_id
-        datetime.utcnow().isoformat(),
-        datetime.utcnow().isoformat()
-    ))
-    
-    jornada_id = cursor.lastrowid
+    jornada = Jornada(
+        nome="Retenção - Alto Risco de Churn",
+        descricao="Jornada automática para engajar usuários com alto risco de abandono",
+        gatilho_evento="CHURN_ALERTA",
+        ativa=True,
+        unidade_id=1
+    )
+    db.add(jornada)
+    db.flush()
+    
+    jornada_id = jornada.id
     print(f"✅ Jornada criada com ID: {jornada_id}")
     
     # Etapa 1: Criar grupo de alto risco
-    cursor.execute("""
-        INSERT INTO etapas_jornada (jornada_id, nome, ordem, acao_tipo, acao_config)
-        VALUES (?, ?, ?, ?, ?)
-    """, (
-        jornada_id,
-        "Adicionar ao Grupo Alto Risco",
-        1,
-        "CRIAR_GRUPO",
-        json.dumps({
+    db.add(EtapaJornada(
+        jornada_id=jornada_id,
+        nome="Adicionar ao Grupo Alto Risco",
+        ordem=1,
+        acao_tipo="CRIAR_GRUPO",
+        acao_config=json.dumps({
             "nome_grupo": "Alto Risco de Churn (IA)",
             "descricao": "Usuários identificados pela IA com alta probabilidade de cancelamento",
             "cor": "#e74c3c"
@@ -111,15 +95,12 @@ def criar_jornada_retencao_churn():
     print("✅ Etapa 1 criada: Adicionar ao Grupo Alto Risco")
     
     # Etapa 2: Enviar email de reengajamento
-    cursor.execute("""
-        INSERT INTO etapas_jornada (jornada_id, nome, ordem, acao_tipo, acao_config)
-        VALUES (?, ?, ?, ?, ?)
-    """, (
-        jornada_id,
-        "Enviar Email de Reengajamento",
-        2,
-        "ENVIAR_EMAIL",
-        json.dumps({
+    db.add(EtapaJornada(
+        jornada_id=jornada_id,
+        nome="Enviar Email de Reengajamento",
+        ordem=2,
+        acao_tipo="ENVIAR_EMAIL",
+        acao_config=json.dumps({
             "assunto": "Sentimos sua falta! Oferta especial para você 💪",
             "corpo": "Olá {usuario_nome},\n\nPercebemos que você não tem vindo à academia nos últimos dias e queremos te ajudar a retomar sua rotina de treinos!\n\nQue tal voltarmos juntos? Temos uma oferta especial preparada especialmente para você:\n\n🎁 3 aulas grátis com personal trainer\n🎁 Avaliação física completa sem custo\n🎁 Plano de treino personalizado\n\nVamos juntos nessa jornada! Entre em contato conosco para agendar.\n\nAtenciosamente,\nEquipe VIVIO"
         })
@@ -127,23 +108,20 @@ def criar_jornada_retencao_churn():
     print("✅ Etapa 2 criada: Enviar Email de Reengajamento")
     
     # Etapa 3: Criar tarefa para o gerente
-    cursor.execute("""
-        INSERT INTO etapas_jornada (jornada_id, nome, ordem, acao_tipo, acao_config)
-        VALUES (?, ?, ?, ?, ?)
-    """, (
-        jornada_id,
-        "Criar Tarefa para Contato do Gerente",
-        3,
-        "CRIAR_TAREFA",
-        json.dumps({
+    db.add(EtapaJornada(
+        jornada_id=jornada_id,
+        nome="Criar Tarefa para Contato do Gerente",
+        ordem=3,
+        acao_tipo="CRIAR_TAREFA",
+        acao_config=json.dumps({
             "titulo": "Ligar para aluno em risco de churn",
             "descricao": "Entrar em contato pessoalmente com o aluno para entender os motivos da ausência e oferecer soluções personalizadas."
         })
     ))
     print("✅ Etapa 3 criada: Criar Tarefa para Contato do Gerente")
     
-    conn.commit()
-    conn.close()
+    db.commit()
+    db.close()
     
     print(f"\n🎉 Jornada 'Retenção - Alto Risco de Churn' criada com sucesso!")
     print(f"   - ID: {jornada_id}")
@@ -158,6 +136,8 @@ if __name__ == "__main__":
     print("=" * 60)
     print()
     
+    aplicar_migracoes()
+    
     print("📝 Criando jornada: Onboarding Aluno Novo...")
     criar_jornada_onboarding()
     
@@ -0,0 +1,24 @@
+from vivio.busca import reconstruir_indice_busca
+from vivio.database import SessionLocal
+from vivio.migracoes import aplicar_migracoes
+import sys
+
+print("=" * 60)
+print("🔎 Reconstruindo o Índice da Busca Global")
+print("=" * 60)
+
+# Uso: python reconstruir_busca.py
+# Necessário após cargas em lote (UPDATE/DELETE fora do ORM não passam pelos listeners)
+aplicar_migracoes()
+db = SessionLocal()
+
+try:
+    totais = reconstruir_indice_busca(db)
+    for tipo, total in totais.items():
+        print(f"✅ {tipo}: {total} entrada(s)")
+except Exception as e:
+    db.rollback()
+    print(f"❌ Erro ao reconstruir o índice de busca: {e}")
+    sys.exit(1)
+finally:
+    db.close()
@@ -0,0 +1,27 @@
+from vivio.database import SessionLocal
+from vivio.fatos import reconstruir_fatos_diarios
+from vivio.migracoes import aplicar_migracoes
+from datetime import date
+import sys
+
+print("=" * 60)
+print("📊 Reconstruindo Fatos Diários dos Relatórios")
+print("=" * 60)
+
+# Uso: python reconstruir_fatos.py [unidade_id] [data_inicio AAAA-MM-DD] [data_fim AAAA-MM-DD]
+unidade_id = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1] != "-" else None
+inicio = date.fromisoformat(sys.argv[2]) if len(sys.argv) > 2 else None
+fim = date.fromisoformat(sys.argv[3]) if len(sys.argv) > 3 else None
+
+aplicar_migracoes()
+db = SessionLocal()
+
+try:
+    resultado = reconstruir_fatos_diarios(db, unidade_id, inicio, fim)
+    print(f"✅ {resultado['linhas']} linha(s) gravada(s) de {resultado['inicio']} a {resultado['fim']}")
+except Exception as e:
+    db.rollback()
+    print(f"❌ Erro ao reconstruir fatos: {e}")
+    sys.exit(1)
+finally:
+    db.close()
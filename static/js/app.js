@@ -43,6 +43,47 @@ async function authFetch(url, options = {}) {
     }
 }
 
+// Busca todas as páginas de uma listagem paginada por cursor (cabeçalho
+// X-Proximo-Cursor) e devolve uma Response com o array completo
+async function fetchTodasPaginas(url, options = {}, fetcher = fetch) {
+    const itens = [];
+    let cursor = null;
+    let response;
+    do {
+        const separador = url.includes('?') ? (url.endsWith('?') ? '' : '&') : '?';
+        const pagina = cursor ? `${url}${separador}cursor=${encodeURIComponent(cursor)}` : url;
+        response = await fetcher(pagina, options);
+        if (!response.ok) {
+            return response;
+        }
+        itens.push(...await response.json());
+        cursor = response.headers.get('X-Proximo-Cursor');
+    } while (cursor);
+
+    return new Response(JSON.stringify(itens), {
+        status: 200,
+        headers: {
+            'Content-Type': 'application/json',
+            'X-Total-Count': response.headers.get('X-Total-Count') || String(itens.length)
+        }
+    });
+}
+
+// Busca global (typeahead) em membros, visitantes, aulas, equipe e exercícios.
+// tipos: lista opcional (ex.: ['usuario', 'visitante']); retorna {tipo: [resultados]}
+async function buscarGlobal(termo, tipos = null, limite = 5) {
+    const params = new URLSearchParams({ q: termo, limite: String(limite) });
+    if (tipos && tipos.length) {
+        params.set('tipos', tipos.join(','));
+    }
+    const response = await authFetch(`${API_BASE}/busca?${params}`);
+    if (!response.ok) {
+        throw new Error('Erro na busca');
+    }
+    const data = await response.json();
+    return data.resultados;
+}
+
 function handleSessionExpired() {
     localStorage.removeItem('token');
     localStorage.removeItem('authToken');
@@ -530,7 +571,7 @@ async function toggleFiltroClientesPresentes() {
         // Fetch contacts if not cached
         if (homeContactsCache.length === 0) {
             try {
-                const response = await authFetch(`${API_BASE}/usuarios`);
+                const response = await fetchTodasPaginas(`${API_BASE}/usuarios`, {}, authFetch);
                 if (response.ok) {
                     homeContactsCache = await response.json();
                 }
@@ -3237,7 +3278,7 @@ async function loadProgramas() {
     // Se houver autenticação, tentar carregar da API também
     if (authToken) {
         try {
-            const response = await fetch(`${API_BASE}/programas`, {
+            const response = await fetchTodasPaginas(`${API_BASE}/programas`, {
                 headers: {
                     'Authorization': `Bearer ${authToken}`
                 }
@@ -7155,7 +7196,7 @@ async function carregarContatos() {
     `;
     
     try {
-        const response = await authFetch(`${API_BASE}/usuarios`);
+        const response = await fetchTodasPaginas(`${API_BASE}/usuarios`, {}, authFetch);
         if (response.ok) {
             const usuarios = await response.json();
             contatosCache = usuarios;
@@ -8504,7 +8545,7 @@ async function loadExercicios() {
     }
     
     try {
-        const response = await fetch(`${API_BASE}/exercicios`, {
+        const response = await fetchTodasPaginas(`${API_BASE}/exercicios`, {
             headers: {
                 'Authorization': `Bearer ${authToken}`
             }
@@ -9187,7 +9228,7 @@ async function buscarExercicios() {
     url += params.join('&');
     
     try {
-        const response = await fetch(url, {
+        const response = await fetchTodasPaginas(url, {
             headers: {
                 'Authorization': `Bearer ${authToken}`
             }
@@ -11999,9 +12040,26 @@ async function treinarModeloIA() {
             throw new Error('Erro ao treinar modelo');
         }
         
-        const resultado = await response.json();
+        let job = await response.json();
+        
+        while (job.status === 'PENDENTE' || job.status === 'EXECUTANDO') {
+            await new Promise(resolve => setTimeout(resolve, 1500));
+            const statusResponse = await fetch(`/admin/ia/jobs_treinamento/${job.job_id}`, {
+                headers: {
+                    'Authorization': `Bearer ${token}`
+                }
+            });
+            if (!statusResponse.ok) {
+                throw new Error('Erro ao consultar treinamento');
+            }
+            job = await statusResponse.json();
+        }
+        
+        if (job.status !== 'CONCLUIDO') {
+            throw new Error(job.mensagem || 'Erro ao treinar modelo');
+        }
         
-        showToast(`Modelo treinado com sucesso! Acurácia: ${(resultado.acuracia * 100).toFixed(2)}%`, 'success');
+        showToast(job.mensagem || 'Modelo treinado com sucesso!', 'success');
         
         setTimeout(() => loadDashboardIA(), 1000);
         
@@ -0,0 +1,75 @@
+"""
+Fixtures dos testes: banco SQLite temporário (DATABASE_URL é lido no import
+de vivio.config, então é definido antes de importar o pacote)
+"""
+import os
+import tempfile
+import threading
+
+_diretorio_banco = tempfile.mkdtemp(prefix="vivio-testes-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_diretorio_banco}/teste.db"
+
+from contextlib import contextmanager
+from sqlalchemy import event
+import pytest
+
+from vivio.database import Base, SessionLocal, engine
+from vivio.fatos import processar_fatos_pendentes
+from vivio.models import Unidade, Usuario
+
+
+@pytest.fixture
+def banco():
+    """Schema recriado do zero a cada teste"""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    # Esvazia a fila do recálculo dos fatos antes que o schema seja apagado
+    processar_fatos_pendentes()
+    engine.dispose()
+
+
+@pytest.fixture
+def db(banco):
+    sessao = SessionLocal()
+    try:
+        yield sessao
+    finally:
+        sessao.close()
+
+
+@pytest.fixture
+def unidade(db):
+    unidade = Unidade(nome="Unidade Teste", endereco="Rua Teste, 1")
+    db.add(unidade)
+    db.commit()
+    return unidade
+
+
+@pytest.fixture
+def admin(db, unidade):
+    usuario = Usuario(nome="Admin Teste", email="admin@teste.com", senha="x",
+                      tipo="admin", unidade_id=unidade.id)
+    db.add(usuario)
+    db.commit()
+    return usuario
+
+
+@contextmanager
+def contar_sql():
+    """
+    Lista com os comandos SQL executados dentro do bloco por esta thread
+    (ignora o recálculo dos fatos em segundo plano)
+    """
+    comandos = []
+    thread = threading.get_ident()
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() == thread:
+            comandos.append(statement)
+
+    event.listen(engine, "before_cursor_execute", registrar)
+    try:
+        yield comandos
+    finally:
+        event.remove(engine, "before_cursor_execute", registrar)
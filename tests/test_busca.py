@@ -0,0 +1,42 @@
+"""
+Busca global: reindexação só quando colunas indexadas mudam e escopo de
+unidade para usuários sem unidade
+"""
+from datetime import datetime
+
+from conftest import contar_sql
+from vivio.busca import buscar_global
+from vivio.models import IndiceBusca, Unidade, Visitante
+
+
+def test_alteracao_fora_do_indice_nao_reindexa(db, admin):
+    entrada = db.query(IndiceBusca).filter(IndiceBusca.tipo == "usuario",
+                                           IndiceBusca.referencia_id == admin.id).one()
+    assert "admin teste" in entrada.texto
+
+    admin.ultima_atividade = datetime.utcnow()
+    with contar_sql() as comandos:
+        db.commit()
+    assert not any("indice_busca" in c for c in comandos), comandos
+
+    admin.nome = "Administradora"
+    db.commit()
+    db.refresh(entrada)
+    assert "administradora" in entrada.texto
+
+
+def test_usuario_sem_unidade_nao_ve_outras_unidades(db, unidade):
+    outra = Unidade(nome="Outra", endereco="Rua Outra, 2")
+    db.add(outra)
+    db.flush()
+    db.add_all([Visitante(nome="Marina Souza", unidade_id=unidade.id),
+                Visitante(nome="Marina Lopes", unidade_id=outra.id)])
+    db.commit()
+
+    def nomes(unidade_id, admin=False):
+        resultado = buscar_global(db, "marina", ["visitante"], unidade_id, 10, admin=admin)
+        return sorted(r["titulo"] for r in resultado["visitante"])
+
+    assert nomes(unidade.id) == ["Marina Souza"]
+    assert nomes(None) == []
+    assert nomes(None, admin=True) == ["Marina Lopes", "Marina Souza"]
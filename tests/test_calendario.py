@@ -0,0 +1,50 @@
+"""
+Regressão do N+1 em /calendario/unidade/{unidade_id}: o número de comandos
+SQL não pode crescer com a quantidade de aulas no período
+"""
+from datetime import datetime, timedelta
+import pytest
+
+from conftest import contar_sql
+from vivio.models import EventoAula, Instrutor, MembroEquipe, ReservaAula, Sala, Usuario
+from vivio.routers.calendario import get_calendario_unidade
+
+
+def criar_aulas(db, unidade, quantidade: int):
+    sala = Sala(nome="Sala 1", capacidade=20, unidade_id=unidade.id)
+    instrutor = Instrutor(nome="Instrutor", email="instrutor@teste.com", unidade_id=unidade.id)
+    membro = MembroEquipe(nome="Membro", email="membro@teste.com", cargo="Instrutor",
+                          unidade_id=unidade.id)
+    aluno = Usuario(nome="Aluno", email=f"aluno{quantidade}@teste.com", tipo="aluno",
+                    unidade_id=unidade.id)
+    db.add_all([sala, instrutor, membro, aluno])
+    db.flush()
+
+    inicio = datetime.utcnow() + timedelta(days=1)
+    for i in range(quantidade):
+        aula = EventoAula(nome_aula=f"Aula {i}", data_hora=inicio + timedelta(hours=i),
+                          duracao_minutos=60, limite_inscricoes=20, unidade_id=unidade.id,
+                          sala_id=sala.id,
+                          instrutor_id=instrutor.id if i % 2 else None,
+                          membro_equipe_id=None if i % 2 else membro.id,
+                          reservas_ativas=1)
+        db.add(aula)
+        db.flush()
+        db.add(ReservaAula(evento_aula_id=aula.id, usuario_id=aluno.id))
+    db.commit()
+
+
+@pytest.mark.parametrize("quantidade", [3, 30])
+def test_calendario_unidade_sem_n_mais_1(db, unidade, admin, quantidade):
+    criar_aulas(db, unidade, quantidade)
+    unidade_id = unidade.id
+    db.expire_all()
+
+    with contar_sql() as comandos:
+        eventos = get_calendario_unidade(unidade_id, None, None, db, admin)
+
+    assert len(eventos) == quantidade
+    assert all(e["extendedProps"]["reservas"] == 1 for e in eventos)
+    assert all(e["extendedProps"]["instrutor"] in ("Instrutor", "Membro") for e in eventos)
+    # Um único SELECT com os JOINs de instrutor, membro da equipe e sala
+    assert len(comandos) == 1, comandos
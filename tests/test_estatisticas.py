@@ -0,0 +1,19 @@
+"""
+Cache de estatísticas: login não invalida, mudança em coluna contada invalida
+"""
+from datetime import datetime
+
+from vivio.routers.estatisticas import _cache_stats, obter_stats_cache
+
+
+def test_invalida_so_colunas_contadas(db, admin):
+    _cache_stats.clear()
+    obter_stats_cache(("overview", None), lambda: {"usuarios": 1})
+
+    admin.ultima_atividade = datetime.utcnow()
+    db.commit()
+    assert ("overview", None) in _cache_stats
+
+    admin.ativo = False
+    db.commit()
+    assert ("overview", None) not in _cache_stats
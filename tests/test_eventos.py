@@ -0,0 +1,44 @@
+"""
+Eventos: falha de jornada entra na nova tentativa com espera e o grupo de
+alto risco não duplica
+"""
+import json
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from vivio import automacao, eventos
+from vivio.models import EventoSistema, Grupo, Jornada
+
+
+def test_falha_da_jornada_agenda_nova_tentativa(db, admin, monkeypatch):
+    db.add(Jornada(nome="Boas-vindas", gatilho_evento="USUARIO_CRIADO"))
+    evento = EventoSistema(tipo="USUARIO_CRIADO", payload=json.dumps({"usuario_id": admin.id}))
+    db.add(evento)
+    db.commit()
+    evento_id = evento.id
+
+    def falhar(db, usuario, jornada):
+        raise RuntimeError("SMTP fora do ar")
+
+    monkeypatch.setattr(automacao, "iniciar_jornada", falhar)
+
+    erro = eventos._processar_evento_isolado(evento_id)
+    assert erro == "SMTP fora do ar"
+
+    eventos.registrar_resultados_eventos(db, [evento_id], {evento_id: erro})
+    evento = db.get(EventoSistema, evento_id)
+    assert (evento.status, evento.tentativas, evento.processado) == ("PENDENTE", 1, False)
+    assert evento.proxima_tentativa is not None
+    assert evento.ultimo_erro == "SMTP fora do ar"
+
+
+def test_grupo_alto_risco_unico(db):
+    grupo = eventos.obter_grupo_alto_risco(db)
+    assert eventos.obter_grupo_alto_risco(db).id == grupo.id
+
+    # Simula o INSERT de outro evento que passou pela consulta ao mesmo tempo
+    db.add(Grupo(nome=eventos.GRUPO_ALTO_RISCO, tipo_grupo="dinamico"))
+    with pytest.raises(IntegrityError):
+        db.commit()
+    db.rollback()
+    assert db.query(Grupo).count() == 1
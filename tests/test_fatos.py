@@ -0,0 +1,97 @@
+"""
+Fatos diários: reconstrução de um banco atualizado (dados gravados antes dos
+listeners, com aula futura) e recálculo fora da transação que fez o commit
+"""
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+import threading
+
+from conftest import contar_sql
+from vivio.fatos import (
+    enfileirar_fatos, processar_fatos_pendentes, reconstruir_fatos_diarios, somar_fatos_diarios)
+from vivio.models import EventoAula, FatoDiarioUnidade, ReservaAula, Sala, Usuario, Visitante
+
+
+def popular_sem_listeners(engine, unidade_id: int) -> dict:
+    """Grava como um banco antigo: Session simples não passa pelos listeners de SessionLocal"""
+    hoje = datetime.utcnow().replace(hour=10, minute=0, second=0, microsecond=0)
+    with Session(bind=engine) as sessao:
+        aluno = Usuario(nome="Aluno", email="aluno@teste.com", tipo="aluno", unidade_id=unidade_id)
+        sala = Sala(nome="Sala 1", capacidade=20, unidade_id=unidade_id)
+        sessao.add_all([aluno, sala])
+        sessao.flush()
+
+        aulas = [EventoAula(nome_aula=f"Aula {dias}", data_hora=hoje + timedelta(days=dias),
+                            duracao_minutos=60, limite_inscricoes=10, unidade_id=unidade_id,
+                            sala_id=sala.id, reservas_ativas=1)
+                 for dias in (-3, 0, 15)]
+        sessao.add_all(aulas)
+        sessao.flush()
+        sessao.add_all([ReservaAula(evento_aula_id=aula.id, usuario_id=aluno.id) for aula in aulas])
+        sessao.add_all([Visitante(nome="Lead", unidade_id=unidade_id, data_visita=hoje),
+                        Visitante(nome="Lead futuro", unidade_id=unidade_id,
+                                  data_visita=hoje + timedelta(days=20), convertido=True)])
+        sessao.commit()
+    return {"aulas": 3, "capacidade": 30, "reservas": 3, "leads": 2, "conversoes": 1,
+            "ultimo_dia": (hoje + timedelta(days=20)).date()}
+
+
+def test_reconstrucao_inclui_atividade_futura(banco, db, unidade):
+    esperado = popular_sem_listeners(banco, unidade.id)
+    assert db.query(FatoDiarioUnidade).count() == 0
+
+    resultado = reconstruir_fatos_diarios(db)
+
+    assert resultado["fim"] == esperado["ultimo_dia"].isoformat()
+    totais = somar_fatos_diarios(db, unidade.id)
+    for metrica in ("aulas", "capacidade", "reservas", "leads", "conversoes"):
+        assert totais[metrica] == esperado[metrica], metrica
+
+
+def test_commit_so_enfileira_e_recalculo_vem_depois(banco, db, unidade):
+    sala = Sala(nome="Sala 1", capacidade=20, unidade_id=unidade.id)
+    db.add(sala)
+    db.flush()
+    # Lidos antes do commit: depois dele o refresh já abriria a conexão
+    unidade_id, sala_id = unidade.id, sala.id
+    db.commit()
+
+    thread_teste = threading.get_ident()
+    checkouts = []
+
+    def registrar(dbapi_connection, connection_record, connection_proxy):
+        if threading.get_ident() == thread_teste:
+            checkouts.append(connection_record)
+
+    event.listen(banco, "checkout", registrar)
+    try:
+        data_hora = datetime.utcnow() + timedelta(days=2)
+        db.add(EventoAula(nome_aula="Aula", data_hora=data_hora, duracao_minutos=60,
+                          limite_inscricoes=12, unidade_id=unidade_id, sala_id=sala_id))
+        with contar_sql() as comandos:
+            db.commit()
+    finally:
+        event.remove(banco, "checkout", registrar)
+
+    # Só a conexão da própria sessão, e a transação não toca nos fatos
+    assert len(checkouts) == 1
+    assert not any("fatos_diarios_unidade" in c for c in comandos), comandos
+
+    processar_fatos_pendentes()
+    fato = db.query(FatoDiarioUnidade).filter(
+        FatoDiarioUnidade.unidade_id == unidade_id,
+        FatoDiarioUnidade.data == data_hora.date()
+    ).one()
+    assert (fato.aulas, fato.capacidade) == (1, 12)
+
+
+def test_recalculo_concorrente_do_mesmo_dia(banco, db, unidade):
+    """Dias enfileirados duas vezes (ou por dois processos) não duplicam a linha"""
+    dia = datetime.utcnow().date()
+    enfileirar_fatos({(unidade.id, dia)})
+    processar_fatos_pendentes()
+    enfileirar_fatos({(unidade.id, dia)})
+    processar_fatos_pendentes()
+
+    assert db.query(FatoDiarioUnidade).filter(FatoDiarioUnidade.unidade_id == unidade.id).count() == 1
@@ -0,0 +1,130 @@
+"""
+Regressão dos índices: as consultas quentes, executadas pelos próprios
+endpoints e workers, não podem cair em varredura completa da tabela
+(EXPLAIN QUERY PLAN do SQLite)
+"""
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from fastapi import Response
+from sqlalchemy import event
+import pytest
+import threading
+
+from vivio.database import engine
+from vivio.eventos import registrar_evento, reivindicar_eventos
+from vivio.automacao import iniciar_jornada
+from vivio.models import (Attendance, EventoAula, Exercicio, Jornada, Programa, ReservaAula, Sala,
+                          Usuario, Visitante)
+from vivio.routers.aulas import (listar_attendance_aula, listar_attendance_usuario,
+                                 listar_reservas_aula, reservar_aula)
+from vivio.routers.autenticacao import buscar_usuario_por_email
+from vivio.routers.cadastros import listar_programas, listar_usuarios, listar_visitantes
+from vivio.routers.calendario import get_calendario_unidade
+from vivio.routers.exercicios import listar_exercicios
+
+
+@contextmanager
+def capturar_selects():
+    """SELECTs executados dentro do bloco por esta thread, com os parâmetros"""
+    consultas = []
+    thread = threading.get_ident()
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() == thread and statement.lstrip().upper().startswith("SELECT"):
+            consultas.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", registrar)
+    try:
+        yield consultas
+    finally:
+        event.remove(engine, "before_cursor_execute", registrar)
+
+
+def varreduras_completas(consultas: list) -> list:
+    # "SCAN tabela" sem índice (SQLite >= 3.36; versões antigas usam "SCAN TABLE")
+    varreduras = []
+    with engine.connect() as conn:
+        for statement, parametros in consultas:
+            for linha in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parametros):
+                detalhe = linha[-1]
+                if detalhe.startswith("SCAN") and "USING" not in detalhe:
+                    varreduras.append(f"{detalhe}: {statement}")
+    return varreduras
+
+
+def segunda_pagina(listar, **kwargs):
+    """Chama a listagem com limite 1 e devolve a chamada da página seguinte (cursor)"""
+    response = Response()
+    listar(response, limite=1, cursor=None, fields=None, **kwargs)
+    cursor = response.headers["X-Proximo-Cursor"]
+    return lambda: listar(Response(), limite=1, cursor=cursor, fields=None, **kwargs)
+
+
+@pytest.fixture
+def cenario(db, unidade, admin):
+    """Duas linhas de cada listagem, uma aula com reserva e presença e uma jornada"""
+    aluno = Usuario(nome="Aluno", email="aluno@teste.com", tipo="aluno", unidade_id=unidade.id)
+    sala = Sala(nome="Sala 1", capacidade=20, unidade_id=unidade.id)
+    db.add_all([aluno, sala,
+                Visitante(nome="Lead 1", unidade_id=unidade.id),
+                Visitante(nome="Lead 2", unidade_id=unidade.id),
+                Programa(nome="Programa 1", unidade_id=unidade.id),
+                Programa(nome="Programa 2", unidade_id=unidade.id),
+                Exercicio(nome="Agachamento", tipo="forca", unidade_id=unidade.id),
+                Exercicio(nome="Prancha", tipo="core"),
+                Jornada(nome="Boas-vindas", gatilho_evento="RESERVA_CRIADA")])
+    db.flush()
+    aula = EventoAula(nome_aula="Aula", data_hora=datetime.utcnow() + timedelta(days=1),
+                      duracao_minutos=60, limite_inscricoes=10, unidade_id=unidade.id,
+                      sala_id=sala.id)
+    db.add(aula)
+    db.flush()
+    db.add(Attendance(evento_aula_id=aula.id, usuario_id=aluno.id, status="presente"))
+    registrar_evento(db, "RESERVA_CRIADA", {"usuario_id": aluno.id})
+    return {"aula_id": aula.id, "aluno": aluno, "admin": admin, "unidade_id": unidade.id,
+            "jornada": db.query(Jornada).one()}
+
+
+CHAMADAS = {
+    "login (usuário por e-mail)":
+        lambda db, c: lambda: buscar_usuario_por_email(db, "admin@teste.com"),
+    "página de usuários":
+        lambda db, c: segunda_pagina(listar_usuarios, usuario=c["admin"], db=db),
+    "página de visitantes":
+        lambda db, c: segunda_pagina(listar_visitantes, usuario=c["admin"], db=db),
+    "página de programas":
+        lambda db, c: segunda_pagina(listar_programas, usuario=c["admin"], db=db),
+    "página de exercícios por nome":
+        lambda db, c: segunda_pagina(listar_exercicios, busca=None, tipo=None, favoritos=None,
+                                     ocultos=False, ordenar=None, usuario=c["admin"], db=db),
+    "página de exercícios recentes":
+        lambda db, c: segunda_pagina(listar_exercicios, busca=None, tipo=None, favoritos=None,
+                                     ocultos=False, ordenar="recentes", usuario=c["admin"], db=db),
+    "calendário da unidade":
+        lambda db, c: lambda: get_calendario_unidade(c["unidade_id"], None, None, db, c["admin"]),
+    "reserva de aula":
+        lambda db, c: lambda: reservar_aula(c["aula_id"], usuario=c["aluno"], db=db),
+    "inscritos da aula":
+        lambda db, c: lambda: listar_reservas_aula(c["aula_id"], usuario=c["admin"], db=db),
+    "presenças da aula":
+        lambda db, c: lambda: listar_attendance_aula(c["aula_id"], usuario=c["admin"], db=db),
+    "histórico de presença do usuário":
+        lambda db, c: lambda: listar_attendance_usuario(c["aluno"].id, None, None,
+                                                        usuario=c["admin"], db=db),
+    "fila de eventos do worker":
+        lambda db, c: lambda: reivindicar_eventos(db, 50),
+    "jornada em andamento do usuário":
+        lambda db, c: lambda: iniciar_jornada(db, c["aluno"], c["jornada"]),
+}
+
+
+@pytest.mark.parametrize("nome", list(CHAMADAS))
+def test_consulta_quente_usa_indice(db, cenario, nome):
+    chamada = CHAMADAS[nome](db, cenario)
+    db.commit()
+
+    with capturar_selects() as consultas:
+        chamada()
+
+    assert consultas, "nenhum SELECT capturado"
+    assert varreduras_completas(consultas) == []
@@ -0,0 +1,29 @@
+"""
+Totais em cache: limite de entradas (LRU) e remoção das expiradas
+"""
+from vivio import paginacao
+
+
+def test_cache_de_totais_limitado(monkeypatch):
+    monkeypatch.setattr(paginacao, "TOTAIS_CACHE_MAX", 3)
+    paginacao._cache_totais.clear()
+
+    for busca in ("a", "b", "c"):
+        paginacao.obter_total_cache(("usuarios", None, busca), lambda: 1)
+    # Lida por último: a menos usada passa a ser "b"
+    paginacao.obter_total_cache(("usuarios", None, "a"), lambda: 2)
+    paginacao.obter_total_cache(("usuarios", None, "d"), lambda: 1)
+
+    assert list(paginacao._cache_totais) == [
+        ("usuarios", None, "c"), ("usuarios", None, "a"), ("usuarios", None, "d")]
+
+
+def test_gravacao_remove_expiradas(monkeypatch):
+    paginacao._cache_totais.clear()
+    monkeypatch.setattr(paginacao, "TOTAIS_CACHE_TTL", -1)
+    paginacao.obter_total_cache(("usuarios", None, "velha"), lambda: 1)
+
+    monkeypatch.setattr(paginacao, "TOTAIS_CACHE_TTL", 60)
+    paginacao.obter_total_cache(("usuarios", None, "nova"), lambda: 1)
+
+    assert list(paginacao._cache_totais) == [("usuarios", None, "nova")]
@@ -0,0 +1,99 @@
+"""
+PoolSMTP contra um servidor SMTP local (aiosmtpd): conexões reaproveitadas
+entre envios, 5xx sem nova tentativa e 4xx repetido até o limite
+"""
+import asyncio
+import socket
+import pytest
+from aiosmtpd.controller import Controller
+
+from vivio.emails import PoolSMTP, montar_email
+
+
+class ServidorTeste:
+    """Handler do aiosmtpd: recusa destinatários pelo prefixo e conta sessões"""
+
+    def __init__(self):
+        self.sessoes = set()
+        self.entregues = []
+        self.rcpt_por_destinatario = {}
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        self.rcpt_por_destinatario[address] = self.rcpt_por_destinatario.get(address, 0) + 1
+        if address.startswith("rejeitado"):
+            return "550 Caixa inexistente"
+        if address.startswith("temporario"):
+            return "451 Tente novamente mais tarde"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.sessoes.add(id(session))
+        self.entregues.extend(envelope.rcpt_tos)
+        return "250 Mensagem aceita"
+
+
+def porta_livre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def servidor():
+    handler = ServidorTeste()
+    controller = Controller(handler, hostname="127.0.0.1", port=porta_livre())
+    controller.start()
+    try:
+        yield handler, controller
+    finally:
+        controller.stop()
+
+
+def criar_pool(controller, tamanho: int = 3) -> PoolSMTP:
+    return PoolSMTP(hostname=controller.hostname, port=controller.port, start_tls=False,
+                    tamanho=tamanho, tentativas=3, espera_inicial=0.01, timeout=5)
+
+
+def enviar(pool: PoolSMTP, destinatarios: list) -> list:
+    async def executar():
+        try:
+            return await pool.enviar_lote([montar_email(d, "Teste", "<p>Olá</p>") for d in destinatarios])
+        finally:
+            await pool.fechar()
+
+    return asyncio.run(executar())
+
+
+def test_lote_reaproveita_conexoes_do_pool(servidor):
+    handler, controller = servidor
+    destinatarios = [f"aluno{i}@teste.com" for i in range(20)]
+
+    resultados = enviar(criar_pool(controller, tamanho=3), destinatarios)
+
+    assert all(r["sucesso"] and r["tentativas"] == 1 for r in resultados)
+    assert sorted(handler.entregues) == sorted(destinatarios)
+    # 20 envios em 3 conexões: uma por vaga do pool
+    assert len(handler.sessoes) == 3
+
+
+def test_recusa_permanente_nao_repete(servidor):
+    handler, controller = servidor
+
+    [resultado] = enviar(criar_pool(controller), ["rejeitado@teste.com"])
+
+    assert not resultado["sucesso"]
+    assert resultado["tentativas"] == 1
+    assert "550" in resultado["erro"]
+    assert handler.rcpt_por_destinatario["rejeitado@teste.com"] == 1
+
+
+def test_recusa_temporaria_repete_ate_o_limite(servidor):
+    handler, controller = servidor
+
+    [resultado] = enviar(criar_pool(controller), ["temporario@teste.com"])
+
+    assert not resultado["sucesso"]
+    assert resultado["tentativas"] == 3
+    assert "451" in resultado["erro"]
+    assert handler.rcpt_por_destinatario["temporario@teste.com"] == 3
@@ -0,0 +1,12 @@
+"""
+Gym & Corporate Wellness Management System
+Sistema de Gestão para Academias e Wellness Corporativo
+
+A aplicação é montada por criar_app(perfil), que importa só os routers do
+perfil. Importar o pacote não acessa o banco.
+"""
+
+
+def criar_app(perfil: str = None, routers: list = None):
+    from vivio.app import criar_app as _criar_app
+    return _criar_app(perfil, routers)
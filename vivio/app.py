@@ -0,0 +1,187 @@
+"""
+Fábrica da aplicação FastAPI (criar_app) e perfis de routers
+"""
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
+from contextlib import asynccontextmanager
+import asyncio
+import time
+import importlib
+
+from vivio import busca, fatos  # registram os listeners do índice de busca e dos fatos diários
+from vivio.auth import encerrar_executor_hash
+from vivio.config import (
+    APP_PERFIL, APP_ROUTERS, CHURN_TREINO_HORA, EMAIL_OUTBOX_ATIVO, EVENTOS_WORKER_ATIVO,
+    PRECARREGAR_DEPENDENCIAS)
+from vivio.emails import fechar_pool_smtp, worker_outbox_email
+from vivio.eventos import encerrar_executor_eventos, worker_eventos
+from vivio.graficos import encerrar_pool_graficos
+from vivio.migracoes import aplicar_migracoes
+from vivio.treinamento import (
+    agendador_treino_churn, encerrar_pool_treinamento, recuperar_jobs_treinamento_interrompidos)
+
+
+# ============================================================
+# Inicializar app FastAPI
+# ============================================================
+
+DEPENDENCIAS_PESADAS = {
+    "pandas": "pandas",
+    "sklearn": "sklearn.linear_model",
+    "matplotlib": "matplotlib.figure",
+    "reportlab": "reportlab.platypus",
+}
+
+
+def precarregar_dependencias(nomes: list = None) -> dict:
+    """
+    Importa as dependências pesadas antes da primeira requisição (warm-up).
+    Retorna o tempo de import de cada uma, em ms
+    """
+    if nomes is None:
+        nomes = [n.strip() for n in PRECARREGAR_DEPENDENCIAS.split(",") if n.strip()]
+    if "todas" in nomes:
+        nomes = list(DEPENDENCIAS_PESADAS)
+
+    tempos = {}
+    for nome in nomes:
+        modulo = DEPENDENCIAS_PESADAS.get(nome)
+        if modulo is None:
+            print(f"⚠️ [STARTUP] Dependência desconhecida para pré-carregar: {nome}")
+            continue
+        inicio = time.perf_counter()
+        importlib.import_module(modulo)
+        tempos[nome] = round((time.perf_counter() - inicio) * 1000, 1)
+        print(f"[STARTUP] {nome} pré-carregado em {tempos[nome]} ms")
+    return tempos
+
+
+# Routers na ordem em que são montados (módulos importados só se usados)
+ROUTERS = {
+    "paginas": "vivio.routers.paginas",
+    "autenticacao": "vivio.routers.autenticacao",
+    "estatisticas": "vivio.routers.estatisticas",
+    "calendario": "vivio.routers.calendario",
+    "cadastros": "vivio.routers.cadastros",
+    "aulas": "vivio.routers.aulas",
+    "exercicios": "vivio.routers.exercicios",
+    "questionarios": "vivio.routers.questionarios",
+    "contratos": "vivio.routers.contratos",
+    "grupos": "vivio.routers.grupos",
+    "automacao": "vivio.routers.automacao",
+    "ia": "vivio.routers.ia",
+    "relatorios": "vivio.routers.relatorios",
+    "busca": "vivio.routers.busca",
+}
+
+# Perfis de worker: routers montados e se o processo roda as tarefas em
+# segundo plano (worker de eventos, outbox de e-mails, treino de churn)
+PERFIS = {
+    "completo": {"routers": list(ROUTERS), "tarefas": True},
+    # Frota só de reservas para horários de pico
+    "reservas": {"routers": ["paginas", "autenticacao", "calendario", "aulas"], "tarefas": False},
+    # API sem tarefas em segundo plano (quando outro processo roda o perfil "tarefas")
+    "api": {"routers": list(ROUTERS), "tarefas": False},
+    # Só tarefas em segundo plano, sem endpoints
+    "tarefas": {"routers": [], "tarefas": True},
+}
+
+
+def criar_lifespan(tarefas_ativas: bool):
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        await asyncio.to_thread(aplicar_migracoes)
+
+        tarefas = []
+        if PRECARREGAR_DEPENDENCIAS:
+            await asyncio.to_thread(precarregar_dependencias)
+
+        if tarefas_ativas:
+            if EVENTOS_WORKER_ATIVO:
+                tarefas.append(asyncio.create_task(worker_eventos()))
+
+            if EMAIL_OUTBOX_ATIVO:
+                tarefas.append(asyncio.create_task(worker_outbox_email()))
+
+            recuperar_jobs_treinamento_interrompidos()
+            if CHURN_TREINO_HORA:
+                tarefas.append(asyncio.create_task(agendador_treino_churn()))
+
+        yield
+
+        for tarefa in tarefas:
+            tarefa.cancel()
+            try:
+                await tarefa
+            except asyncio.CancelledError:
+                pass
+        # Dias ainda na fila do recálculo dos fatos (thread daemon morre com o processo)
+        try:
+            await asyncio.to_thread(fatos.processar_fatos_pendentes)
+        except Exception as e:
+            print(f"⚠️ Fatos diários pendentes não recalculados: {e}")
+        encerrar_executor_eventos()
+        encerrar_pool_treinamento()
+        encerrar_pool_graficos()
+        encerrar_executor_hash()
+        await fechar_pool_smtp()
+
+    return lifespan
+
+
+# Middleware para desabilitar cache
+async def add_no_cache_headers(request: Request, call_next):
+    response = await call_next(request)
+    if request.url.path.startswith("/static") or request.url.path == "/":
+        response.headers[
+            "Cache-Control"] = "no-cache, no-store, must-revalidate, max-age=0"
+        response.headers["Pragma"] = "no-cache"
+        response.headers["Expires"] = "0"
+    return response
+
+
+def criar_app(perfil: str = None, routers: list = None) -> FastAPI:
+    """
+    Monta a aplicação com os routers do perfil (APP_PERFIL) ou com a lista
+    explícita de routers (APP_ROUTERS). Não toca no banco: as migrações
+    rodam no startup do lifespan
+    """
+    perfil = perfil or APP_PERFIL
+    if perfil not in PERFIS:
+        raise ValueError(f"Perfil desconhecido: {perfil} (opções: {', '.join(PERFIS)})")
+
+    if routers is None and APP_ROUTERS:
+        routers = [r.strip() for r in APP_ROUTERS.split(",") if r.strip()]
+    if routers is None:
+        routers = PERFIS[perfil]["routers"]
+
+    desconhecidos = [r for r in routers if r not in ROUTERS]
+    if desconhecidos:
+        raise ValueError(f"Routers desconhecidos: {', '.join(desconhecidos)}")
+
+    app = FastAPI(
+        title="Gym & Corporate Wellness CRM",
+        description="Sistema de gestão para academias e wellness corporativo",
+        version="2.0.0",
+        lifespan=criar_lifespan(PERFIS[perfil]["tarefas"]),
+    )
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["X-Proximo-Cursor", "X-Total-Count"],
+    )
+    app.middleware("http")(add_no_cache_headers)
+
+    app.mount("/static", StaticFiles(directory="static"), name="static")
+
+    # Mantém a ordem de ROUTERS (a ordem de registro decide rotas ambíguas)
+    for nome in [r for r in ROUTERS if r in routers]:
+        app.include_router(importlib.import_module(ROUTERS[nome]).router)
+
+    print(f"[APP] Perfil '{perfil}' com routers: {', '.join(r for r in ROUTERS if r in routers) or '-'}")
+    return app
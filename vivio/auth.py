@@ -0,0 +1,192 @@
+"""
+Hash de senhas, tokens JWT e dependências de autenticação
+"""
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from typing import Optional
+from collections import OrderedDict
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import time
+import jwt
+from passlib.context import CryptContext
+from pydantic import BaseModel
+
+from vivio.config import (
+    ALGORITHM, ARGON2_MEMORY_COST, ARGON2_PARALLELISM, ARGON2_TIME_COST, AUTH_CACHE_MAX,
+    AUTH_CACHE_TTL, HASH_EXECUTOR, HASH_EXECUTOR_TAMANHO, SECRET_KEY)
+from vivio.database import SessionLocal, get_db, valores_atributo
+from vivio.models import Usuario
+
+
+pwd_context = CryptContext(schemes=["argon2"],
+                           deprecated="auto",
+                           argon2__time_cost=ARGON2_TIME_COST,
+                           argon2__memory_cost=ARGON2_MEMORY_COST,
+                           argon2__parallelism=ARGON2_PARALLELISM)
+security = HTTPBearer()
+
+
+def hash_senha(senha: str) -> str:
+    return pwd_context.hash(senha)
+
+
+def verificar_senha(senha_plana: str, senha_hash: str) -> bool:
+    return pwd_context.verify(senha_plana, senha_hash)
+
+
+def verificar_e_atualizar_senha(senha_plana: str, senha_hash: str):
+    """Retorna (válida, novo_hash); novo_hash só vem quando os parâmetros mudaram"""
+    return pwd_context.verify_and_update(senha_plana, senha_hash)
+
+
+# O Argon2 é pesado de propósito: roda num executor próprio para não
+# ocupar o threadpool que atende os endpoints síncronos
+_executor_hash = None
+
+
+def obter_executor_hash():
+    global _executor_hash
+    if _executor_hash is None:
+        if HASH_EXECUTOR == "process":
+            _executor_hash = ProcessPoolExecutor(max_workers=HASH_EXECUTOR_TAMANHO,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+        else:
+            _executor_hash = ThreadPoolExecutor(max_workers=HASH_EXECUTOR_TAMANHO,
+                                                thread_name_prefix="hash_senha")
+    return _executor_hash
+
+
+def encerrar_executor_hash():
+    global _executor_hash
+    if _executor_hash is not None:
+        _executor_hash.shutdown(wait=False, cancel_futures=True)
+        _executor_hash = None
+
+
+async def hash_senha_async(senha: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(obter_executor_hash(), hash_senha, senha)
+
+
+async def verificar_e_atualizar_senha_async(senha_plana: str, senha_hash: str):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(obter_executor_hash(), verificar_e_atualizar_senha,
+                                      senha_plana, senha_hash)
+
+
+def criar_token_acesso(data: dict, expira_em: timedelta = timedelta(hours=8)):
+    to_encode = data.copy()
+    expira = datetime.utcnow() + expira_em
+    to_encode.update({"exp": expira})
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+
+class UsuarioAutenticado(BaseModel):
+    """Dados do usuário do token, sem carregar a linha do ORM"""
+    id: int
+    email: str
+    nome: Optional[str] = None
+    tipo: Optional[str] = None
+    unidade_id: Optional[int] = None
+    ativo: Optional[bool] = None
+
+
+# Cache LRU: email (sub do token) -> (expira_em, UsuarioAutenticado)
+_cache_usuarios_autenticados = OrderedDict()
+_cache_usuarios_autenticados_lock = threading.Lock()
+
+
+def invalidar_usuario_autenticado(emails: set):
+    with _cache_usuarios_autenticados_lock:
+        for email in emails:
+            _cache_usuarios_autenticados.pop(email, None)
+
+
+def get_usuario_autenticado(credentials: HTTPAuthorizationCredentials = Depends(
+    security),
+                            db: Session = Depends(get_db)) -> UsuarioAutenticado:
+    """
+    Valida o token e devolve o principal do usuário. O principal fica em
+    cache por AUTH_CACHE_TTL segundos e é invalidado quando o usuário muda
+    """
+    try:
+        payload = jwt.decode(credentials.credentials,
+                             SECRET_KEY,
+                             algorithms=[ALGORITHM])
+    except jwt.PyJWTError:
+        raise HTTPException(status_code=401,
+                            detail="Token inválido ou expirado")
+
+    email = payload.get("sub")
+    if email is None:
+        raise HTTPException(status_code=401, detail="Token inválido")
+
+    agora = time.monotonic()
+    with _cache_usuarios_autenticados_lock:
+        em_cache = _cache_usuarios_autenticados.get(email)
+        if em_cache and em_cache[0] > agora:
+            _cache_usuarios_autenticados.move_to_end(email)
+            return em_cache[1]
+
+    usuario = db.query(
+        Usuario.id, Usuario.email, Usuario.nome, Usuario.tipo,
+        Usuario.unidade_id, Usuario.ativo
+    ).filter(Usuario.email == email).first()
+    if usuario is None:
+        raise HTTPException(status_code=401,
+                            detail="Usuário não encontrado")
+
+    principal = UsuarioAutenticado(**usuario._asdict())
+    with _cache_usuarios_autenticados_lock:
+        _cache_usuarios_autenticados[email] = (agora + AUTH_CACHE_TTL, principal)
+        _cache_usuarios_autenticados.move_to_end(email)
+        while len(_cache_usuarios_autenticados) > AUTH_CACHE_MAX:
+            _cache_usuarios_autenticados.popitem(last=False)
+
+    return principal
+
+
+def get_current_user(principal: UsuarioAutenticado = Depends(get_usuario_autenticado),
+                     db: Session = Depends(get_db)) -> Usuario:
+    usuario = db.get(Usuario, principal.id)
+    if usuario is None:
+        invalidar_usuario_autenticado({principal.email})
+        raise HTTPException(status_code=401,
+                            detail="Usuário não encontrado")
+
+    return usuario
+
+
+def get_admin_user(current_user: Usuario = Depends(get_current_user)):
+    """Verifica se o usuário atual é administrador"""
+    if current_user.tipo != "admin":
+        raise HTTPException(status_code=403, detail="Acesso negado. Requer privilégios de administrador.")
+    return current_user
+
+
+def _coletar_usuarios_alterados(session, flush_context):
+    emails = session.info.setdefault("usuarios_alterados", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Usuario):
+            emails.update(valores_atributo(obj, "email"))
+
+
+def _aplicar_usuarios_alterados(session):
+    emails = session.info.pop("usuarios_alterados", None)
+    if emails:
+        invalidar_usuario_autenticado(emails)
+
+
+def _descartar_usuarios_alterados(session):
+    session.info.pop("usuarios_alterados", None)
+
+
+event.listen(SessionLocal, "after_flush", _coletar_usuarios_alterados)
+event.listen(SessionLocal, "after_commit", _aplicar_usuarios_alterados)
+event.listen(SessionLocal, "after_rollback", _descartar_usuarios_alterados)
@@ -0,0 +1,199 @@
+"""
+Jornadas de automação disparadas pelos eventos
+"""
+from sqlalchemy.orm import Session
+from datetime import datetime
+import json
+
+from vivio.emails import enfileirar_email
+from vivio.models import (
+    Agenda, EtapaJornada, EventoSistema, Grupo, Jornada, Usuario, UsuarioJornada)
+
+
+# ============================================================
+# Funções de Automação - Sistema de Jornadas
+# ============================================================
+
+
+def executar_acao_workflow(db: Session, usuario: Usuario, etapa: EtapaJornada):
+    """Executa a ação definida na etapa do workflow"""
+    try:
+        config = json.loads(etapa.acao_config)
+        
+        if etapa.acao_tipo == "ENVIAR_EMAIL":
+            assunto = config.get("assunto", "Notificação VIVIO CRM")
+            corpo = config.get("corpo", "Mensagem automática.")
+            
+            # Personalização básica
+            corpo = corpo.replace("{usuario_nome}", usuario.nome).replace("{usuario_email}", usuario.email)
+            
+            enfileirar_email(db, usuario.email, assunto, corpo, origem="WORKFLOW")
+            print(f"[WORKFLOW] E-mail '{assunto}' enfileirado para {usuario.email}")
+            return True
+            
+        elif etapa.acao_tipo == "CRIAR_TAREFA":
+            titulo = config.get("titulo", "Tarefa de Acompanhamento")
+            descricao = config.get("descricao", f"Acompanhar usuário {usuario.nome} na jornada.")
+            
+            tarefa = Agenda(
+                usuario_id=usuario.id,
+                titulo=titulo,
+                descricao=descricao,
+                tipo_atividade="tarefa_automatica",
+                concluida=False
+            )
+            db.add(tarefa)
+            db.commit()
+            print(f"[WORKFLOW] Tarefa '{titulo}' criada para {usuario.nome}")
+            return True
+            
+        elif etapa.acao_tipo == "MUDAR_STATUS":
+            novo_status = config.get("status")
+            if novo_status == "inativo":
+                usuario.ativo = False
+            elif novo_status == "ativo":
+                usuario.ativo = True
+            db.commit()
+            print(f"[WORKFLOW] Status do usuário {usuario.nome} alterado para {novo_status}")
+            return True
+            
+        elif etapa.acao_tipo == "CRIAR_GRUPO":
+            nome_grupo = config.get("nome_grupo", "Grupo Automático")
+            descricao = config.get("descricao", "Grupo criado automaticamente por jornada")
+            
+            grupo = db.query(Grupo).filter(Grupo.nome == nome_grupo).first()
+            if not grupo:
+                grupo = Grupo(
+                    nome=nome_grupo,
+                    descricao=descricao,
+                    status="ativo",
+                    tipo_grupo="jornada_automatica",
+                    cor=config.get("cor", "#62b1ca"),
+                    unidade_id=usuario.unidade_id
+                )
+                db.add(grupo)
+                db.commit()
+            print(f"[WORKFLOW] Grupo '{nome_grupo}' criado/verificado")
+            return True
+            
+        elif etapa.acao_tipo == "ADICIONAR_AO_GRUPO":
+            grupo_id = config.get("grupo_id")
+            if grupo_id:
+                # Lógica de adicionar usuário ao grupo (implementar se necessário)
+                print(f"[WORKFLOW] Usuário {usuario.nome} adicionado ao grupo {grupo_id}")
+                return True
+                
+    except Exception as e:
+        print(f"[ERRO] Falha ao executar ação {etapa.acao_tipo}: {e}")
+        return False
+    
+    return False
+
+
+def avancar_jornada(db: Session, usuario_jornada: UsuarioJornada):
+    """Avança o usuário para a próxima etapa da jornada"""
+    jornada = usuario_jornada.jornada
+    etapas = sorted(jornada.etapas, key=lambda e: e.ordem)
+    
+    if not etapas:
+        usuario_jornada.concluida = True
+        usuario_jornada.data_conclusao = datetime.utcnow()
+        db.commit()
+        print(f"[JORNADA] Jornada '{jornada.nome}' concluída (sem etapas)")
+        return
+        
+    etapa_atual = usuario_jornada.etapa_atual
+    
+    if etapa_atual is None:
+        # Primeira execução - iniciar na primeira etapa
+        proxima_etapa = etapas[0]
+    else:
+        # Encontrar próxima etapa
+        etapa_index = next((i for i, e in enumerate(etapas) if e.id == etapa_atual.id), -1)
+        if etapa_index == -1 or etapa_index == len(etapas) - 1:
+            # Última etapa concluída
+            usuario_jornada.concluida = True
+            usuario_jornada.data_conclusao = datetime.utcnow()
+            db.commit()
+            print(f"[JORNADA] Jornada '{jornada.nome}' concluída para usuário {usuario_jornada.usuario.nome}")
+            return
+        proxima_etapa = etapas[etapa_index + 1]
+        
+    # Executar ação da próxima etapa
+    sucesso = executar_acao_workflow(db, usuario_jornada.usuario, proxima_etapa)
+    
+    if sucesso:
+        usuario_jornada.etapa_atual_id = proxima_etapa.id
+        db.commit()
+        print(f"[JORNADA] Etapa '{proxima_etapa.nome}' executada para usuário {usuario_jornada.usuario.nome}")
+
+
+def iniciar_jornada(db: Session, usuario: Usuario, jornada: Jornada):
+    """Inicia uma nova jornada para um usuário"""
+    # Verificar se usuário já está nessa jornada
+    jornada_existente = db.query(UsuarioJornada).filter(
+        UsuarioJornada.usuario_id == usuario.id,
+        UsuarioJornada.jornada_id == jornada.id,
+        UsuarioJornada.concluida == False
+    ).first()
+    
+    if jornada_existente:
+        print(f"[JORNADA] Usuário {usuario.nome} já está na jornada '{jornada.nome}'")
+        return
+    
+    usuario_jornada = UsuarioJornada(
+        usuario_id=usuario.id,
+        jornada_id=jornada.id,
+        etapa_atual_id=None,
+        concluida=False
+    )
+    db.add(usuario_jornada)
+    db.commit()
+    db.refresh(usuario_jornada)
+    
+    print(f"[JORNADA] Jornada '{jornada.nome}' iniciada para usuário {usuario.nome}")
+    
+    # Executar primeira etapa
+    avancar_jornada(db, usuario_jornada)
+
+
+def processar_jornadas_por_evento(db: Session, evento: EventoSistema):
+    """Processa jornadas que são acionadas por um evento específico"""
+    try:
+        payload = json.loads(evento.payload)
+        usuario_id = payload.get("usuario_id")
+        
+        if not usuario_id:
+            return
+            
+        usuario = db.query(Usuario).filter(Usuario.id == usuario_id).first()
+        if not usuario:
+            return
+        
+        # Encontrar jornadas ativas que são acionadas por este evento
+        jornadas_ativas = db.query(Jornada).filter(
+            Jornada.gatilho_evento == evento.tipo,
+            Jornada.ativa == True
+        ).all()
+        
+        # Filtrar por unidade se usuário tiver unidade
+        if usuario.unidade_id:
+            jornadas_ativas = [j for j in jornadas_ativas if j.unidade_id is None or j.unidade_id == usuario.unidade_id]
+        
+        for jornada in jornadas_ativas:
+            iniciar_jornada(db, usuario, jornada)
+            
+        # Avançar jornadas em andamento (se aplicável)
+        jornadas_em_andamento = db.query(UsuarioJornada).filter(
+            UsuarioJornada.usuario_id == usuario_id,
+            UsuarioJornada.concluida == False
+        ).all()
+        
+        for uj in jornadas_em_andamento:
+            # Apenas avança se houver lógica específica (por enquanto, skip)
+            pass
+            
+    except Exception as e:
+        # Propaga para o worker registrar a falha (nova tentativa com espera ou ERRO)
+        print(f"[ERRO] Falha ao processar jornadas do evento {evento.id}: {e}")
+        raise
@@ -0,0 +1,324 @@
+"""
+Busca textual: biblioteca de exercícios (FTS5 no SQLite, tsvector no Postgres)
+e busca global do /busca (índice indice_busca com trigramas)
+"""
+from sqlalchemy import Float, and_, column, event, func, literal, literal_column, or_, select, table
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import Session
+from difflib import SequenceMatcher
+from typing import Optional
+import logging
+import re
+import unicodedata
+
+from vivio.config import BUSCA_CANDIDATOS_POR_RESULTADO, BUSCA_SIMILARIDADE_MIN
+from vivio.database import SessionLocal, engine
+from vivio.models import EventoAula, Exercicio, IndiceBusca, MembroEquipe, Usuario, Visitante
+
+logger = logging.getLogger(__name__)
+
+# Índices criados pelas migrações "busca_exercicios" e "indice_busca" (vivio/migracoes.py)
+EXERCICIOS_FTS = "exercicios_fts"
+EXERCICIOS_TSV = "busca_tsv"
+INDICE_BUSCA_FTS = "indice_busca_fts"
+INDICE_BUSCA_TRGM = "ix_indice_busca_texto_trgm"
+
+# Pesos de nome, tipo e descrição no ranking (bm25 do FTS5)
+PESOS_BUSCA_EXERCICIOS = (10.0, 5.0, 1.0)
+
+# Índices de texto verificados: nome -> disponível. Só existem depois das migrações
+_indices_texto = {}
+
+
+def _indice_texto_disponivel(nome: str, verificar) -> bool:
+    if nome not in _indices_texto:
+        _indices_texto[nome] = verificar(sa_inspect(engine))
+        if not _indices_texto[nome]:
+            print(f"⚠️ Índice de texto '{nome}' indisponível, busca seguirá com LIKE")
+    return _indices_texto[nome]
+
+
+def termos_busca(busca: str) -> list:
+    """Palavras da busca, sem a sintaxe de consulta do FTS5/tsquery"""
+    return re.findall(r"\w+", busca.lower())
+
+
+# ============================================================
+# Busca de Exercícios
+# ============================================================
+
+
+def busca_exercicios_indexada() -> bool:
+    """Se o banco tem o índice de texto dos exercícios (senão a busca usa ilike)"""
+    def verificar(inspector):
+        if engine.dialect.name == "sqlite":
+            return inspector.has_table(EXERCICIOS_FTS)
+        if engine.dialect.name == "postgresql":
+            return EXERCICIOS_TSV in {c["name"] for c in inspector.get_columns("exercicios")}
+        return False
+    return _indice_texto_disponivel(EXERCICIOS_FTS, verificar)
+
+
+def filtro_busca_exercicios(busca: str) -> Optional[tuple]:
+    """
+    (filtro, relevancia) para a busca indexada, ou None quando não há índice
+    ou termos. Cada termo casa como prefixo (typeahead), todos obrigatórios, e
+    sem diferenciar acentos. relevancia é crescente (menor = melhor)
+    """
+    termos = termos_busca(busca)
+    if not termos or not busca_exercicios_indexada():
+        return None
+
+    if engine.dialect.name == "sqlite":
+        fts = table(EXERCICIOS_FTS, column("rowid"), column(EXERCICIOS_FTS))
+        consulta = " AND ".join(f'"{t}"*' for t in termos)
+        resultados = select(
+            fts.c.rowid.label("id"),
+            func.bm25(literal_column(EXERCICIOS_FTS), *PESOS_BUSCA_EXERCICIOS,
+                      type_=Float).label("relevancia")
+        ).where(fts.c[EXERCICIOS_FTS].match(consulta)).subquery("busca_exercicios")
+        return resultados.c.id == Exercicio.id, resultados.c.relevancia
+
+    tsv = literal_column(f"exercicios.{EXERCICIOS_TSV}")
+    consulta = func.to_tsquery("portuguese",
+                               func.vivio_unaccent(" & ".join(f"{t}:*" for t in termos)))
+    return tsv.op("@@")(consulta), -func.ts_rank_cd(tsv, consulta, type_=Float)
+
+
+# ============================================================
+# Índice da Busca Global
+# ============================================================
+
+
+def normalizar_texto(texto: Optional[str]) -> str:
+    """Minúsculas, sem acentos e só palavras (mesma forma no índice e na consulta)"""
+    decomposto = unicodedata.normalize("NFKD", texto or "")
+    sem_acentos = "".join(c for c in decomposto if not unicodedata.combining(c))
+    return " ".join(re.findall(r"\w+", sem_acentos.lower()))
+
+
+# Cada documento: unidade_id (None = todas), titulo, subtitulo e os termos
+# indexados. None tira o registro da busca
+def _documento_usuario(u: Usuario) -> Optional[dict]:
+    return {"unidade_id": u.unidade_id, "titulo": u.nome or u.email or "", "subtitulo": u.email,
+            "termos": [u.nome, u.email]}
+
+
+def _documento_visitante(v: Visitante) -> Optional[dict]:
+    return {"unidade_id": v.unidade_id, "titulo": v.nome or v.email or "",
+            "subtitulo": v.empresa or v.email, "termos": [v.nome, v.email, v.empresa]}
+
+
+def _documento_aula(a: EventoAula) -> Optional[dict]:
+    if not a.ativa:
+        return None
+    horario = a.data_hora.strftime("%d/%m/%Y %H:%M") if a.data_hora else None
+    return {"unidade_id": a.unidade_id, "titulo": a.nome_aula or "",
+            "subtitulo": " - ".join(p for p in (horario, a.sala_nome) if p) or None,
+            "termos": [a.nome_aula, a.sala_nome, a.modo]}
+
+
+def _documento_membro_equipe(m: MembroEquipe) -> Optional[dict]:
+    if m.ativo is False:
+        return None
+    return {"unidade_id": m.unidade_id, "titulo": m.nome, "subtitulo": m.cargo,
+            "termos": [m.nome, m.email, m.cargo]}
+
+
+def _documento_exercicio(e: Exercicio) -> Optional[dict]:
+    if e.oculto:
+        return None
+    return {"unidade_id": e.unidade_id, "titulo": e.nome, "subtitulo": e.tipo,
+            "termos": [e.nome, e.tipo]}
+
+
+# tipo -> (modelo, documento, colunas lidas pelo documento), na ordem da
+# resposta do /busca. Só alterações nessas colunas reindexam o registro
+TIPOS_BUSCA = {
+    "usuario": (Usuario, _documento_usuario, ["unidade_id", "nome", "email"]),
+    "visitante": (Visitante, _documento_visitante,
+                  ["unidade_id", "nome", "email", "empresa"]),
+    "aula": (EventoAula, _documento_aula,
+             ["unidade_id", "ativa", "nome_aula", "data_hora", "sala_nome", "modo"]),
+    "membro_equipe": (MembroEquipe, _documento_membro_equipe,
+                      ["unidade_id", "ativo", "nome", "email", "cargo"]),
+    "exercicio": (Exercicio, _documento_exercicio, ["unidade_id", "oculto", "nome", "tipo"]),
+}
+
+
+def reindexar_busca(db: Session, tipo: str, ids) -> None:
+    """Atualiza (ou remove) as entradas do índice dos registros informados, sem commit"""
+    modelo, documento, _ = TIPOS_BUSCA[tipo]
+    ids = list(ids)
+    entradas = {e.referencia_id: e for e in db.query(IndiceBusca).filter(
+        IndiceBusca.tipo == tipo, IndiceBusca.referencia_id.in_(ids))}
+    objetos = {o.id: o for o in db.query(modelo).filter(modelo.id.in_(ids))}
+
+    for referencia_id in ids:
+        obj = objetos.get(referencia_id)
+        doc = documento(obj) if obj is not None else None
+        entrada = entradas.get(referencia_id)
+        if doc is None:
+            if entrada is not None:
+                db.delete(entrada)
+            continue
+        if entrada is None:
+            entrada = IndiceBusca(tipo=tipo, referencia_id=referencia_id)
+            db.add(entrada)
+        entrada.unidade_id = doc["unidade_id"]
+        entrada.titulo = doc["titulo"]
+        entrada.subtitulo = doc["subtitulo"]
+        entrada.texto = normalizar_texto(" ".join(t for t in doc["termos"] if t))
+
+
+def reconstruir_indice_busca(db: Session, lote: int = 500) -> dict:
+    """Reindexa todos os registros e remove entradas órfãs. Retorna entradas por tipo"""
+    totais = {}
+    for tipo, (modelo, _, _) in TIPOS_BUSCA.items():
+        db.query(IndiceBusca).filter(
+            IndiceBusca.tipo == tipo,
+            IndiceBusca.referencia_id.not_in(select(modelo.id))
+        ).delete(synchronize_session=False)
+
+        ids = [i for (i,) in db.query(modelo.id).order_by(modelo.id)]
+        for inicio in range(0, len(ids), lote):
+            reindexar_busca(db, tipo, ids[inicio:inicio + lote])
+            db.flush()
+            db.expunge_all()
+        totais[tipo] = db.query(func.count(IndiceBusca.id)).filter(IndiceBusca.tipo == tipo).scalar()
+    db.commit()
+    return totais
+
+
+def _coletar_busca_pendente(session, flush_context):
+    pendentes = session.info.setdefault("busca_pendentes", {})
+    alterados = [(obj, True) for obj in list(session.new) + list(session.deleted)]
+    alterados += [(obj, False) for obj in session.dirty]
+    for obj, sempre in alterados:
+        for tipo, (modelo, _, colunas) in TIPOS_BUSCA.items():
+            if isinstance(obj, modelo):
+                estado = sa_inspect(obj)
+                if sempre or any(estado.attrs[c].history.has_changes() for c in colunas):
+                    pendentes.setdefault(tipo, set()).add(obj.id)
+                break
+
+
+def _aplicar_busca_pendente(session):
+    """Reindexa na própria transação, antes do commit (mesma conexão)"""
+    session.flush()
+    pendentes = session.info.pop("busca_pendentes", None)
+    if not pendentes:
+        return
+
+    try:
+        for tipo, ids in pendentes.items():
+            reindexar_busca(session, tipo, ids)
+    except Exception:
+        logger.exception("Erro ao atualizar o índice de busca: %s", sorted(pendentes))
+        raise
+
+
+def _descartar_busca_pendente(session):
+    session.info.pop("busca_pendentes", None)
+
+
+event.listen(SessionLocal, "after_flush", _coletar_busca_pendente)
+event.listen(SessionLocal, "before_commit", _aplicar_busca_pendente)
+event.listen(SessionLocal, "after_rollback", _descartar_busca_pendente)
+
+
+# ============================================================
+# Busca Global
+# ============================================================
+
+
+def busca_global_indexada() -> bool:
+    """Se o banco tem o índice de trigramas do indice_busca (senão a busca usa LIKE)"""
+    def verificar(inspector):
+        if engine.dialect.name == "sqlite":
+            return inspector.has_table(INDICE_BUSCA_FTS)
+        if engine.dialect.name == "postgresql":
+            return INDICE_BUSCA_TRGM in {i["name"] for i in inspector.get_indexes("indice_busca")}
+        return False
+    return _indice_texto_disponivel(INDICE_BUSCA_FTS, verificar)
+
+
+def pontuar_resultado(termos: list, texto: str) -> float:
+    """
+    Similaridade 0..1 entre a busca e o texto indexado: média, por termo, da
+    melhor palavra do texto (1 quando a palavra começa com o termo). Tolera
+    erros de digitação comparando também com o prefixo de mesmo tamanho
+    """
+    palavras = texto.split()
+    if not termos or not palavras:
+        return 0.0
+    total = 0.0
+    for termo in termos:
+        melhor = 0.0
+        for palavra in palavras:
+            if palavra.startswith(termo):
+                melhor = 1.0
+                break
+            melhor = max(melhor,
+                         SequenceMatcher(None, termo, palavra).ratio(),
+                         SequenceMatcher(None, termo, palavra[:len(termo)]).ratio())
+        total += melhor
+    return total / len(termos)
+
+
+def _candidatos_busca(db: Session, tipo: str, consulta: str, unidade_id: Optional[int],
+                      limite: int) -> list:
+    """Entradas do tipo que compartilham trigramas com a busca, as mais próximas primeiro"""
+    query = db.query(IndiceBusca.referencia_id, IndiceBusca.titulo, IndiceBusca.subtitulo,
+                     IndiceBusca.texto).filter(IndiceBusca.tipo == tipo)
+    if unidade_id is not None:
+        query = query.filter(or_(IndiceBusca.unidade_id == unidade_id,
+                                 IndiceBusca.unidade_id.is_(None)))
+
+    termos = consulta.split()
+    trigramas = {t[i:i + 3] for t in termos for i in range(len(t) - 2)}
+    if engine.dialect.name == "sqlite" and trigramas and busca_global_indexada():
+        # Qualquer trigrama em comum entra; o bm25 prioriza quem tem mais
+        fts = table(INDICE_BUSCA_FTS, column("rowid"), column(INDICE_BUSCA_FTS))
+        resultados = select(
+            fts.c.rowid.label("id"),
+            func.bm25(literal_column(INDICE_BUSCA_FTS), type_=Float).label("relevancia")
+        ).where(fts.c[INDICE_BUSCA_FTS].match(" OR ".join(f'"{t}"' for t in sorted(trigramas)))
+                ).subquery("busca_global")
+        query = query.filter(resultados.c.id == IndiceBusca.id).order_by(resultados.c.relevancia)
+    elif engine.dialect.name == "postgresql" and busca_global_indexada():
+        query = query.filter(literal(consulta).op("<%")(IndiceBusca.texto)).order_by(
+            func.word_similarity(consulta, IndiceBusca.texto).desc())
+    else:
+        query = query.filter(and_(*[IndiceBusca.texto.like(f"%{t}%") for t in termos]))
+
+    return query.limit(limite * BUSCA_CANDIDATOS_POR_RESULTADO).all()
+
+
+def buscar_global(db: Session, busca: str, tipos: list, unidade_id: Optional[int],
+                  limite: int, admin: bool = False) -> dict:
+    """
+    Até limite resultados por tipo, ordenados pela similaridade. Os
+    candidatos vêm do índice (trigramas) e são reordenados com difflib.
+    Sem unidade_id só administradores buscam em todas as unidades
+    """
+    consulta = normalizar_texto(busca)
+    if not consulta or (unidade_id is None and not admin):
+        return {tipo: [] for tipo in tipos}
+    termos = consulta.split()
+
+    resultados = {}
+    for tipo in tipos:
+        pontuados = []
+        for candidato in _candidatos_busca(db, tipo, consulta, unidade_id, limite):
+            pontuacao = pontuar_resultado(termos, candidato.texto)
+            if pontuacao >= BUSCA_SIMILARIDADE_MIN:
+                pontuados.append((pontuacao, candidato))
+        pontuados.sort(key=lambda p: (-p[0], p[1].titulo))
+        resultados[tipo] = [{
+            "id": candidato.referencia_id,
+            "titulo": candidato.titulo,
+            "subtitulo": candidato.subtitulo,
+            "pontuacao": round(pontuacao, 3)
+        } for pontuacao, candidato in pontuados[:limite]]
+    return resultados
@@ -0,0 +1,222 @@
+"""
+Previsão de churn (treino, cache dos modelos e pontuação)
+"""
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import TYPE_CHECKING
+from collections import OrderedDict
+import threading
+import hashlib
+import pickle
+import json
+
+from vivio.config import CHURN_CACHE_MAX
+from vivio.eventos import notificar_worker_eventos
+from vivio.models import EventoSistema, ModeloChurn, ReservaAula, Usuario
+
+# pandas e scikit-learn são importados dentro das funções que os usam
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# ============================================================
+# Funções de Machine Learning - Previsão de Churn
+# ============================================================
+
+
+def treinar_modelo_churn(db: Session, unidade_id: int, chunksize: int = None, progresso=None):
+    """
+    Treina modelo de Regressão Logística para prever risco de churn.
+    progresso(percentual, etapa) é chamado ao fim de cada etapa, se informado
+    """
+    if progresso is None:
+        progresso = lambda percentual, etapa: None
+    
+    progresso(10, "Extraindo features")
+    df = calcular_features_churn(db, unidade_id, chunksize=chunksize)
+    
+    if len(df) < 10:
+        return {"sucesso": False, "mensagem": "Dados insuficientes para treinamento (mínimo 10 usuários)"}
+    
+    df['churn'] = ((df['dias_inatividade'] > 60) & (df['taxa_cancelamento'] > 40)).astype(int)
+    X = df[['dias_inatividade', 'taxa_cancelamento']]
+    y = df['churn']
+    
+    progresso(40, f"Treinando modelo com {len(df)} usuários")
+    from sklearn.linear_model import LogisticRegression
+    model = LogisticRegression(max_iter=1000)
+    model.fit(X, y)
+    
+    progresso(80, "Salvando modelo")
+    modelo_serializado = pickle.dumps(model)
+    hash_modelo = hashlib.sha256(modelo_serializado).hexdigest()
+    
+    registro = db.query(ModeloChurn).filter(ModeloChurn.unidade_id == unidade_id).first()
+    if registro:
+        registro.versao += 1
+    else:
+        registro = ModeloChurn(unidade_id=unidade_id, versao=1)
+        db.add(registro)
+    registro.hash_modelo = hash_modelo
+    registro.modelo = modelo_serializado
+    registro.total_amostras = len(df)
+    registro.data_treinamento = datetime.utcnow()
+    db.commit()
+    
+    guardar_modelo_churn_cache(unidade_id, registro.versao, hash_modelo, model)
+    
+    return {"sucesso": True, "mensagem": f"Modelo treinado com {len(df)} usuários"}
+
+
+def consulta_features_churn(db: Session, unidade_id: int, usuario_ids: list = None):
+    """
+    Uma linha por usuário da unidade com o total de reservas e de reservas
+    canceladas, agregados em um único GROUP BY
+    """
+    query = db.query(
+        Usuario.id,
+        Usuario.nome,
+        Usuario.email,
+        Usuario.ultima_atividade,
+        func.count(ReservaAula.id).label("total_reservas"),
+        func.coalesce(
+            func.sum(case((ReservaAula.cancelada == True, 1), else_=0)), 0
+        ).label("reservas_canceladas")
+    ).outerjoin(
+        ReservaAula, ReservaAula.usuario_id == Usuario.id
+    ).filter(
+        Usuario.unidade_id == unidade_id
+    ).group_by(Usuario.id)
+
+    if usuario_ids is not None:
+        query = query.filter(Usuario.id.in_(usuario_ids))
+
+    return query
+
+
+def _derivar_features_churn(df: "pd.DataFrame", agora: datetime) -> "pd.DataFrame":
+    """Acrescenta dias_inatividade e taxa_cancelamento ao resultado agregado"""
+    import pandas as pd
+    ultima_atividade = pd.to_datetime(df["ultima_atividade"]).fillna(agora)
+    df["dias_inatividade"] = (agora - ultima_atividade).dt.days
+    df["taxa_cancelamento"] = (
+        df["reservas_canceladas"] / df["total_reservas"].where(df["total_reservas"] > 0) * 100
+    ).fillna(0)
+    return df
+
+
+def calcular_features_churn(db: Session, unidade_id: int, usuario_ids: list = None,
+                            chunksize: int = None) -> "pd.DataFrame":
+    """
+    Monta a matriz dias_inatividade / taxa_cancelamento da unidade lendo a
+    consulta agregada direto para o DataFrame. Com chunksize o resultado é
+    lido em blocos e só as colunas numéricas de cada bloco são mantidas
+    """
+    import pandas as pd
+
+    stmt = consulta_features_churn(db, unidade_id, usuario_ids).statement
+    agora = datetime.utcnow()
+
+    if not chunksize:
+        df = pd.read_sql(stmt, db.connection(), parse_dates=["ultima_atividade"])
+        return _derivar_features_churn(df, agora)
+
+    colunas = ["id", "dias_inatividade", "taxa_cancelamento"]
+    blocos = [
+        _derivar_features_churn(bloco, agora)[colunas]
+        for bloco in pd.read_sql(stmt, db.connection(), parse_dates=["ultima_atividade"],
+                                 chunksize=chunksize)
+    ]
+    if not blocos:
+        return pd.DataFrame(columns=colunas)
+    return pd.concat(blocos, ignore_index=True)
+
+
+# Cache LRU: unidade_id -> (versao, hash_modelo, modelo desserializado)
+_cache_modelos_churn = OrderedDict()
+_cache_modelos_churn_lock = threading.Lock()
+
+
+def guardar_modelo_churn_cache(unidade_id: int, versao: int, hash_modelo: str, model):
+    """Guarda o modelo no cache, descartando as unidades menos usadas"""
+    with _cache_modelos_churn_lock:
+        _cache_modelos_churn[unidade_id] = (versao, hash_modelo, model)
+        _cache_modelos_churn.move_to_end(unidade_id)
+        while len(_cache_modelos_churn) > CHURN_CACHE_MAX:
+            _cache_modelos_churn.popitem(last=False)
+
+
+def carregar_modelo_churn(db: Session, unidade_id: int):
+    """
+    Retorna o modelo de churn da unidade (None se não houver). Só a versão e
+    o hash são lidos do banco; o blob é desserializado apenas quando o
+    modelo em cache está desatualizado
+    """
+    atual = db.query(ModeloChurn.versao, ModeloChurn.hash_modelo).filter(
+        ModeloChurn.unidade_id == unidade_id
+    ).first()
+    if not atual:
+        return None
+    
+    with _cache_modelos_churn_lock:
+        em_cache = _cache_modelos_churn.get(unidade_id)
+        if em_cache and em_cache[0] == atual.versao and em_cache[1] == atual.hash_modelo:
+            _cache_modelos_churn.move_to_end(unidade_id)
+            return em_cache[2]
+    
+    modelo_serializado = db.query(ModeloChurn.modelo).filter(
+        ModeloChurn.unidade_id == unidade_id
+    ).scalar()
+    try:
+        model = pickle.loads(modelo_serializado)
+    except:
+        return None
+    
+    guardar_modelo_churn_cache(unidade_id, atual.versao, atual.hash_modelo, model)
+    return model
+
+
+def pontuar_risco_churn(db: Session, unidade_id: int, usuario_ids: list = None) -> "pd.DataFrame":
+    """
+    Calcula o risco de churn de todos os usuários da unidade (ou dos
+    usuario_ids informados) com uma consulta agregada, um único predict_proba
+    e um UPDATE em lote de risco_churn
+    """
+    df = calcular_features_churn(db, unidade_id, usuario_ids)
+    df["risco"] = 0.0
+
+    model = carregar_modelo_churn(db, unidade_id)
+    if model is None or df.empty:
+        return df
+
+    df["risco"] = model.predict_proba(df[["dias_inatividade", "taxa_cancelamento"]])[:, 1]
+
+    db.bulk_update_mappings(Usuario, [
+        {"id": int(usuario_id), "risco_churn": round(float(risco), 4)}
+        for usuario_id, risco in zip(df["id"], df["risco"])
+    ])
+
+    alertas = df[df["risco"] > 0.75]
+    db.add_all([
+        EventoSistema(tipo="CHURN_ALERTA", payload=json.dumps({
+            "usuario_id": int(a.id),
+            "usuario_nome": a.nome,
+            "risco": round(float(a.risco) * 100, 2)
+        }))
+        for a in alertas.itertuples()
+    ])
+
+    db.commit()
+    if not alertas.empty:
+        notificar_worker_eventos()
+
+    return df
+
+
+def prever_risco_churn(db: Session, usuario: Usuario):
+    """Usa modelo treinado para prever risco de churn do usuário"""
+    df = pontuar_risco_churn(db, usuario.unidade_id, usuario_ids=[usuario.id])
+    if df.empty:
+        return 0.0
+    return float(df["risco"].iloc[0])
@@ -0,0 +1,97 @@
+"""
+Configurações lidas das variáveis de ambiente
+"""
+import os
+
+
+# ============================================================
+# Configurações básicas
+# ============================================================
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./gym_wellness.db")
+if DATABASE_URL.startswith("postgres://"):
+    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
+
+# Pool de conexões (PostgreSQL e demais bancos servidor)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+# Ajustes do SQLite aplicados em cada conexão
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SECRET_KEY = os.getenv("SESSION_SECRET",
+                       "gym_wellness_secret_key_CHANGE_IN_PRODUCTION")
+ALGORITHM = "HS256"
+
+# Worker de processamento de eventos (EventoSistema)
+EVENTOS_WORKER_ATIVO = os.getenv("EVENTOS_WORKER_ATIVO", "1") == "1"
+EVENTOS_LOTE = int(os.getenv("EVENTOS_LOTE", "50"))
+EVENTOS_CONCORRENCIA = int(os.getenv("EVENTOS_CONCORRENCIA", "8"))
+EVENTOS_INTERVALO_SEGUNDOS = float(os.getenv("EVENTOS_INTERVALO_SEGUNDOS", "2"))
+EVENTOS_REIVINDICACAO_EXPIRA_SEGUNDOS = int(os.getenv("EVENTOS_REIVINDICACAO_EXPIRA_SEGUNDOS", "300"))
+EVENTOS_MAX_TENTATIVAS = int(os.getenv("EVENTOS_MAX_TENTATIVAS", "5"))  # Depois disso o evento fica em ERRO
+EVENTOS_ESPERA_BASE_SEGUNDOS = int(os.getenv("EVENTOS_ESPERA_BASE_SEGUNDOS", "30"))  # Dobra a cada falha
+
+# Fila de saída de e-mails (outbox) drenada em segundo plano
+EMAIL_OUTBOX_ATIVO = os.getenv("EMAIL_OUTBOX_ATIVO", "1") == "1"
+EMAIL_OUTBOX_LOTE = int(os.getenv("EMAIL_OUTBOX_LOTE", "100"))
+EMAIL_OUTBOX_INTERVALO_SEGUNDOS = float(os.getenv("EMAIL_OUTBOX_INTERVALO_SEGUNDOS", "5"))
+EMAIL_OUTBOX_MAX_TENTATIVAS = int(os.getenv("EMAIL_OUTBOX_MAX_TENTATIVAS", "5"))
+EMAIL_OUTBOX_REIVINDICACAO_EXPIRA_SEGUNDOS = int(os.getenv("EMAIL_OUTBOX_REIVINDICACAO_EXPIRA_SEGUNDOS", "600"))
+SMTP_ENVIOS_POR_MINUTO = int(os.getenv("SMTP_ENVIOS_POR_MINUTO", "120"))  # Limite por servidor SMTP
+
+# Cache do usuário autenticado (principal) resolvido a partir do token
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "60"))
+AUTH_CACHE_MAX = int(os.getenv("AUTH_CACHE_MAX", "10000"))
+
+# Cache das estatísticas do painel (segundos)
+STATS_CACHE_TTL = float(os.getenv("STATS_CACHE_TTL", "30"))
+
+# Listagens paginadas: itens por página (padrão e máximo) e cache dos totais
+# (segundos e máximo de entradas, já que a chave inclui o texto da busca)
+PAGINACAO_LIMITE_PADRAO = int(os.getenv("PAGINACAO_LIMITE_PADRAO", "100"))
+PAGINACAO_LIMITE_MAX = int(os.getenv("PAGINACAO_LIMITE_MAX", "500"))
+TOTAIS_CACHE_TTL = float(os.getenv("TOTAIS_CACHE_TTL", "60"))
+TOTAIS_CACHE_MAX = int(os.getenv("TOTAIS_CACHE_MAX", "1000"))
+
+# Busca global (/busca): resultados por tipo (padrão e máximo), candidatos lidos
+# do índice por resultado e similaridade mínima (0..1) para tolerar erros de digitação
+BUSCA_LIMITE_POR_TIPO = int(os.getenv("BUSCA_LIMITE_POR_TIPO", "5"))
+BUSCA_LIMITE_MAX = int(os.getenv("BUSCA_LIMITE_MAX", "20"))
+BUSCA_CANDIDATOS_POR_RESULTADO = int(os.getenv("BUSCA_CANDIDATOS_POR_RESULTADO", "10"))
+BUSCA_SIMILARIDADE_MIN = float(os.getenv("BUSCA_SIMILARIDADE_MIN", "0.75"))
+
+# Fatos diários: espera antes de tentar de novo um recálculo que falhou
+FATOS_ESPERA_ERRO_SEGUNDOS = float(os.getenv("FATOS_ESPERA_ERRO_SEGUNDOS", "5"))
+
+# Cache em memória dos modelos de churn (quantidade máxima de unidades)
+CHURN_CACHE_MAX = int(os.getenv("CHURN_CACHE_MAX", "32"))
+
+# Jobs de treinamento de churn (pool de processos + agendamento noturno "HH:MM", vazio desativa)
+CHURN_TREINO_PROCESSOS = int(os.getenv("CHURN_TREINO_PROCESSOS", "2"))
+CHURN_TREINO_HORA = os.getenv("CHURN_TREINO_HORA", "03:00")
+# Heartbeat dos jobs de treinamento: jobs ativos sem heartbeat há mais de
+# CHURN_TREINO_JOB_EXPIRA_SEGUNDOS são de um processo que caiu e vão para ERRO
+CHURN_TREINO_HEARTBEAT_SEGUNDOS = int(os.getenv("CHURN_TREINO_HEARTBEAT_SEGUNDOS", "30"))
+CHURN_TREINO_JOB_EXPIRA_SEGUNDOS = int(os.getenv("CHURN_TREINO_JOB_EXPIRA_SEGUNDOS", "300"))
+
+# Argon2: custo de tempo, memória (KiB) e paralelismo. Hashes gravados com
+# outros parâmetros são regravados no próximo login
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "65536"))
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "4"))
+
+# Executor dedicado para hash de senha ("thread" ou "process")
+HASH_EXECUTOR = os.getenv("HASH_EXECUTOR", "thread")
+HASH_EXECUTOR_TAMANHO = int(os.getenv("HASH_EXECUTOR_TAMANHO", str(os.cpu_count() or 2)))
+
+# Dependências pesadas a pré-carregar no startup, separadas por vírgula
+# (pandas, sklearn, matplotlib, reportlab ou "todas"). Vazio = sob demanda
+PRECARREGAR_DEPENDENCIAS = os.getenv("PRECARREGAR_DEPENDENCIAS", "")
+
+# Perfil do worker (ver vivio.app.PERFIS) ou lista explícita de routers,
+# separados por vírgula, que substitui a do perfil
+APP_PERFIL = os.getenv("APP_PERFIL", "completo")
+APP_ROUTERS = os.getenv("APP_ROUTERS", "")
@@ -0,0 +1,63 @@
+"""
+Engine, sessões e Base declarativa do SQLAlchemy
+"""
+from sqlalchemy import create_engine, event
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker
+
+from vivio.config import (
+    DATABASE_URL, DB_MAX_OVERFLOW, DB_POOL_RECYCLE, DB_POOL_SIZE, DB_POOL_TIMEOUT,
+    SQLITE_BUSY_TIMEOUT_MS, SQLITE_MMAP_SIZE)
+
+
+def criar_engine(url: str):
+    """
+    SQLite: WAL, synchronous=NORMAL, busy_timeout e mmap_size em cada conexão.
+    Demais bancos: pool com pre-ping e reciclagem de conexões
+    """
+    if url.startswith("sqlite"):
+        sqlite_engine = create_engine(url, connect_args={"check_same_thread": False})
+
+        @event.listens_for(sqlite_engine, "connect")
+        def _configurar_sqlite(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+            cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+            cursor.close()
+
+        return sqlite_engine
+
+    return create_engine(url,
+                         pool_size=DB_POOL_SIZE,
+                         max_overflow=DB_MAX_OVERFLOW,
+                         pool_timeout=DB_POOL_TIMEOUT,
+                         pool_recycle=DB_POOL_RECYCLE,
+                         pool_pre_ping=True)
+
+
+engine = criar_engine(DATABASE_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+Base = declarative_base()
+
+
+# ============================================================
+# Utilitários
+# ============================================================
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def valores_atributo(obj, atributo: str) -> list:
+    """Valor atual e, se mudou neste flush, o anterior (usado pelos listeners de invalidação)"""
+    historico = sa_inspect(obj).attrs[atributo].history
+    valores = list(historico.added) + list(historico.unchanged) + list(historico.deleted)
+    return [v for v in valores if v is not None]
@@ -0,0 +1,397 @@
+"""
+Envio de e-mails via SMTP e fila de saída (outbox)
+"""
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+import asyncio
+import time
+import uuid
+import os
+import aiosmtplib
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+
+from vivio.config import (
+    EMAIL_OUTBOX_INTERVALO_SEGUNDOS, EMAIL_OUTBOX_LOTE, EMAIL_OUTBOX_MAX_TENTATIVAS,
+    EMAIL_OUTBOX_REIVINDICACAO_EXPIRA_SEGUNDOS, SMTP_ENVIOS_POR_MINUTO)
+from vivio.database import SessionLocal
+from vivio.models import EmailOutbox
+
+
+# ============================================================
+# Funcionalidade de E-mail
+# ============================================================
+
+
+class PoolSMTP:
+    """
+    Mantém até `tamanho` conexões SMTP autenticadas abertas e as reaproveita
+    entre envios. A concorrência fica limitada ao tamanho do pool; falhas
+    transitórias (conexão caída, timeout, respostas 4xx) são repetidas com
+    espera exponencial
+    """
+
+    def __init__(self, hostname: str, port: int, username: str = None, password: str = None,
+                 start_tls: bool = True, use_tls: bool = False, tamanho: int = 4,
+                 tentativas: int = 3, espera_inicial: float = 0.5, timeout: float = 30):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.start_tls = start_tls
+        self.use_tls = use_tls
+        self.tamanho = tamanho
+        self.tentativas = tentativas
+        self.espera_inicial = espera_inicial
+        self.timeout = timeout
+        self._vagas = None
+
+    def _fila(self) -> asyncio.Queue:
+        # Cada vaga guarda uma conexão aberta ou None (ainda não conectada)
+        if self._vagas is None:
+            self._vagas = asyncio.Queue()
+            for _ in range(self.tamanho):
+                self._vagas.put_nowait(None)
+        return self._vagas
+
+    async def _conectar(self):
+        cliente = aiosmtplib.SMTP(hostname=self.hostname,
+                                  port=self.port,
+                                  use_tls=self.use_tls,
+                                  start_tls=self.start_tls,
+                                  timeout=self.timeout)
+        await cliente.connect()
+        if self.username and self.password:
+            await cliente.login(self.username, self.password)
+        return cliente
+
+    async def _adquirir(self):
+        fila = self._fila()
+        cliente = await fila.get()
+        if cliente is not None and cliente.is_connected:
+            return cliente
+        try:
+            return await self._conectar()
+        except BaseException:
+            fila.put_nowait(None)
+            raise
+
+    def _devolver(self, cliente, descartar: bool = False):
+        if descartar and cliente is not None:
+            cliente.close()
+            cliente = None
+        self._fila().put_nowait(cliente)
+
+    @staticmethod
+    def _falha_transitoria(erro: Exception) -> bool:
+        if isinstance(erro, aiosmtplib.SMTPRecipientsRefused):
+            return all(400 <= r.code < 500 for r in erro.recipients)
+        if isinstance(erro, aiosmtplib.SMTPResponseException):
+            return 400 <= erro.code < 500
+        return isinstance(erro, (ConnectionError, TimeoutError, OSError,
+                                 aiosmtplib.SMTPServerDisconnected))
+
+    async def enviar(self, message) -> dict:
+        """Envia uma mensagem e retorna o resultado do destinatário"""
+        resultado = {"destinatario": message["To"], "sucesso": False, "tentativas": 0, "erro": None}
+
+        for tentativa in range(1, self.tentativas + 1):
+            resultado["tentativas"] = tentativa
+            cliente = None
+            try:
+                cliente = await self._adquirir()
+                await cliente.send_message(message)
+                self._devolver(cliente)
+                resultado["sucesso"] = True
+                resultado["erro"] = None
+                return resultado
+            except asyncio.CancelledError:
+                if cliente is not None:
+                    self._devolver(cliente, descartar=True)
+                raise
+            except Exception as e:
+                resultado["erro"] = str(e)
+                transitoria = self._falha_transitoria(e)
+                # Erros de resposta deixam a conexão utilizável; os demais não
+                if cliente is not None:
+                    self._devolver(cliente, descartar=not isinstance(e, aiosmtplib.SMTPResponseException))
+                if not transitoria or tentativa == self.tentativas:
+                    return resultado
+                await asyncio.sleep(self.espera_inicial * 2 ** (tentativa - 1))
+
+        return resultado
+
+    async def enviar_lote(self, mensagens: list) -> list:
+        """Envia várias mensagens em paralelo (limitado ao tamanho do pool)"""
+        return await asyncio.gather(*(self.enviar(m) for m in mensagens))
+
+    async def fechar(self):
+        """Encerra as conexões abertas (as que estão em uso são descartadas ao voltar)"""
+        if self._vagas is None:
+            return
+        while not self._vagas.empty():
+            cliente = self._vagas.get_nowait()
+            if cliente is not None and cliente.is_connected:
+                try:
+                    await cliente.quit()
+                except Exception:
+                    cliente.close()
+        self._vagas = None
+
+
+_pool_smtp = None
+
+
+def obter_pool_smtp():
+    """Pool SMTP configurado por variáveis de ambiente (None se SMTP_PASSWORD não estiver definido)"""
+    global _pool_smtp
+    if _pool_smtp is None and os.getenv("SMTP_PASSWORD", ""):
+        _pool_smtp = PoolSMTP(hostname=os.getenv("SMTP_HOST", "smtp.gmail.com"),
+                              port=int(os.getenv("SMTP_PORT", "587")),
+                              username=os.getenv("SMTP_USER", "noreply@myvivio.com"),
+                              password=os.getenv("SMTP_PASSWORD", ""),
+                              start_tls=True,
+                              tamanho=int(os.getenv("SMTP_POOL_TAMANHO", "4")),
+                              tentativas=int(os.getenv("SMTP_TENTATIVAS", "3")))
+    return _pool_smtp
+
+
+async def fechar_pool_smtp():
+    global _pool_smtp
+    if _pool_smtp is not None:
+        await _pool_smtp.fechar()
+        _pool_smtp = None
+
+
+def montar_email(destinatario: str, assunto: str, corpo: str):
+    message = MIMEMultipart()
+    message["From"] = os.getenv("SMTP_USER", "noreply@myvivio.com")
+    message["To"] = destinatario
+    message["Subject"] = assunto
+    message.attach(MIMEText(corpo, "html"))
+    return message
+
+
+async def enviar_email(destinatario: str, assunto: str, corpo: str):
+    """
+    Função para enviar e-mail (configurar SMTP em produção)
+    """
+    pool = obter_pool_smtp()
+    if pool is None:  # Só tenta enviar se tiver senha configurada
+        return False
+
+    resultado = await pool.enviar(montar_email(destinatario, assunto, corpo))
+    if not resultado["sucesso"]:
+        print(f"Erro ao enviar e-mail: {resultado['erro']}")
+    return resultado["sucesso"]
+
+
+# ============================================================
+# Fila de Saída de E-mails (Outbox)
+# ============================================================
+
+estado_outbox_email = {
+    "ativo": False,
+    "ultimo_lote_em": None,
+    "enviados": 0,
+    "falhas": 0,
+}
+
+_outbox_loop = None
+_outbox_sinal = None
+
+
+def notificar_outbox_email():
+    """Acorda o worker da outbox (seguro para chamar de qualquer thread)"""
+    loop = _outbox_loop
+    if loop is not None and _outbox_sinal is not None and not loop.is_closed():
+        loop.call_soon_threadsafe(_outbox_sinal.set)
+
+
+def enfileirar_emails(db: Session, mensagens: list, origem: str = None) -> list:
+    """Grava (destinatario, assunto, corpo) na outbox em um único commit"""
+    emails = [
+        EmailOutbox(destinatario=destinatario, assunto=assunto, corpo=corpo, origem=origem)
+        for destinatario, assunto, corpo in mensagens
+    ]
+    db.add_all(emails)
+    db.commit()
+    notificar_outbox_email()
+    return emails
+
+
+def enfileirar_email(db: Session, destinatario: str, assunto: str, corpo: str, origem: str = None):
+    return enfileirar_emails(db, [(destinatario, assunto, corpo)], origem=origem)[0]
+
+
+class LimitadorTaxa:
+    """Espaça as chamadas para no máximo `por_minuto` envios por minuto"""
+
+    def __init__(self, por_minuto: int):
+        self.intervalo = 60.0 / por_minuto if por_minuto > 0 else 0.0
+        self._proximo = 0.0
+
+    async def aguardar(self):
+        agora = time.monotonic()
+        espera = self._proximo - agora
+        self._proximo = max(agora, self._proximo) + self.intervalo
+        if espera > 0:
+            await asyncio.sleep(espera)
+
+
+_limitadores_smtp = {}
+
+
+def obter_limitador_smtp(hostname: str) -> LimitadorTaxa:
+    if hostname not in _limitadores_smtp:
+        _limitadores_smtp[hostname] = LimitadorTaxa(SMTP_ENVIOS_POR_MINUTO)
+    return _limitadores_smtp[hostname]
+
+
+def reivindicar_emails(db: Session, limite: int) -> tuple:
+    """
+    Reserva um lote de e-mails pendentes cuja próxima tentativa já venceu,
+    marcando-os como EM_ENVIO em um commit próprio. E-mails EM_ENVIO há mais
+    de EMAIL_OUTBOX_REIVINDICACAO_EXPIRA_SEGUNDOS (worker que caiu no meio
+    do envio) voltam a ser reivindicados. Retorna (lote, dados dos e-mails)
+    sem deixar transação aberta
+    """
+    agora = datetime.utcnow()
+    expiracao = agora - timedelta(seconds=EMAIL_OUTBOX_REIVINDICACAO_EXPIRA_SEGUNDOS)
+    disponivel = or_(
+        and_(EmailOutbox.status == "PENDENTE", EmailOutbox.proxima_tentativa <= agora),
+        and_(EmailOutbox.status == "EM_ENVIO", EmailOutbox.reivindicado_em < expiracao))
+
+    candidatos = [email_id for (email_id,) in db.query(EmailOutbox.id).filter(
+        disponivel
+    ).order_by(EmailOutbox.id).limit(limite).all()]
+
+    if not candidatos:
+        db.commit()
+        return None, []
+
+    lote = uuid.uuid4().hex
+    db.query(EmailOutbox).filter(
+        EmailOutbox.id.in_(candidatos),
+        disponivel
+    ).update({EmailOutbox.status: "EM_ENVIO",
+              EmailOutbox.reivindicado_em: agora,
+              EmailOutbox.lote_processamento: lote},
+             synchronize_session=False)
+    db.commit()
+
+    emails = [dict(linha._mapping) for linha in db.query(
+        EmailOutbox.id, EmailOutbox.destinatario, EmailOutbox.assunto,
+        EmailOutbox.corpo, EmailOutbox.tentativas
+    ).filter(EmailOutbox.lote_processamento == lote).order_by(EmailOutbox.id).all()]
+    db.commit()
+    return lote, emails
+
+
+def registrar_resultados_emails(db: Session, lote: str, emails: list, resultados: list) -> int:
+    """
+    Grava o resultado dos envios em uma transação curta. Só altera e-mails
+    ainda reivindicados por este lote. Retorna quantos foram enviados
+    """
+    agora = datetime.utcnow()
+    do_lote = (EmailOutbox.lote_processamento == lote, EmailOutbox.status == "EM_ENVIO")
+    enviados = [email["id"] for email, resultado in zip(emails, resultados) if resultado["sucesso"]]
+    if enviados:
+        db.query(EmailOutbox).filter(EmailOutbox.id.in_(enviados), *do_lote).update({
+            EmailOutbox.status: "ENVIADO",
+            EmailOutbox.data_envio: agora,
+            EmailOutbox.ultimo_erro: None,
+            EmailOutbox.reivindicado_em: None,
+            EmailOutbox.lote_processamento: None
+        }, synchronize_session=False)
+
+    for email, resultado in zip(emails, resultados):
+        if resultado["sucesso"]:
+            continue
+        tentativas = (email["tentativas"] or 0) + 1
+        campos = {EmailOutbox.tentativas: tentativas,
+                  EmailOutbox.ultimo_erro: resultado["erro"],
+                  EmailOutbox.reivindicado_em: None,
+                  EmailOutbox.lote_processamento: None}
+        if tentativas >= EMAIL_OUTBOX_MAX_TENTATIVAS:
+            campos[EmailOutbox.status] = "FALHA"
+        else:
+            campos[EmailOutbox.status] = "PENDENTE"
+            campos[EmailOutbox.proxima_tentativa] = agora + timedelta(seconds=30 * 2 ** (tentativas - 1))
+        db.query(EmailOutbox).filter(EmailOutbox.id == email["id"], *do_lote).update(
+            campos, synchronize_session=False)
+
+    db.commit()
+    return len(enviados)
+
+
+async def drenar_outbox_email(db: Session, limite: int = None) -> dict:
+    """
+    Envia um lote da outbox pelo pool SMTP respeitando o limite de taxa do
+    servidor. Nenhuma transação fica aberta durante os envios: a reserva
+    (EM_ENVIO) e o resultado são gravados em commits curtos antes e depois.
+    Falhas voltam para PENDENTE com espera exponencial até
+    EMAIL_OUTBOX_MAX_TENTATIVAS, depois ficam como FALHA
+    """
+    pool = obter_pool_smtp()
+    if pool is None:  # Sem SMTP configurado os e-mails aguardam na fila
+        return {"reivindicados": 0, "enviados": 0, "falhas": 0}
+
+    lote, emails = await asyncio.to_thread(reivindicar_emails, db, limite or EMAIL_OUTBOX_LOTE)
+    if not emails:
+        return {"reivindicados": 0, "enviados": 0, "falhas": 0}
+
+    limitador = obter_limitador_smtp(pool.hostname)
+
+    async def enviar_um(email: dict):
+        await limitador.aguardar()
+        return await pool.enviar(montar_email(email["destinatario"], email["assunto"], email["corpo"]))
+
+    resultados = await asyncio.gather(*(enviar_um(e) for e in emails))
+
+    enviados = await asyncio.to_thread(registrar_resultados_emails, db, lote, emails, resultados)
+
+    falhas = len(emails) - enviados
+    estado_outbox_email["ultimo_lote_em"] = datetime.utcnow().isoformat()
+    estado_outbox_email["enviados"] += enviados
+    estado_outbox_email["falhas"] += falhas
+    if falhas:
+        print(f"[OUTBOX] {enviados} e-mail(s) enviados, {falhas} com falha")
+
+    return {"reivindicados": len(emails), "enviados": enviados, "falhas": falhas}
+
+
+async def worker_outbox_email():
+    """Loop contínuo que drena a outbox de e-mails"""
+    global _outbox_loop, _outbox_sinal
+    _outbox_loop = asyncio.get_running_loop()
+    _outbox_sinal = asyncio.Event()
+    estado_outbox_email["ativo"] = True
+    print(f"[OUTBOX] Envio de e-mails iniciado (lote={EMAIL_OUTBOX_LOTE}, {SMTP_ENVIOS_POR_MINUTO}/min por servidor)")
+
+    try:
+        while True:
+            _outbox_sinal.clear()
+            db = SessionLocal()
+            try:
+                resultado = await drenar_outbox_email(db)
+            except Exception as e:
+                db.rollback()
+                print(f"[ERRO] Falha no worker da outbox: {e}")
+                resultado = {"reivindicados": 0}
+            finally:
+                db.close()
+
+            if resultado["reivindicados"] >= EMAIL_OUTBOX_LOTE:
+                continue
+
+            try:
+                await asyncio.wait_for(_outbox_sinal.wait(), timeout=EMAIL_OUTBOX_INTERVALO_SEGUNDOS)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        estado_outbox_email["ativo"] = False
+        _outbox_loop = None
+        _outbox_sinal = None
+        print("[OUTBOX] Envio de e-mails encerrado")
@@ -0,0 +1,328 @@
+"""
+Eventos do sistema e worker que os processa em segundo plano
+"""
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import time
+import uuid
+import json
+
+from vivio.automacao import processar_jornadas_por_evento
+from vivio.config import (
+    EVENTOS_CONCORRENCIA, EVENTOS_ESPERA_BASE_SEGUNDOS, EVENTOS_INTERVALO_SEGUNDOS, EVENTOS_LOTE,
+    EVENTOS_MAX_TENTATIVAS, EVENTOS_REIVINDICACAO_EXPIRA_SEGUNDOS)
+from vivio.database import SessionLocal
+from vivio.models import EventoSistema, Grupo
+
+
+# ============================================================
+# Funções de Sistema de Eventos (Event-Driven)
+# ============================================================
+
+
+def registrar_evento(db: Session, tipo: str, payload: dict):
+    """Registra um evento no sistema para processamento assíncrono"""
+    evento = EventoSistema(
+        tipo=tipo,
+        payload=json.dumps(payload)
+    )
+    db.add(evento)
+    db.commit()
+    db.refresh(evento)
+    notificar_worker_eventos()
+    return evento
+
+
+GRUPO_ALTO_RISCO = "Alto Risco de Churn"
+
+
+def obter_grupo_alto_risco(db: Session) -> Grupo:
+    """
+    Grupo dinâmico de alto risco, criado no primeiro alerta. Eventos rodam em
+    paralelo: o índice único ux_grupos_dinamicos_nome_unidade barra a
+    duplicata e quem perder a corrida usa o grupo criado pelo outro
+    """
+    def buscar():
+        return db.query(Grupo).filter(
+            Grupo.nome == GRUPO_ALTO_RISCO,
+            Grupo.tipo_grupo == "dinamico",
+            Grupo.unidade_id == None
+        ).first()
+
+    grupo = buscar()
+    if grupo:
+        return grupo
+
+    grupo = Grupo(
+        nome=GRUPO_ALTO_RISCO,
+        descricao="Usuários com alta probabilidade de desistência (criado automaticamente por IA)",
+        status="ativo",
+        tipo_grupo="dinamico",
+        cor="#e74c3c",
+        automacao_ativa=True,
+        criterios=json.dumps({"risco_churn": {"operador": ">", "valor": 0.75}})
+    )
+    db.add(grupo)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        existente = buscar()
+        if existente is None:
+            raise
+        return existente
+    print(f"[GRUPO CRIADO] Grupo '{GRUPO_ALTO_RISCO}' criado automaticamente")
+    return grupo
+
+
+def processar_evento(db: Session, evento: EventoSistema):
+    """Executa as ações de um evento (não marca o evento como processado)"""
+    payload = json.loads(evento.payload)
+    
+    if evento.tipo == "CHURN_ALERTA":
+        print(f"[ALERTA CHURN] Usuário {payload.get('usuario_nome')} com risco de {payload.get('risco')}%")
+        
+        obter_grupo_alto_risco(db)
+    
+    elif evento.tipo == "RESERVA_CRIADA":
+        print(f"[RESERVA] Nova reserva criada por usuário ID {payload.get('usuario_id')}")
+    
+    elif evento.tipo == "LEAD_CONVERTIDO":
+        print(f"[LEAD] Visitante convertido: {payload.get('nome')}")
+    
+    # Processar jornadas acionadas por este evento
+    processar_jornadas_por_evento(db, evento)
+
+
+def reivindicar_eventos(db: Session, limite: int) -> list:
+    """
+    Reserva um lote de eventos pendentes para este processo. Eventos
+    reivindicados há mais de EVENTOS_REIVINDICACAO_EXPIRA_SEGUNDOS (worker
+    que caiu no meio do lote) voltam a ficar disponíveis; eventos que
+    falharam só voltam depois da espera de proxima_tentativa.
+    """
+    agora = datetime.utcnow()
+    expiracao = agora - timedelta(seconds=EVENTOS_REIVINDICACAO_EXPIRA_SEGUNDOS)
+    disponivel = and_(
+        EventoSistema.status == "PENDENTE",
+        or_(EventoSistema.reivindicado_em == None, EventoSistema.reivindicado_em < expiracao),
+        or_(EventoSistema.proxima_tentativa == None, EventoSistema.proxima_tentativa <= agora))
+
+    candidatos = [evento_id for (evento_id,) in db.query(EventoSistema.id).filter(
+        EventoSistema.processado == False,
+        disponivel
+    ).order_by(EventoSistema.id).limit(limite).all()]
+
+    if not candidatos:
+        return []
+
+    lote = uuid.uuid4().hex
+    db.query(EventoSistema).filter(
+        EventoSistema.id.in_(candidatos),
+        EventoSistema.processado == False,
+        disponivel
+    ).update({EventoSistema.reivindicado_em: agora,
+              EventoSistema.lote_processamento: lote},
+             synchronize_session=False)
+    db.commit()
+
+    # Outro worker pode ter reivindicado parte dos candidatos no meio tempo
+    return [evento_id for (evento_id,) in db.query(EventoSistema.id).filter(
+        EventoSistema.lote_processamento == lote
+    ).order_by(EventoSistema.id).all()]
+
+
+# A lógica dos eventos usa o SQLAlchemy síncrono: roda num executor próprio
+# para que EVENTOS_CONCORRENCIA eventos andem de fato em paralelo sem
+# bloquear o loop nem ocupar o threadpool dos endpoints síncronos
+_executor_eventos = None
+
+
+def obter_executor_eventos():
+    global _executor_eventos
+    if _executor_eventos is None:
+        _executor_eventos = ThreadPoolExecutor(max_workers=EVENTOS_CONCORRENCIA,
+                                               thread_name_prefix="eventos")
+    return _executor_eventos
+
+
+def encerrar_executor_eventos():
+    global _executor_eventos
+    if _executor_eventos is not None:
+        _executor_eventos.shutdown(wait=False, cancel_futures=True)
+        _executor_eventos = None
+
+
+def _processar_evento_isolado(evento_id: int):
+    """Processa um evento em sessão própria; retorna None ou a mensagem de erro"""
+    db = SessionLocal()
+    try:
+        evento = db.query(EventoSistema).filter(EventoSistema.id == evento_id).first()
+        if not evento:
+            return "Evento não encontrado"
+        processar_evento(db, evento)
+        return None
+    except Exception as e:
+        print(f"[ERRO] Falha ao processar evento {evento_id}: {e}")
+        db.rollback()
+        return str(e) or e.__class__.__name__
+    finally:
+        db.close()
+
+
+def registrar_resultados_eventos(db: Session, lote: list, erros: dict) -> int:
+    """
+    Grava o resultado do lote: processados num único UPDATE; cada falha
+    libera a reivindicação e agenda nova tentativa com espera exponencial,
+    ou fica em ERRO depois de EVENTOS_MAX_TENTATIVAS. Retorna quantos
+    eventos foram para ERRO.
+    """
+    agora = datetime.utcnow()
+    processados = [evento_id for evento_id in lote if evento_id not in erros]
+    if processados:
+        db.query(EventoSistema).filter(
+            EventoSistema.id.in_(processados)
+        ).update({EventoSistema.processado: True,
+                  EventoSistema.status: "PROCESSADO",
+                  EventoSistema.data_processamento: agora,
+                  EventoSistema.ultimo_erro: None,
+                  EventoSistema.proxima_tentativa: None,
+                  EventoSistema.reivindicado_em: None,
+                  EventoSistema.lote_processamento: None},
+                 synchronize_session=False)
+
+    esgotados = 0
+    if erros:
+        for evento in db.query(EventoSistema).filter(EventoSistema.id.in_(list(erros))).all():
+            evento.tentativas = (evento.tentativas or 0) + 1
+            evento.ultimo_erro = erros[evento.id][:1000]
+            evento.reivindicado_em = None
+            evento.lote_processamento = None
+            if evento.tentativas >= EVENTOS_MAX_TENTATIVAS:
+                evento.status = "ERRO"
+                evento.proxima_tentativa = None
+                esgotados += 1
+                print(f"[ERRO] Evento {evento.id} ({evento.tipo}) desistido após {evento.tentativas} tentativas")
+            else:
+                espera = EVENTOS_ESPERA_BASE_SEGUNDOS * 2 ** (evento.tentativas - 1)
+                evento.proxima_tentativa = agora + timedelta(seconds=espera)
+
+    db.commit()
+    return esgotados
+
+
+async def processar_eventos(db: Session, limite: int = None):
+    """
+    Processa eventos pendentes (automações, notificações, etc).
+    Os eventos do lote rodam em paralelo no executor de eventos (até
+    EVENTOS_CONCORRENCIA) e o status de todos é gravado em um único commit
+    ao final.
+    """
+    inicio = time.monotonic()
+    evento_ids = await asyncio.to_thread(reivindicar_eventos, db, limite or EVENTOS_LOTE)
+    if not evento_ids:
+        return {"reivindicados": 0, "processados": 0, "falhas": 0, "erros": 0}
+
+    loop = asyncio.get_running_loop()
+    executor = obter_executor_eventos()
+    resultados = await asyncio.gather(*[
+        loop.run_in_executor(executor, _processar_evento_isolado, evento_id)
+        for evento_id in evento_ids
+    ])
+
+    erros = {evento_id: erro for evento_id, erro in zip(evento_ids, resultados) if erro is not None}
+    esgotados = await asyncio.to_thread(registrar_resultados_eventos, db, evento_ids, erros)
+    processados = len(evento_ids) - len(erros)
+
+    registrar_metricas_lote_eventos(processados, len(erros), time.monotonic() - inicio)
+
+    return {"reivindicados": len(evento_ids), "processados": processados,
+            "falhas": len(erros), "erros": esgotados}
+
+
+# ============================================================
+# Worker de Eventos em Segundo Plano
+# ============================================================
+
+estado_worker_eventos = {
+    "ativo": False,
+    "iniciado_em": None,
+    "ultimo_lote_em": None,
+    "lotes": 0,
+    "eventos_processados": 0,
+    "eventos_com_falha": 0,
+    "ultimo_lote": None,
+}
+
+# (instante monotônico, eventos processados) dos lotes recentes, para a vazão
+_historico_lotes_eventos = deque(maxlen=1000)
+_worker_eventos_loop = None
+_worker_eventos_sinal = None
+
+
+def registrar_metricas_lote_eventos(processados: int, falhas: int, duracao: float):
+    estado_worker_eventos["lotes"] += 1
+    estado_worker_eventos["eventos_processados"] += processados
+    estado_worker_eventos["eventos_com_falha"] += falhas
+    estado_worker_eventos["ultimo_lote_em"] = datetime.utcnow().isoformat()
+    estado_worker_eventos["ultimo_lote"] = {
+        "processados": processados,
+        "falhas": falhas,
+        "duracao_segundos": round(duracao, 3)
+    }
+    _historico_lotes_eventos.append((time.monotonic(), processados))
+
+
+def vazao_eventos(janela_segundos: int = 60) -> float:
+    """Eventos processados por segundo na janela informada"""
+    limite = time.monotonic() - janela_segundos
+    total = sum(qtd for instante, qtd in _historico_lotes_eventos if instante >= limite)
+    return round(total / janela_segundos, 3)
+
+
+def notificar_worker_eventos():
+    """Acorda o worker para processar um evento recém-registrado sem esperar o próximo ciclo"""
+    loop = _worker_eventos_loop
+    if loop is not None and _worker_eventos_sinal is not None and not loop.is_closed():
+        loop.call_soon_threadsafe(_worker_eventos_sinal.set)
+
+
+async def worker_eventos():
+    """Loop contínuo que processa os eventos pendentes em lotes"""
+    global _worker_eventos_loop, _worker_eventos_sinal
+    _worker_eventos_loop = asyncio.get_running_loop()
+    _worker_eventos_sinal = asyncio.Event()
+    estado_worker_eventos["ativo"] = True
+    estado_worker_eventos["iniciado_em"] = datetime.utcnow().isoformat()
+    print(f"[WORKER] Processamento de eventos iniciado (lote={EVENTOS_LOTE}, concorrência={EVENTOS_CONCORRENCIA})")
+
+    try:
+        while True:
+            _worker_eventos_sinal.clear()
+            db = SessionLocal()
+            try:
+                resultado = await processar_eventos(db)
+            except Exception as e:
+                print(f"[ERRO] Falha no worker de eventos: {e}")
+                resultado = {"reivindicados": 0}
+            finally:
+                db.close()
+
+            # Lote cheio: provavelmente há mais eventos na fila
+            if resultado["reivindicados"] >= EVENTOS_LOTE:
+                continue
+
+            try:
+                await asyncio.wait_for(_worker_eventos_sinal.wait(), timeout=EVENTOS_INTERVALO_SEGUNDOS)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        estado_worker_eventos["ativo"] = False
+        _worker_eventos_loop = None
+        _worker_eventos_sinal = None
+        print("[WORKER] Processamento de eventos encerrado")
@@ -0,0 +1,45 @@
+"""
+Exportação CSV em streaming
+"""
+import os
+import io
+import csv
+
+from vivio.database import SessionLocal
+
+
+CSV_LINHAS_POR_BLOCO = int(os.getenv("CSV_LINHAS_POR_BLOCO", "500"))
+
+
+def gerar_csv_streaming(cabecalho: list, montar_consulta, formatar_linha, bom: bool = False):
+    """
+    Gera um CSV em blocos de CSV_LINHAS_POR_BLOCO linhas. A consulta roda
+    em uma sessão própria aberta dentro do gerador (a sessão do get_db já
+    foi fechada quando o corpo da resposta começa a ser enviado) e é lida
+    com yield_per, mantendo a memória constante
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    if bom:
+        buffer.write('\ufeff')
+    writer.writerow(cabecalho)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate(0)
+
+    db = SessionLocal()
+    try:
+        linhas = 0
+        for linha in montar_consulta(db).yield_per(CSV_LINHAS_POR_BLOCO):
+            writer.writerow(formatar_linha(linha))
+            linhas += 1
+            if linhas % CSV_LINHAS_POR_BLOCO == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+
+        if buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        db.close()
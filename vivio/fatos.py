@@ -0,0 +1,351 @@
+"""
+Fatos diários por unidade (rollup incremental usado pelos relatórios)
+"""
+from sqlalchemy import case, event, func, or_
+from sqlalchemy.orm import Session
+from datetime import date, datetime, timedelta
+import logging
+import threading
+import time
+
+from vivio.config import FATOS_ESPERA_ERRO_SEGUNDOS
+from vivio.database import SessionLocal, valores_atributo
+from vivio.models import Attendance, Contrato, EventoAula, FatoDiarioUnidade, ReservaAula, Visitante
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# Fatos Diários - Rollup Incremental para Relatórios
+# ============================================================
+
+METRICAS_FATO_DIARIO = ["aulas", "capacidade", "reservas", "cancelamentos", "presencas",
+                        "faltas", "leads", "conversoes", "receita_contratos"]
+
+
+def _como_data(valor):
+    """func.date() devolve texto no SQLite e date no PostgreSQL"""
+    if valor is None:
+        return None
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    return date.fromisoformat(str(valor)[:10])
+
+
+def calcular_fatos_diarios(db: Session, inicio: date, fim: date, unidade_id: int = None) -> dict:
+    """
+    Calcula as métricas de cada (unidade, dia) entre inicio e fim (inclusive)
+    com uma consulta agrupada por fonte. Dias sem movimento não aparecem
+    """
+    dt_inicio = datetime(inicio.year, inicio.month, inicio.day)
+    dt_fim = datetime(fim.year, fim.month, fim.day) + timedelta(days=1)
+    fatos = {}
+
+    def fato(u, dia):
+        return fatos.setdefault((u, _como_data(dia)), {m: 0 for m in METRICAS_FATO_DIARIO})
+
+    dia_aula = func.date(EventoAula.data_hora)
+    filtros_aula = [EventoAula.data_hora >= dt_inicio, EventoAula.data_hora < dt_fim]
+    if unidade_id is not None:
+        filtros_aula.append(EventoAula.unidade_id == unidade_id)
+
+    for u, dia, aulas, capacidade in db.query(
+        EventoAula.unidade_id, dia_aula,
+        func.count(EventoAula.id),
+        func.coalesce(func.sum(EventoAula.limite_inscricoes), 0)
+    ).filter(*filtros_aula).group_by(EventoAula.unidade_id, dia_aula):
+        f = fato(u, dia)
+        f["aulas"], f["capacidade"] = aulas, capacidade
+
+    for u, dia, reservas, cancelamentos in db.query(
+        EventoAula.unidade_id, dia_aula,
+        func.count(ReservaAula.id),
+        func.coalesce(func.sum(case((ReservaAula.cancelada == True, 1), else_=0)), 0)
+    ).select_from(ReservaAula).join(
+        EventoAula, ReservaAula.evento_aula_id == EventoAula.id
+    ).filter(*filtros_aula).group_by(EventoAula.unidade_id, dia_aula):
+        f = fato(u, dia)
+        f["reservas"], f["cancelamentos"] = reservas, cancelamentos
+
+    for u, dia, presencas, faltas in db.query(
+        EventoAula.unidade_id, dia_aula,
+        func.coalesce(func.sum(case((Attendance.status == "presente", 1), else_=0)), 0),
+        func.coalesce(func.sum(case((Attendance.status == "falta", 1), else_=0)), 0)
+    ).select_from(Attendance).join(
+        EventoAula, Attendance.evento_aula_id == EventoAula.id
+    ).filter(*filtros_aula).group_by(EventoAula.unidade_id, dia_aula):
+        f = fato(u, dia)
+        f["presencas"], f["faltas"] = presencas, faltas
+
+    dia_visita = func.date(Visitante.data_visita)
+    filtros_visita = [Visitante.data_visita >= dt_inicio, Visitante.data_visita < dt_fim]
+    if unidade_id is not None:
+        filtros_visita.append(Visitante.unidade_id == unidade_id)
+
+    for u, dia, leads, conversoes in db.query(
+        Visitante.unidade_id, dia_visita,
+        func.count(Visitante.id),
+        func.coalesce(func.sum(case((Visitante.convertido == True, 1), else_=0)), 0)
+    ).filter(*filtros_visita).group_by(Visitante.unidade_id, dia_visita):
+        f = fato(u, dia)
+        f["leads"], f["conversoes"] = leads, conversoes
+
+    # Receita: contratos ativos cuja vigência cobre o dia
+    contratos = db.query(
+        Contrato.unidade_id, Contrato.valor_mensal, Contrato.data_inicio, Contrato.data_fim
+    ).filter(
+        Contrato.status == "ativo",
+        or_(Contrato.data_inicio == None, Contrato.data_inicio < dt_fim),
+        or_(Contrato.data_fim == None, Contrato.data_fim >= dt_inicio)
+    )
+    if unidade_id is not None:
+        contratos = contratos.filter(Contrato.unidade_id == unidade_id)
+
+    for u, valor, c_inicio, c_fim in contratos:
+        dia = max(inicio, c_inicio.date()) if c_inicio else inicio
+        ultimo = min(fim, c_fim.date()) if c_fim else fim
+        while dia <= ultimo:
+            fato(u, dia)["receita_contratos"] += valor or 0
+            dia += timedelta(days=1)
+
+    return fatos
+
+
+def recalcular_fatos_diarios(db: Session, inicio: date, fim: date, unidade_id: int = None) -> int:
+    """Substitui as linhas de fatos do intervalo pelos valores recalculados (não faz commit)"""
+    fatos = calcular_fatos_diarios(db, inicio, fim, unidade_id)
+
+    existentes = db.query(FatoDiarioUnidade).filter(
+        FatoDiarioUnidade.data >= inicio,
+        FatoDiarioUnidade.data <= fim
+    )
+    if unidade_id is not None:
+        existentes = existentes.filter(FatoDiarioUnidade.unidade_id == unidade_id)
+    existentes.delete(synchronize_session=False)
+
+    agora = datetime.utcnow()
+    db.bulk_insert_mappings(FatoDiarioUnidade, [
+        dict(metricas, unidade_id=u, data=dia, data_atualizacao=agora)
+        for (u, dia), metricas in fatos.items()
+        if u is not None
+    ])
+    return len(fatos)
+
+
+def reconstruir_fatos_diarios(db: Session, unidade_id: int = None,
+                              inicio: date = None, fim: date = None) -> dict:
+    """
+    Recalcula os fatos do zero. Por padrão vai da atividade mais antiga até
+    hoje ou até a última aula/visita, se houver alguma agendada no futuro
+    """
+    if inicio is None:
+        candidatos = [
+            db.query(func.min(EventoAula.data_hora)).scalar(),
+            db.query(func.min(Visitante.data_visita)).scalar(),
+            db.query(func.min(Contrato.data_inicio)).filter(Contrato.status == "ativo").scalar(),
+        ]
+        candidatos = [_como_data(c) for c in candidatos if c is not None]
+        inicio = min(candidatos) if candidatos else datetime.utcnow().date()
+    if fim is None:
+        candidatos = [
+            db.query(func.max(EventoAula.data_hora)).scalar(),
+            db.query(func.max(Visitante.data_visita)).scalar(),
+        ]
+        fim = max([datetime.utcnow().date()] + [_como_data(c) for c in candidatos if c is not None])
+
+    linhas = recalcular_fatos_diarios(db, inicio, fim, unidade_id)
+    db.commit()
+    return {"inicio": inicio.isoformat(), "fim": fim.isoformat(), "linhas": linhas}
+
+
+# ============================================================
+# Recálculo em Segundo Plano
+# ============================================================
+#
+# O commit só enfileira os dias alterados; um thread por processo os
+# recalcula depois, em transação própria. Assim a transação da reserva não
+# toca em fatos_diarios_unidade (sem disputa pelo índice único
+# ix_fatos_diarios_unidade_dia nem lock de escrita mais longo no SQLite).
+# Dias enfileirados num processo que cai só voltam na reconstrução.
+
+_fila_fatos = {"dias": set(), "aulas": set()}
+_fila_fatos_lock = threading.Lock()
+_fila_fatos_sinal = threading.Event()
+_recalculo_fatos_lock = threading.Lock()
+_worker_fatos = None
+
+
+def enfileirar_fatos(dias, aulas=()):
+    """Agenda o recálculo de (unidade_id, dia) e dos dias das aulas informadas"""
+    global _worker_fatos
+    with _fila_fatos_lock:
+        _fila_fatos["dias"].update(dias)
+        _fila_fatos["aulas"].update(aulas)
+        if _worker_fatos is None:
+            _worker_fatos = threading.Thread(target=_manter_fatos_atualizados,
+                                             name="fatos_diarios", daemon=True)
+            _worker_fatos.start()
+    _fila_fatos_sinal.set()
+
+
+def _travar_fato_dia(db: Session, unidade_id: int, dia: date):
+    """
+    Garante a linha do dia e pega o lock dela (INSERT ... ON CONFLICT DO
+    UPDATE). Recálculos concorrentes do mesmo dia, inclusive de outros
+    processos, ficam em fila e cada um lê os dados já confirmados
+    """
+    dialeto = db.get_bind().dialect.name
+    if dialeto == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialeto == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return
+    agora = datetime.utcnow()
+    db.execute(insert(FatoDiarioUnidade).values(
+        unidade_id=unidade_id, data=dia, data_atualizacao=agora
+    ).on_conflict_do_update(index_elements=["unidade_id", "data"],
+                            set_={"data_atualizacao": agora}))
+
+
+def atualizar_fato_dia(db: Session, unidade_id: int, dia: date):
+    """Recalcula a linha de fatos de um dia da unidade (não faz commit)"""
+    _travar_fato_dia(db, unidade_id, dia)
+    metricas = calcular_fatos_diarios(db, dia, dia, unidade_id).get(
+        (unidade_id, dia), {m: 0 for m in METRICAS_FATO_DIARIO})
+    atualizados = db.query(FatoDiarioUnidade).filter(
+        FatoDiarioUnidade.unidade_id == unidade_id,
+        FatoDiarioUnidade.data == dia
+    ).update(dict(metricas, data_atualizacao=datetime.utcnow()), synchronize_session=False)
+    if not atualizados:
+        db.add(FatoDiarioUnidade(unidade_id=unidade_id, data=dia, **metricas))
+
+
+def processar_fatos_pendentes() -> int:
+    """
+    Recalcula os dias enfileirados, um commit por dia. Ao retornar, tudo que
+    foi enfileirado antes da chamada está gravado. Retorna os dias recalculados
+    """
+    with _recalculo_fatos_lock:
+        with _fila_fatos_lock:
+            dias, aulas = set(_fila_fatos["dias"]), set(_fila_fatos["aulas"])
+            _fila_fatos["dias"].clear()
+            _fila_fatos["aulas"].clear()
+        if not dias and not aulas:
+            return 0
+
+        db = SessionLocal()
+        feitos = set()
+        try:
+            if aulas:
+                for u, data_hora in db.query(EventoAula.unidade_id, EventoAula.data_hora).filter(
+                    EventoAula.id.in_(aulas)
+                ):
+                    if u is not None and data_hora is not None:
+                        dias.add((u, data_hora.date()))
+                db.commit()
+
+            for u, dia in sorted(dias):
+                atualizar_fato_dia(db, u, dia)
+                db.commit()
+                feitos.add((u, dia))
+            return len(feitos)
+        except Exception:
+            db.rollback()
+            restantes = dias - feitos
+            logger.exception("Erro ao atualizar fatos diários; %d dia(s) voltam para a fila",
+                             len(restantes))
+            # Recalcular de novo um dia já feito é inofensivo: as aulas voltam inteiras
+            enfileirar_fatos(restantes, aulas)
+            raise
+        finally:
+            db.close()
+
+
+def _manter_fatos_atualizados():
+    while True:
+        _fila_fatos_sinal.wait()
+        _fila_fatos_sinal.clear()
+        try:
+            processar_fatos_pendentes()
+        except Exception:
+            time.sleep(FATOS_ESPERA_ERRO_SEGUNDOS)
+            _fila_fatos_sinal.set()
+
+
+def marcar_fatos_pendentes(db: Session, unidade_id: int = None, dia=None, evento_aula_id: int = None):
+    """
+    Marca dias a recalcular após o commit da sessão. Alterações via ORM são
+    marcadas pelo listener de after_flush; UPDATE/DELETE em lote precisam
+    chamar esta função
+    """
+    pendentes = db.info.setdefault("fatos_pendentes", {"dias": set(), "aulas": set()})
+    if evento_aula_id is not None:
+        pendentes["aulas"].add(evento_aula_id)
+    if unidade_id is not None and dia is not None:
+        pendentes["dias"].add((unidade_id, _como_data(dia)))
+
+
+def _coletar_fatos_pendentes(session, flush_context):
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, (ReservaAula, Attendance)):
+            for aula_id in valores_atributo(obj, "evento_aula_id"):
+                marcar_fatos_pendentes(session, evento_aula_id=aula_id)
+        elif isinstance(obj, EventoAula):
+            for u in valores_atributo(obj, "unidade_id"):
+                for dia in valores_atributo(obj, "data_hora"):
+                    marcar_fatos_pendentes(session, u, dia)
+        elif isinstance(obj, Visitante):
+            for u in valores_atributo(obj, "unidade_id"):
+                for dia in valores_atributo(obj, "data_visita"):
+                    marcar_fatos_pendentes(session, u, dia)
+        elif isinstance(obj, Contrato):
+            # Receita é uma foto do dia: dias anteriores só mudam na reconstrução
+            for u in valores_atributo(obj, "unidade_id"):
+                marcar_fatos_pendentes(session, u, datetime.utcnow())
+
+
+def _aplicar_fatos_pendentes(session):
+    pendentes = session.info.pop("fatos_pendentes", None)
+    if pendentes and (pendentes["dias"] or pendentes["aulas"]):
+        enfileirar_fatos(pendentes["dias"], pendentes["aulas"])
+
+
+def _descartar_fatos_pendentes(session):
+    session.info.pop("fatos_pendentes", None)
+
+
+event.listen(SessionLocal, "after_flush", _coletar_fatos_pendentes)
+event.listen(SessionLocal, "after_commit", _aplicar_fatos_pendentes)
+event.listen(SessionLocal, "after_rollback", _descartar_fatos_pendentes)
+
+
+def somar_fatos_diarios(db: Session, unidade_id: int, inicio: date = None, fim: date = None) -> dict:
+    """Soma as métricas de fluxo da unidade no intervalo (receita não é somável)"""
+    metricas = [m for m in METRICAS_FATO_DIARIO if m != "receita_contratos"]
+    query = db.query(*[
+        func.coalesce(func.sum(getattr(FatoDiarioUnidade, m)), 0) for m in metricas
+    ]).filter(FatoDiarioUnidade.unidade_id == unidade_id)
+
+    if inicio:
+        query = query.filter(FatoDiarioUnidade.data >= inicio)
+    if fim:
+        query = query.filter(FatoDiarioUnidade.data <= fim)
+
+    return dict(zip(metricas, query.one()))
+
+
+def receita_contratos_no_dia(db: Session, unidade_id: int, dia: date) -> float:
+    """Receita de contratos do dia a partir dos fatos (calcula o dia se faltar)"""
+    receita = db.query(FatoDiarioUnidade.receita_contratos).filter(
+        FatoDiarioUnidade.unidade_id == unidade_id,
+        FatoDiarioUnidade.data == dia
+    ).scalar()
+
+    if receita is None:
+        fatos = calcular_fatos_diarios(db, dia, dia, unidade_id)
+        receita = fatos.get((unidade_id, dia), {}).get("receita_contratos", 0)
+
+    return receita or 0.0
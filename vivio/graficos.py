@@ -0,0 +1,94 @@
+"""
+Gráficos renderizados em processos separados, com cache LRU
+"""
+from collections import OrderedDict
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import os
+import io
+
+
+# ============================================================
+# Geração de Gráficos e Relatórios
+# ============================================================
+
+
+# Gráficos renderizados ficam em cache (LRU) e são gerados em processos separados
+GRAFICOS_CACHE_MAX = int(os.getenv("GRAFICOS_CACHE_MAX", "256"))
+GRAFICOS_PROCESSOS = int(os.getenv("GRAFICOS_PROCESSOS", "2"))
+
+FORMATOS_GRAFICO = {"png": "image/png", "svg": "image/svg+xml"}
+
+
+def gerar_grafico_circular(dados: tuple, formato: str = "png") -> bytes:
+    """
+    Gera gráfico circular a partir de pares (rótulo, valor). Usa a API de
+    objetos do matplotlib (sem estado global do pyplot), então pode rodar
+    em qualquer processo ou thread
+    """
+    import matplotlib
+    matplotlib.use('Agg')  # Backend não-interativo
+    from matplotlib.figure import Figure
+
+    labels = [rotulo for rotulo, _ in dados]
+    sizes = [valor for _, valor in dados]
+    colors = ['#62b1ca', '#27ae60', '#f39c12', '#e74c3c']
+
+    fig = Figure(figsize=(8, 6))
+    ax = fig.subplots()
+    ax.pie(sizes,
+           labels=labels,
+           colors=colors[:len(labels)],
+           autopct='%1.1f%%',
+           startangle=90)
+    ax.axis('equal')
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=formato, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+_cache_graficos = OrderedDict()
+_pool_graficos = None
+
+
+def obter_pool_graficos() -> ProcessPoolExecutor:
+    global _pool_graficos
+    if _pool_graficos is None:
+        _pool_graficos = ProcessPoolExecutor(
+            max_workers=GRAFICOS_PROCESSOS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pool_graficos
+
+
+def encerrar_pool_graficos():
+    global _pool_graficos
+    if _pool_graficos is not None:
+        _pool_graficos.shutdown(wait=False, cancel_futures=True)
+        _pool_graficos = None
+
+
+async def obter_grafico_circular(chave: tuple, dados: tuple, formato: str) -> bytes:
+    """
+    Retorna o gráfico do cache ou o renderiza no pool de processos. A chave
+    inclui os próprios dados, então qualquer mudança de presença/reserva
+    gera uma nova entrada e a antiga sai por LRU
+    """
+    if chave in _cache_graficos:
+        _cache_graficos.move_to_end(chave)
+        return _cache_graficos[chave]
+
+    loop = asyncio.get_running_loop()
+    try:
+        conteudo = await loop.run_in_executor(obter_pool_graficos(), gerar_grafico_circular, dados, formato)
+    except BrokenProcessPool:
+        encerrar_pool_graficos()
+        raise
+
+    _cache_graficos[chave] = conteudo
+    while len(_cache_graficos) > GRAFICOS_CACHE_MAX:
+        _cache_graficos.popitem(last=False)
+    return conteudo
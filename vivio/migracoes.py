@@ -0,0 +1,552 @@
+"""
+Migrações versionadas do schema e dados iniciais
+"""
+from sqlalchemy import func, inspect as sa_inspect, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex
+from datetime import datetime, timedelta
+from contextlib import contextmanager
+import hashlib
+
+from vivio.busca import (
+    EXERCICIOS_FTS, EXERCICIOS_TSV, INDICE_BUSCA_FTS, INDICE_BUSCA_TRGM, reconstruir_indice_busca)
+from vivio.database import Base, engine
+from vivio.fatos import reconstruir_fatos_diarios
+from vivio.models import (
+    Attendance, EventoAula, FatoDiarioUnidade, Grupo, IndiceBusca, Instrutor, JobTreinamento,
+    MetricaEngajamento, Sala, SchemaMigracao, Unidade)
+
+
+# ============================================================
+# Inicializar Banco de Dados
+# ============================================================
+
+
+def limpar_duplicatas_attendance(db: Session):
+    """
+    Limpa duplicatas de Attendance antes de criar o índice único
+    """
+    duplicatas = db.query(Attendance.reserva_aula_id,
+                          func.count(Attendance.id).label('count')).group_by(
+                              Attendance.reserva_aula_id).having(
+                                  func.count(Attendance.id) > 1).all()
+
+    for reserva_id, count in duplicatas:
+        registros = db.query(Attendance).filter(
+            Attendance.reserva_aula_id == reserva_id).order_by(
+                Attendance.data_marcacao.desc()).all()
+
+        for registro in registros[1:]:
+            db.delete(registro)
+
+    db.commit()
+
+
+def adicionar_colunas_faltantes(conn, tabela: str, colunas: list, rotulo: str) -> list:
+    """
+    Adiciona as colunas (nome, complemento SQL) que ainda não existem na
+    tabela. O tipo vem do modelo, compilado para o dialeto do banco
+    """
+    existentes = {c["name"] for c in sa_inspect(conn).get_columns(tabela)}
+    adicionadas = []
+    
+    for nome, complemento in colunas:
+        if nome in existentes:
+            continue
+        tipo = Base.metadata.tables[tabela].c[nome].type.compile(dialect=conn.dialect)
+        conn.execute(text(f"ALTER TABLE {tabela} ADD COLUMN {nome} {tipo} {complemento}".strip()))
+        print(f"✅ Migração {rotulo}: Coluna '{nome}' adicionada")
+        adicionadas.append(nome)
+    
+    return adicionadas
+
+
+# ============================================================
+# Migrações de Schema (revisões versionadas)
+# ============================================================
+#
+# Cada revisão roda uma única vez por banco e fica registrada em
+# schema_migracoes. Com o schema em dia, o boot faz só um SELECT MAX.
+# Para alterar o schema, acrescente uma função ao fim de MIGRACOES;
+# nunca renumere nem altere revisões já publicadas.
+
+
+def criar_tabelas(conn):
+    """Cria as tabelas (e seus índices) que ainda não existem"""
+    Base.metadata.create_all(bind=conn)
+
+
+def migrar_schema_b2b(conn):
+    """Suporte B2B em unidades e visitantes"""
+    adicionar_colunas_faltantes(conn, 'unidades', [
+        ('tipo_unidade', "DEFAULT 'B2C'"),
+    ], "B2B")
+    adicionar_colunas_faltantes(conn, 'visitantes', [
+        ('tipo_lead', "DEFAULT 'Individual'"),
+        ('empresa', ""),
+    ], "B2B")
+
+
+def migrar_schema_eventos_aulas(conn):
+    """Novos campos em eventos_aulas"""
+    adicionadas = adicionar_colunas_faltantes(conn, 'eventos_aulas', [
+        ('membro_equipe_id', ""),
+        ('sala_nome', ""),
+        ('modo', ""),
+        ('data_fim', ""),
+        ('dias_semana_recorrencia', ""),
+        ('semanas_recorrencia', "DEFAULT 1"),
+        ('participantes_alvo', ""),
+        ('instrucoes', ""),
+        ('observacoes', ""),
+        ('cor', "DEFAULT '#123058'"),
+        ('reservas_ativas', "NOT NULL DEFAULT 0"),
+    ], "EventoAula")
+
+    if 'reservas_ativas' in adicionadas:
+        # Preenche o contador com as reservas não canceladas já existentes
+        conn.execute(text("""
+            UPDATE eventos_aulas SET reservas_ativas = (
+                SELECT COUNT(*) FROM reservas_aulas
+                WHERE reservas_aulas.evento_aula_id = eventos_aulas.id
+                  AND reservas_aulas.cancelada = :falso
+            )
+        """), {"falso": False})
+        print("✅ Migração EventoAula: Contador 'reservas_ativas' preenchido")
+
+
+def migrar_schema_eventos_sistema(conn):
+    """Colunas de reivindicação do worker de eventos"""
+    adicionar_colunas_faltantes(conn, 'eventos_sistema', [
+        ('reivindicado_em', ""),
+        ('lote_processamento', ""),
+    ], "EventoSistema")
+
+
+def migrar_modelos_churn(conn):
+    """
+    Move os modelos de churn legados (hex em unidades.modelo_churn) para a
+    tabela modelos_churn em formato binário e limpa a coluna antiga
+    """
+    colunas = {c["name"] for c in sa_inspect(conn).get_columns('unidades')}
+    if 'modelo_churn' not in colunas:
+        return
+    
+    legados = conn.execute(text(
+        "SELECT id, modelo_churn FROM unidades WHERE modelo_churn IS NOT NULL"
+    )).all()
+    
+    for unidade_id, modelo_hex in legados:
+        existe = conn.execute(text(
+            "SELECT 1 FROM modelos_churn WHERE unidade_id = :unidade_id"
+        ), {"unidade_id": unidade_id}).first()
+        if existe is None:
+            modelo = bytes.fromhex(modelo_hex)
+            conn.execute(text(
+                """INSERT INTO modelos_churn
+                   (unidade_id, versao, hash_modelo, modelo, total_amostras, data_treinamento)
+                   VALUES (:unidade_id, 1, :hash_modelo, :modelo, 0, :data_treinamento)"""
+            ), {
+                "unidade_id": unidade_id,
+                "hash_modelo": hashlib.sha256(modelo).hexdigest(),
+                "modelo": modelo,
+                "data_treinamento": datetime.utcnow()
+            })
+    
+    if legados:
+        conn.execute(text("UPDATE unidades SET modelo_churn = NULL WHERE modelo_churn IS NOT NULL"))
+        print(f"✅ Migração ModeloChurn: {len(legados)} modelo(s) movido(s) para modelos_churn")
+
+
+def criar_indices_desempenho(conn):
+    """
+    Cria nos bancos já existentes os índices declarados nos modelos
+    (create_all só os cria junto com tabelas novas)
+    """
+    inspector = sa_inspect(conn)
+    for tabela in Base.metadata.sorted_tables:
+        existentes = {i["name"] for i in inspector.get_indexes(tabela.name)}
+        for indice in tabela.indexes:
+            if indice.name in existentes or indice.unique:
+                continue
+            indice.create(bind=conn, checkfirst=True)
+            print(f"✅ Índice '{indice.name}' criado em {tabela.name}")
+
+
+def criar_constraint_unico_attendance(conn):
+    """
+    Remove duplicatas e cria o índice único em attendance.reserva_aula_id
+    """
+    with Session(bind=conn) as db:
+        limpar_duplicatas_attendance(db)
+
+    indices = {i["name"] for i in sa_inspect(conn).get_indexes("attendance")}
+    if "idx_unique_attendance_reserva" not in indices:
+        conn.execute(text(
+            "CREATE UNIQUE INDEX idx_unique_attendance_reserva ON attendance(reserva_aula_id)"
+        ))
+        print("✅ Constraint único criado em attendance.reserva_aula_id")
+
+
+def popular_dados_exemplo(conn):
+    """Unidade, métrica, salas, instrutores e aulas iniciais de um banco vazio"""
+    with Session(bind=conn) as db:
+        if db.query(Unidade).count() == 0:
+            unidade = Unidade(nome="Unidade Principal",
+                              endereco="Av. Principal, 123",
+                              risco_desistencia=15.5)
+            db.add(unidade)
+            db.commit()
+
+        if db.query(MetricaEngajamento).count() == 0:
+            metrica = MetricaEngajamento(unidade_id=1,
+                                         taxa_engajamento=75.0,
+                                         roi=120.0,
+                                         produtividade=85.0,
+                                         usuarios_ativos=42)
+            db.add(metrica)
+            db.commit()
+
+        if db.query(Sala).count() == 0:
+            salas = [
+                Sala(nome="Sala A - Spinning", capacidade=20, unidade_id=1),
+                Sala(nome="Sala B - Yoga", capacidade=15, unidade_id=1),
+                Sala(nome="Sala C - Musculação", capacidade=30, unidade_id=1)
+            ]
+            for sala in salas:
+                db.add(sala)
+            db.commit()
+
+        if db.query(Instrutor).count() == 0:
+            instrutores = [
+                Instrutor(nome="Carlos Silva",
+                          email="carlos@gym.com",
+                          especialidades="Spinning, HIIT",
+                          unidade_id=1),
+                Instrutor(nome="Ana Martins",
+                          email="ana@gym.com",
+                          especialidades="Yoga, Pilates",
+                          unidade_id=1),
+                Instrutor(nome="João Santos",
+                          email="joao@gym.com",
+                          especialidades="Musculação, Funcional",
+                          unidade_id=1)
+            ]
+            for instrutor in instrutores:
+                db.add(instrutor)
+            db.commit()
+
+        if db.query(EventoAula).count() == 0:
+            aulas = [
+                EventoAula(
+                    nome_aula="Spinning Matinal",
+                    descricao="Aula intensa de spinning para começar o dia",
+                    instrutor_id=1,
+                    sala_id=1,
+                    data_hora=datetime.utcnow() + timedelta(days=1, hours=6),
+                    duracao_minutos=45,
+                    limite_inscricoes=20,
+                    unidade_id=1),
+                EventoAula(nome_aula="Yoga Relaxante",
+                           descricao="Sessão de yoga para relaxamento",
+                           instrutor_id=2,
+                           sala_id=2,
+                           data_hora=datetime.utcnow() +
+                           timedelta(days=1, hours=18),
+                           duracao_minutos=60,
+                           limite_inscricoes=15,
+                           unidade_id=1),
+                EventoAula(nome_aula="Treino Funcional",
+                           descricao="Treino funcional de alta intensidade",
+                           instrutor_id=3,
+                           sala_id=3,
+                           data_hora=datetime.utcnow() +
+                           timedelta(days=2, hours=7),
+                           duracao_minutos=50,
+                           limite_inscricoes=25,
+                           unidade_id=1)
+            ]
+            for aula in aulas:
+                db.add(aula)
+            db.commit()
+
+
+def reconstruir_fatos_iniciais(conn):
+    """Preenche fatos_diarios_unidade a partir das tabelas de origem"""
+    with Session(bind=conn) as db:
+        if db.query(FatoDiarioUnidade.id).first() is None:
+            resultado = reconstruir_fatos_diarios(db)
+            print(f"✅ Fatos diários reconstruídos: {resultado['linhas']} linha(s)")
+
+
+def criar_triggers_fts(conn, fts: str, tabela: str, colunas: list):
+    """Triggers que mantêm uma tabela FTS5 de conteúdo externo em dia com a origem"""
+    lista = ", ".join(colunas)
+    novos = ", ".join(f"new.{c}" for c in colunas)
+    antigos = ", ".join(f"old.{c}" for c in colunas)
+    inserir = f"INSERT INTO {fts}(rowid, {lista}) VALUES (new.id, {novos});"
+    remover = f"INSERT INTO {fts}({fts}, rowid, {lista}) VALUES ('delete', old.id, {antigos});"
+
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {tabela} BEGIN {inserir} END"))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {tabela} BEGIN {remover} END"))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {lista} ON {tabela} "
+        f"BEGIN {remover} {inserir} END"))
+
+
+def criar_busca_exercicios(conn):
+    """
+    Índice de texto de nome, tipo e descrição dos exercícios, sem acentos:
+    tabela FTS5 de conteúdo externo mantida por triggers no SQLite, coluna
+    tsvector gerada com índice GIN no Postgres. Sem suporte, a busca
+    continua com ilike (vivio/busca.py)
+    """
+    if conn.dialect.name == "sqlite":
+        try:
+            conn.execute(text(
+                f"""CREATE VIRTUAL TABLE IF NOT EXISTS {EXERCICIOS_FTS} USING fts5(
+                       nome, tipo, descricao,
+                       content='exercicios', content_rowid='id',
+                       tokenize='unicode61 remove_diacritics 2', prefix='2 3 4')"""
+            ))
+        except DBAPIError as e:
+            print(f"⚠️ FTS5 indisponível, busca de exercícios seguirá com ilike: {e}")
+            return
+
+        criar_triggers_fts(conn, EXERCICIOS_FTS, "exercicios", ["nome", "tipo", "descricao"])
+        conn.execute(text(f"INSERT INTO {EXERCICIOS_FTS}({EXERCICIOS_FTS}) VALUES ('rebuild')"))
+        print(f"✅ Índice FTS5 '{EXERCICIOS_FTS}' criado")
+
+    elif conn.dialect.name == "postgresql":
+        # unaccent não é IMMUTABLE; o wrapper com dicionário explícito pode
+        # ser usado na coluna gerada
+        try:
+            with conn.begin_nested():
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS unaccent"))
+                conn.execute(text(
+                    """CREATE OR REPLACE FUNCTION vivio_unaccent(text) RETURNS text
+                       LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+                       AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$"""
+                ))
+        except DBAPIError as e:
+            print(f"⚠️ Extensão unaccent indisponível, busca de exercícios seguirá com ilike: {e}")
+            return
+
+        conn.execute(text(
+            f"""ALTER TABLE exercicios ADD COLUMN IF NOT EXISTS {EXERCICIOS_TSV} tsvector
+                GENERATED ALWAYS AS (
+                    setweight(to_tsvector('portuguese', vivio_unaccent(coalesce(nome, ''))), 'A') ||
+                    setweight(to_tsvector('portuguese', vivio_unaccent(coalesce(tipo, ''))), 'B') ||
+                    setweight(to_tsvector('portuguese', vivio_unaccent(coalesce(descricao, ''))), 'C')
+                ) STORED"""
+        ))
+        conn.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_exercicios_{EXERCICIOS_TSV} "
+            f"ON exercicios USING gin ({EXERCICIOS_TSV})"
+        ))
+        print(f"✅ Coluna '{EXERCICIOS_TSV}' e índice GIN criados em exercicios")
+
+
+def criar_indice_busca(conn):
+    """
+    Índice da busca global (/busca): tabela indice_busca com FTS5 de
+    trigramas no SQLite ou índice GIN pg_trgm no Postgres, populada a partir
+    das tabelas de origem. Sem suporte, a busca usa LIKE (vivio/busca.py)
+    """
+    IndiceBusca.__table__.create(bind=conn, checkfirst=True)
+
+    if conn.dialect.name == "sqlite":
+        try:
+            conn.execute(text(
+                f"""CREATE VIRTUAL TABLE IF NOT EXISTS {INDICE_BUSCA_FTS} USING fts5(
+                       texto, content='indice_busca', content_rowid='id', tokenize='trigram')"""
+            ))
+        except DBAPIError as e:
+            print(f"⚠️ FTS5 com trigramas indisponível, busca global seguirá com LIKE: {e}")
+        else:
+            criar_triggers_fts(conn, INDICE_BUSCA_FTS, "indice_busca", ["texto"])
+            print(f"✅ Índice FTS5 '{INDICE_BUSCA_FTS}' criado")
+
+    elif conn.dialect.name == "postgresql":
+        try:
+            with conn.begin_nested():
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        except DBAPIError as e:
+            print(f"⚠️ Extensão pg_trgm indisponível, busca global seguirá com LIKE: {e}")
+        else:
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS {INDICE_BUSCA_TRGM} "
+                f"ON indice_busca USING gin (texto gin_trgm_ops)"
+            ))
+            print(f"✅ Índice GIN '{INDICE_BUSCA_TRGM}' criado em indice_busca")
+
+    with Session(bind=conn) as db:
+        totais = reconstruir_indice_busca(db)
+    print(f"✅ Índice de busca populado: {totais}")
+
+
+def migrar_retentativas_eventos(conn):
+    """Status, contador de tentativas e espera exponencial dos eventos com falha"""
+    adicionadas = adicionar_colunas_faltantes(conn, 'eventos_sistema', [
+        ('status', "DEFAULT 'PENDENTE'"),
+        ('tentativas', "DEFAULT 0"),
+        ('ultimo_erro', ""),
+        ('proxima_tentativa', ""),
+    ], "EventoSistema")
+
+    if 'status' in adicionadas:
+        conn.execute(text(
+            "UPDATE eventos_sistema SET status = 'PROCESSADO' WHERE processado = :verdadeiro"
+        ), {"verdadeiro": True})
+        print("✅ Migração EventoSistema: Status preenchido nos eventos já processados")
+
+
+def criar_indice_job_ativo_unico(conn):
+    """
+    Heartbeat dos jobs de treinamento e índice único parcial de um job ativo
+    por unidade. Duplicatas ativas já existentes ficam só com a mais recente
+    """
+    adicionar_colunas_faltantes(conn, 'jobs_treinamento', [
+        ('heartbeat_em', ""),
+    ], "JobTreinamento")
+
+    with Session(bind=conn) as db:
+        ativos = db.query(JobTreinamento).filter(
+            JobTreinamento.status.in_(["PENDENTE", "EXECUTANDO"])
+        ).order_by(JobTreinamento.unidade_id, JobTreinamento.id.desc()).all()
+        vistos = set()
+        for job in ativos:
+            if job.unidade_id in vistos:
+                job.status = "ERRO"
+                job.mensagem = "Job duplicado descartado"
+                job.data_fim = datetime.utcnow()
+            vistos.add(job.unidade_id)
+        db.commit()
+
+    for indice in JobTreinamento.__table__.indexes:
+        if indice.name == "ux_jobs_treinamento_unidade_ativo":
+            indice.create(bind=conn, checkfirst=True)
+            print(f"✅ Índice único '{indice.name}' criado em jobs_treinamento")
+
+
+def criar_indice_grupo_dinamico_unico(conn):
+    """
+    Índice único dos grupos dinâmicos por nome e unidade. Duplicatas já
+    criadas pelos alertas em paralelo ficam só com o grupo mais antigo
+    """
+    with Session(bind=conn) as db:
+        vistos = set()
+        for grupo in db.query(Grupo).filter(Grupo.tipo_grupo == "dinamico").order_by(Grupo.id):
+            chave = (grupo.nome, grupo.unidade_id or 0)
+            if chave in vistos:
+                db.delete(grupo)
+            vistos.add(chave)
+        db.commit()
+
+    # Índice de expressão: a reflexão não o enxerga, então checkfirst não
+    # serve e a checagem fica com o próprio banco (IF NOT EXISTS)
+    for indice in Grupo.__table__.indexes:
+        if indice.name == "ux_grupos_dinamicos_nome_unidade":
+            conn.execute(CreateIndex(indice, if_not_exists=True))
+            print(f"✅ Índice único '{indice.name}' criado em grupos")
+
+
+MIGRACOES = [
+    (1, "criar_tabelas", criar_tabelas),
+    (2, "schema_b2b", migrar_schema_b2b),
+    (3, "schema_eventos_aulas", migrar_schema_eventos_aulas),
+    (4, "schema_eventos_sistema", migrar_schema_eventos_sistema),
+    (5, "modelos_churn", migrar_modelos_churn),
+    (6, "indices_desempenho", criar_indices_desempenho),
+    (7, "attendance_reserva_unica", criar_constraint_unico_attendance),
+    (8, "dados_exemplo", popular_dados_exemplo),
+    (9, "fatos_diarios_iniciais", reconstruir_fatos_iniciais),
+    (10, "indices_paginacao", criar_indices_desempenho),
+    (11, "busca_exercicios", criar_busca_exercicios),
+    (12, "indice_busca", criar_indice_busca),
+    (13, "retentativas_eventos", migrar_retentativas_eventos),
+    (14, "job_treinamento_ativo_unico", criar_indice_job_ativo_unico),
+    (15, "grupo_dinamico_unico", criar_indice_grupo_dinamico_unico),
+    (16, "indices_lote_etapas", criar_indices_desempenho),
+]
+
+# Chave do pg_advisory_lock que serializa os processos migrando o mesmo banco
+MIGRACOES_CHAVE_BLOQUEIO = 72_100_020
+
+
+def versao_schema(conn) -> int:
+    """Última revisão aplicada (0 se schema_migracoes ainda não existe)"""
+    try:
+        return conn.execute(select(func.max(SchemaMigracao.revisao))).scalar() or 0
+    except DBAPIError:
+        conn.rollback()
+        return 0
+
+
+@contextmanager
+def transacao_migracao(conn):
+    """
+    Transação de uma revisão. No SQLite usa BEGIN IMMEDIATE, que já pega o
+    lock de escrita e faz os demais processos esperarem (busy_timeout)
+    """
+    sqlite = conn.dialect.name == "sqlite"
+    if sqlite:
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+    try:
+        yield
+    except Exception:
+        if sqlite:
+            conn.exec_driver_sql("ROLLBACK")
+        else:
+            conn.rollback()
+        raise
+    if sqlite:
+        conn.exec_driver_sql("COMMIT")
+    else:
+        conn.commit()
+
+
+def aplicar_migracoes() -> int:
+    """
+    Aplica as revisões pendentes de MIGRACOES e retorna a versão final.
+    Caminho rápido: uma consulta MAX quando o schema já está em dia
+    """
+    ultima = MIGRACOES[-1][0]
+    with engine.connect() as conn:
+        atual = versao_schema(conn)
+    if atual >= ultima:
+        return atual
+
+    with engine.connect() as conn:
+        postgres = conn.dialect.name == "postgresql"
+        if conn.dialect.name == "sqlite":
+            # Transações controladas à mão (BEGIN IMMEDIATE/COMMIT)
+            conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        elif postgres:
+            conn.execute(text("SELECT pg_advisory_lock(:chave)"), {"chave": MIGRACOES_CHAVE_BLOQUEIO})
+            conn.commit()
+
+        try:
+            for revisao, nome, migracao in MIGRACOES:
+                with transacao_migracao(conn):
+                    SchemaMigracao.__table__.create(bind=conn, checkfirst=True)
+                    # Relê sob o lock: outro processo pode ter aplicado antes
+                    if versao_schema(conn) >= revisao:
+                        continue
+                    migracao(conn)
+                    conn.execute(SchemaMigracao.__table__.insert().values(
+                        revisao=revisao, nome=nome, data_aplicacao=datetime.utcnow()
+                    ))
+                print(f"✅ Migração {revisao:03d} '{nome}' aplicada")
+        except Exception as e:
+            print(f"❌ Migração {revisao:03d} '{nome}' falhou: {e}")
+            raise
+        finally:
+            if postgres:
+                conn.execute(text("SELECT pg_advisory_unlock(:chave)"), {"chave": MIGRACOES_CHAVE_BLOQUEIO})
+                conn.commit()
+
+    return ultima
@@ -0,0 +1,610 @@
+"""
+Modelos ORM (tabelas do banco)
+"""
+from sqlalchemy import (
+    Boolean, Column, Date, DateTime, Float, ForeignKey, Index, Integer, LargeBinary, String,
+    Text, text)
+from sqlalchemy.orm import relationship
+from datetime import datetime
+
+from vivio.database import Base
+
+
+# ============================================================
+# Modelos de Banco de Dados
+# ============================================================
+
+
+class Unidade(Base):
+    __tablename__ = "unidades"
+    id = Column(Integer, primary_key=True, index=True)
+    nome = Column(String, unique=True)
+    endereco = Column(String)
+    telefone = Column(String, nullable=True)
+    tipo_unidade = Column(String, default="B2C")
+    risco_desistencia = Column(Float, default=0.0)
+    usuarios = relationship("Usuario", back_populates="unidade")
+    programas = relationship("Programa", back_populates="unidade")
+    contratos = relationship("Contrato", back_populates="unidade")
+
+
+class Usuario(Base):
+    __tablename__ = "usuarios"
+    __table_args__ = (
+        # Listagens e contagens por unidade (painel, grupos, stats)
+        Index("ix_usuarios_unidade_ativo", "unidade_id", "ativo"),
+        # Paginação por cursor da listagem da unidade
+        Index("ix_usuarios_unidade_id", "unidade_id", "id"),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    email = Column(String, unique=True)
+    senha = Column(String)
+    nome = Column(String)
+    tipo = Column(String)
+    unidade_id = Column(Integer, ForeignKey("unidades.id"))
+    ativo = Column(Boolean, default=True)
+    data_cadastro = Column(DateTime, default=datetime.utcnow)
+    ultima_atividade = Column(DateTime, default=datetime.utcnow)
+    risco_churn = Column(Float, default=0.0)
+    unidade = relationship("Unidade", back_populates="usuarios")
+    agendas = relationship("Agenda", back_populates="usuario")
+    jornadas = relationship("UsuarioJornada", back_populates="usuario")
+
+
+class Visitante(Base):
+    __tablename__ = "visitantes"
+    __table_args__ = (
+        # Paginação por cursor da listagem da unidade
+        Index("ix_visitantes_unidade_id", "unidade_id", "id"),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    nome = Column(String)
+    email = Column(String)
+    telefone = Column(String)
+    unidade_id = Column(Integer, ForeignKey("unidades.id"))
+    data_visita = Column(DateTime, default=datetime.utcnow)
+    convertido = Column(Boolean, default=False)
+    lead_score = Column(Integer, default=0)
+    tipo_lead = Column(String, default="Individual")
+    empresa = Column(String, nullable=True)
+    unidade = relationship("Unidade")
+
+
+class Programa(Base):
+    __tablename__ = "programas"
+    __table_args__ = (
+        # Paginação por cursor da listagem da unidade
+        Index("ix_programas_unidade_id", "unidade_id", "id"),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    nome = Column(String)
+    descricao = Column(Text)
+    status = Column(String)
+    unidade_id = Column(Integer, ForeignKey("unidades.id"))
+    data_inicio = Column(DateTime)
+    data_fim = Column(DateTime)
+    usuarios_matriculados = Column(Integer, default=0)
+    unidade = relationship("Unidade", back_populates="programas")
+
+
+class Agenda(Base):
+    __tablename__ = "agendas"
+    id = Column(Integer, primary_key=True, index=True)
+    usuario_id = Column(Integer, ForeignKey("usuarios.id"))
+    titulo = Column(String)
+    descricao = Column(Text)
+    data = Column(DateTime, default=datetime.utcnow)
+    concluida = Column(Boolean, default=False)
+    tipo_atividade = Column(String)
+    duracao_minutos = Column(Integer)
+    usuario = relationship("Usuario", back_populates="agendas")
+
+
+class MetricaEngajamento(Base):
+    __tablename__ = "metricas_engajamento"
+    id = Column(Integer, primary_key=True, index=True)
+    unidade_id = Column(Integer, ForeignKey("unidades.id"))
+    data = Column(DateTime, default=datetime.utcnow)
+    taxa_engajamento = Column(Float)
+    roi = Column(Float)
+    produtividade = Column(Float)
+    usuarios_ativos = Column(Integer)
+    unidade = relationship("Unidade")
+
+
+# ============================================================
+# Novos Modelos - Sistema de Calendário e Aulas
+# ============================================================
+
+
+class Sala(Base):
+    __tablename__ = "salas"
+    id = Column(Integer, primary_key=True, index=True)
+    nome = Column(String)
+    capacidade = Column(Integer)
+    unidade_id = Column(Integer, ForeignKey("unidades.id"))
+    ativa = Column(Boolean, default=True)
+    unidade = relationship("Unidade")
+    eventos_aulas = relationship("EventoAula", back_populates="sala")
+
+
+class Instrutor(Base):
+    __tablename__ = "instrutores"
+    id = Column(Integer, primary_key=True, index=True)
+    nome = Column(String)
+    email = Column(String)
+    especialidades = Column(Text)  # JSON string com lista de especialidades
+    foto_url = Column(String, nullable=True)
+    unidade_id = Column(Integer, ForeignKey("unidades.id"))
+    ativo = Column(Boolean, default=True)
+    unidade = relationship("Unidade")
+    eventos_aulas = relationship("EventoAula", back_populates="instrutor")
+
+
+class MembroEquipe(Base):
+    __tablename__ = "membros_equipe"
+    id = Column(Integer, primary_key=True, index=True)
+    nome = Column(String, nullable=False)
+    email = Column(String, nullable=False)
+    telefone = Column(String, nullable=True)
+    cargo = Column(String, nullable=False)  # Instrutor, Personal Trainer, Recepcionista, Gerente, etc
+    especialidades = Column(Text, nullable=True)  # JSON string com lista de especialidades
+    foto_url = Column(String, nullable=True)
+    data_admissao = Column(DateTime, default=datetime.utcnow)
+    horario_trabalho = Column(Text, nullable=True)  # JSON com horários de trabalho
+    cor_agenda = Column(String, default="#123058")  # Cor para exibição no calendário
+    observacoes = Column(Text, nullable=True)
+    unidade_id = Column(Integer, ForeignKey("unidades.id"))
+    ativo = Column(Boolean, default=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    unidade = relationship("Unidade")
+
+
+class EventoCalendario(Base):
+    __tablename__ = "eventos_calendario"
+    id = Column(Integer, primary_key=True, index=True)
+    usuario_id = Column(Integer, ForeignKey("usuarios.id"))
+    titulo = Column(String)
+    descricao = Column(Text)
+    data_inicio = Column(DateTime)
+    data_fim = Column(DateTime)
+    tipo_evento = Column(String)  # treino, reuniao, avaliacao, etc
+    status = Column(String,
+                    default="pendente")  # pendente, cumprida, cancelada
+    lembrete = Column(Boolean, default=False)
+    tarefas_vinculadas = Column(Text)  # JSON string com lista de tarefas
+    cor = Column(String, default="#62b1ca")
+    usuario = relationship("Usuario")
+
+
+class EventoAula(Base):
+    __tablename__ = "eventos_aulas"
+    __table_args__ = (
+        # Calendário e relatórios da unidade por período
+        Index("ix_eventos_aulas_unidade_data", "unidade_id", "data_hora"),
+        # Listagens de aulas ativas ordenadas por horário
+        Index("ix_eventos_aulas_ativa_data", "ativa", "data_hora"),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    nome_aula = Column(String)
+    descricao = Column(Text)
+    instrutor_id = Column(Integer, ForeignKey("instrutores.id"), nullable=True)
+    membro_equipe_id = Column(Integer, ForeignKey("membros_equipe.id"), nullable=True)
+    sala_id = Column(Integer, ForeignKey("salas.id"), nullable=True)
+    sala_nome = Column(String, nullable=True)
+    modo = Column(String, nullable=True)
+    data_hora = Column(DateTime)
+    data_fim = Column(DateTime, nullable=True)
+    dia_semana = Column(String)
+    dias_semana_recorrencia = Column(Text, nullable=True)
+    semanas_recorrencia = Column(Integer, default=1)
+    duracao_minutos = Column(Integer, default=60)
+    limite_inscricoes = Column(Integer)
+    reservas_ativas = Column(Integer, default=0, nullable=False)  # Contador mantido por reservar/cancelar
+    participantes_alvo = Column(Integer, nullable=True)
+    foto_url = Column(String, nullable=True)
+    grupos_permitidos = Column(Text)
+    requer_reserva = Column(Boolean, default=True)
+    config_padrao_15dias = Column(Boolean, default=True)
+    unidade_id = Column(Integer, ForeignKey("unidades.id"))
+    recorrente = Column(Boolean, default=False)
+    ativa = Column(Boolean, default=True)
+    instrucoes = Column(Text, nullable=True)
+    observacoes = Column(Text, nullable=True)
+    cor = Column(String, default="#123058")
+    instrutor = relationship("Instrutor", back_populates="eventos_aulas")
+    membro_equipe = relationship("MembroEquipe")
+    sala = relationship("Sala", back_populates="eventos_aulas")
+    unidade = relationship("Unidade")
+    reservas = relationship("ReservaAula", back_populates="evento_aula")
+
+
+class ReservaAula(Base):
+    __tablename__ = "reservas_aulas"
+    __table_args__ = (
+        # Inscritos de uma aula / reserva do usuário na aula
+        Index("ix_reservas_aulas_evento_cancelada", "evento_aula_id", "cancelada", "usuario_id"),
+        # Reservas do usuário (minhas aulas, cancelamento em lote)
+        Index("ix_reservas_aulas_usuario_cancelada", "usuario_id", "cancelada"),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    evento_aula_id = Column(Integer, ForeignKey("eventos_aulas.id"))
+    usuario_id = Column(Integer, ForeignKey("usuarios.id"))
+    data_reserva = Column(DateTime, default=datetime.utcnow)
+    presente = Column(Boolean, default=False)
+    cancelada = Column(Boolean, default=False)
+    data_cancelamento = Column(DateTime, nullable=True)
+    evento_aula = relationship("EventoAula", back_populates="reservas")
+    usuario = relationship("Usuario")
+    attendance_records = relationship("Attendance", back_populates="reserva")
+
+
+class Attendance(Base):
+    __tablename__ = "attendance"
+    # Constraint único será adicionado APÓS limpeza de duplicatas na inicialização
+    __table_args__ = (
+        Index("ix_attendance_evento_aula", "evento_aula_id"),
+        Index("ix_attendance_usuario", "usuario_id"),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    reserva_aula_id = Column(Integer,
+                             ForeignKey("reservas_aulas.id"),
+                             index=True)
+    evento_aula_id = Column(Integer, ForeignKey("eventos_aulas.id"))
+    usuario_id = Column(Integer, ForeignKey("usuarios.id"))
+    status = Column(String)  # presente, falta, justificada
+    data_marcacao = Column(DateTime, default=datetime.utcnow)
+    observacoes = Column(Text, nullable=True)
+    marcado_por = Column(Integer, ForeignKey("usuarios.id"), nullable=True)
+    reserva = relationship("ReservaAula", back_populates="attendance_records")
+    evento_aula = relationship("EventoAula")
+    usuario = relationship("Usuario", foreign_keys=[usuario_id])
+    marcador = relationship("Usuario", foreign_keys=[marcado_por])
+
+
+class Exercicio(Base):
+    __tablename__ = "exercicios"
+    __table_args__ = (
+        # Paginação por cursor da biblioteca da unidade, ordenada por nome
+        Index("ix_exercicios_unidade_nome", "unidade_id", "nome", "id"),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    nome = Column(String, nullable=False)
+    tipo = Column(String, nullable=True)  # Peso do corpo, Funcional, etc
+    quem_pode_utilizar = Column(
+        String, nullable=True)  # Todos os instrutores, Somente quem elaborou
+    elaborado_por = Column(String, nullable=True)  # Nome do elaborador
+    descricao = Column(Text, nullable=True)
+    foto_url = Column(String, nullable=True)
+    video_url = Column(String, nullable=True)
+    favorito = Column(Boolean, default=False)
+    oculto = Column(Boolean, default=False)
+    data_criacao = Column(DateTime, default=datetime.utcnow)
+    data_atualizacao = Column(DateTime,
+                              default=datetime.utcnow,
+                              onupdate=datetime.utcnow)
+    unidade_id = Column(Integer, ForeignKey("unidades.id"), nullable=True)
+    criado_por_id = Column(Integer, ForeignKey("usuarios.id"), nullable=True)
+    unidade = relationship("Unidade")
+    criado_por = relationship("Usuario")
+
+
+# ============================================================
+# Modelos - Sistema de Questionários
+# ============================================================
+
+
+class Questionario(Base):
+    __tablename__ = "questionarios"
+    id = Column(Integer, primary_key=True, index=True)
+    titulo = Column(String, nullable=False)
+    descricao = Column(Text, nullable=True)
+    status = Column(String,
+                    default="rascunho")  # rascunho, publicado, arquivado
+    categoria = Column(
+        String, nullable=True
+    )  # avaliacao_saude, verificacao_progresso, perfil, anamnese, feedback, generico
+    thumbnail_url = Column(String, nullable=True)  # URL da imagem de thumbnail
+    unidade_id = Column(Integer, ForeignKey("unidades.id"), nullable=True)
+    criado_por_id = Column(Integer, ForeignKey("usuarios.id"), nullable=True)
+    data_criacao = Column(DateTime, default=datetime.utcnow)
+    data_atualizacao = Column(DateTime,
+                              default=datetime.utcnow,
+                              onupdate=datetime.utcnow)
+    data_publicacao = Column(DateTime, nullable=True)
+    configuracoes = Column(
+        Text, nullable=True
+    )  # JSON: {permitir_multiplas_respostas, exibir_progresso, etc}
+    unidade = relationship("Unidade")
+    criado_por = relationship("Usuario")
+    secoes = relationship("Secao",
+                          back_populates="questionario",
+                          cascade="all, delete-orphan",
+                          order_by="Secao.ordem")
+    perguntas = relationship("Pergunta",
+                             back_populates="questionario",
+                             cascade="all, delete-orphan",
+                             order_by="Pergunta.ordem")
+
+
+class Secao(Base):
+    __tablename__ = "secoes"
+    id = Column(Integer, primary_key=True, index=True)
+    questionario_id = Column(Integer,
+                             ForeignKey("questionarios.id"),
+                             nullable=False)
+    titulo = Column(String,
+                    nullable=True)  # Ex: "AVALIAÇÃO INICIAL - BALANCE CENTER"
+    descricao = Column(Text, nullable=True)
+    ordem = Column(Integer, nullable=False)
+    questionario = relationship("Questionario", back_populates="secoes")
+    perguntas = relationship("Pergunta",
+                             back_populates="secao",
+                             cascade="all, delete-orphan",
+                             order_by="Pergunta.ordem")
+
+
+class Pergunta(Base):
+    __tablename__ = "perguntas"
+    id = Column(Integer, primary_key=True, index=True)
+    questionario_id = Column(Integer,
+                             ForeignKey("questionarios.id"),
+                             nullable=False)
+    secao_id = Column(Integer, ForeignKey("secoes.id"), nullable=True)
+    tipo = Column(
+        String, nullable=False
+    )  # texto_curto, texto_longo, multipla_escolha, selecao_multipla, likert, data, numero
+    titulo = Column(String, nullable=False)
+    descricao = Column(Text, nullable=True)
+    obrigatoria = Column(Boolean, default=False)
+    ordem = Column(Integer, nullable=False)
+    configuracoes = Column(
+        Text, nullable=True)  # JSON: validações, placeholder, min/max, etc
+    questionario = relationship("Questionario", back_populates="perguntas")
+    secao = relationship("Secao", back_populates="perguntas")
+    opcoes = relationship("OpcaoPergunta",
+                          back_populates="pergunta",
+                          cascade="all, delete-orphan",
+                          order_by="OpcaoPergunta.ordem")
+
+
+class OpcaoPergunta(Base):
+    __tablename__ = "opcoes_perguntas"
+    id = Column(Integer, primary_key=True, index=True)
+    pergunta_id = Column(Integer, ForeignKey("perguntas.id"), nullable=False)
+    texto = Column(String, nullable=False)
+    ordem = Column(Integer, nullable=False)
+    valor = Column(String, nullable=True)  # Valor da opção para scoring
+    pergunta = relationship("Pergunta", back_populates="opcoes")
+
+
+# ============================================================
+# Modelo de Grupos - Sistema de Segmentação Inteligente
+# ============================================================
+
+
+class Contrato(Base):
+    __tablename__ = "contratos"
+    id = Column(Integer, primary_key=True, index=True)
+    unidade_id = Column(Integer, ForeignKey("unidades.id"))
+    nome = Column(String, nullable=False)
+    data_inicio = Column(DateTime)
+    data_fim = Column(DateTime)
+    valor_mensal = Column(Float)
+    limite_usuarios = Column(Integer, nullable=True)
+    status = Column(String, default="ativo")
+    unidade = relationship("Unidade", back_populates="contratos")
+
+
+class Grupo(Base):
+    __tablename__ = "grupos"
+    __table_args__ = (
+        # Grupos dinâmicos são criados pelos eventos em paralelo: um por nome e unidade
+        Index("ux_grupos_dinamicos_nome_unidade", "nome", text("coalesce(unidade_id, 0)"),
+              unique=True,
+              sqlite_where=text("tipo_grupo = 'dinamico'"),
+              postgresql_where=text("tipo_grupo = 'dinamico'")),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    nome = Column(String, nullable=False)
+    descricao = Column(Text, nullable=True)
+    status = Column(String, default="ativo")  # ativo, inativo
+    criterios = Column(Text, nullable=True)  # JSON: regras de segmentação
+    cor = Column(String, default="#62b1ca")  # Cor do grupo para visualização
+    tamanho_atual = Column(Integer, default=0)  # Cache do número de membros
+    crescimento_semanal = Column(Float, default=0.0)  # Variação percentual
+    jornada_id = Column(Integer,
+                        nullable=True)  # ID da jornada vinculada (se houver)
+    automacao_ativa = Column(Boolean,
+                             default=False)  # Se está conectado a automação
+    tipo_grupo = Column(String,
+                        default="manual")  # manual, ia_sugestao, dinamico
+    unidade_id = Column(Integer, ForeignKey("unidades.id"), nullable=True)
+    criado_por_id = Column(Integer, ForeignKey("usuarios.id"), nullable=True)
+    data_criacao = Column(DateTime, default=datetime.utcnow)
+    data_atualizacao = Column(DateTime,
+                              default=datetime.utcnow,
+                              onupdate=datetime.utcnow)
+
+    unidade = relationship("Unidade")
+    criado_por = relationship("Usuario")
+
+
+# ============================================================
+# Modelo de Eventos - Sistema Event-Driven para Automações
+# ============================================================
+
+
+class EventoSistema(Base):
+    __tablename__ = "eventos_sistema"
+    __table_args__ = (
+        # Fila do worker: pendentes em ordem de id
+        Index("ix_eventos_sistema_processado_id", "processado", "id"),
+        # Eventos reivindicados por um lote (releitura após o UPDATE)
+        Index("ix_eventos_sistema_lote", "lote_processamento"),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    tipo = Column(String, nullable=False)  # RESERVA_CRIADA, CHURN_ALERTA, LEAD_CONVERTIDO, etc
+    payload = Column(Text, nullable=True)  # JSON com dados do evento
+    data_registro = Column(DateTime, default=datetime.utcnow)
+    processado = Column(Boolean, default=False)
+    data_processamento = Column(DateTime, nullable=True)
+    reivindicado_em = Column(DateTime, nullable=True)  # Quando um worker pegou o evento
+    lote_processamento = Column(String, nullable=True)  # Identificador do lote que pegou o evento
+    status = Column(String, default="PENDENTE")  # PENDENTE, PROCESSADO, ERRO (esgotou as tentativas)
+    tentativas = Column(Integer, default=0)
+    ultimo_erro = Column(Text, nullable=True)
+    proxima_tentativa = Column(DateTime, nullable=True)  # Espera exponencial após falha
+
+
+class EmailOutbox(Base):
+    __tablename__ = "emails_outbox"
+    id = Column(Integer, primary_key=True, index=True)
+    destinatario = Column(String, nullable=False)
+    assunto = Column(String, nullable=False)
+    corpo = Column(Text, nullable=False)  # HTML
+    origem = Column(String, nullable=True)  # WORKFLOW, AULA, etc
+    status = Column(String, default="PENDENTE", index=True)  # PENDENTE, EM_ENVIO, ENVIADO, FALHA
+    tentativas = Column(Integer, default=0)
+    ultimo_erro = Column(Text, nullable=True)
+    proxima_tentativa = Column(DateTime, default=datetime.utcnow)
+    data_criacao = Column(DateTime, default=datetime.utcnow)
+    data_envio = Column(DateTime, nullable=True)
+    reivindicado_em = Column(DateTime, nullable=True)
+    lote_processamento = Column(String, nullable=True)
+
+
+class ModeloChurn(Base):
+    __tablename__ = "modelos_churn"
+    id = Column(Integer, primary_key=True, index=True)
+    unidade_id = Column(Integer, ForeignKey("unidades.id"), unique=True, nullable=False)
+    versao = Column(Integer, nullable=False, default=1)  # Incrementada a cada treinamento
+    hash_modelo = Column(String, nullable=False)  # sha256 do modelo serializado
+    modelo = Column(LargeBinary, nullable=False)  # Modelo sklearn serializado (pickle)
+    total_amostras = Column(Integer, default=0)
+    data_treinamento = Column(DateTime, default=datetime.utcnow)
+
+
+class JobTreinamento(Base):
+    __tablename__ = "jobs_treinamento"
+    __table_args__ = (
+        # No máximo um job ativo por unidade, mesmo com vários processos enfileirando
+        Index("ux_jobs_treinamento_unidade_ativo", "unidade_id", unique=True,
+              sqlite_where=text("status IN ('PENDENTE', 'EXECUTANDO')"),
+              postgresql_where=text("status IN ('PENDENTE', 'EXECUTANDO')")),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    unidade_id = Column(Integer, ForeignKey("unidades.id"), nullable=False, index=True)
+    status = Column(String, default="PENDENTE")  # PENDENTE, EXECUTANDO, CONCLUIDO, ERRO
+    progresso = Column(Integer, default=0)  # 0 a 100
+    etapa = Column(String, nullable=True)  # Descrição da etapa atual
+    origem = Column(String, default="MANUAL")  # MANUAL, AGENDADO
+    mensagem = Column(Text, nullable=True)  # Resultado ou erro
+    data_criacao = Column(DateTime, default=datetime.utcnow)
+    data_inicio = Column(DateTime, nullable=True)
+    data_fim = Column(DateTime, nullable=True)
+    heartbeat_em = Column(DateTime, nullable=True)  # Atualizado pelo processo dono enquanto o job está ativo
+
+
+# ============================================================
+# Modelos de Automação - Sistema de Jornadas e Workflows
+# ============================================================
+
+
+class Jornada(Base):
+    __tablename__ = "jornadas"
+    id = Column(Integer, primary_key=True, index=True)
+    nome = Column(String, nullable=False)
+    descricao = Column(Text, nullable=True)
+    gatilho_evento = Column(String, nullable=False)  # Ex: USUARIO_CRIADO, RESERVA_CRIADA, CHURN_ALERTA
+    ativa = Column(Boolean, default=True)
+    unidade_id = Column(Integer, ForeignKey("unidades.id"), nullable=True)
+    criado_por_id = Column(Integer, ForeignKey("usuarios.id"), nullable=True)
+    data_criacao = Column(DateTime, default=datetime.utcnow)
+    data_atualizacao = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    etapas = relationship("EtapaJornada", back_populates="jornada", order_by="EtapaJornada.ordem", cascade="all, delete-orphan")
+    unidade = relationship("Unidade")
+    criado_por = relationship("Usuario")
+
+
+class EtapaJornada(Base):
+    __tablename__ = "etapas_jornada"
+    __table_args__ = (
+        # Etapas da jornada em ordem (avancar_jornada)
+        Index("ix_etapas_jornada_jornada_ordem", "jornada_id", "ordem"),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    jornada_id = Column(Integer, ForeignKey("jornadas.id", ondelete="CASCADE"), nullable=False)
+    nome = Column(String, nullable=False)
+    ordem = Column(Integer, nullable=False)
+    acao_tipo = Column(String, nullable=False)  # ENVIAR_EMAIL, CRIAR_TAREFA, MUDAR_STATUS, CRIAR_GRUPO, etc
+    acao_config = Column(Text, nullable=False)  # JSON com detalhes da ação
+    
+    jornada = relationship("Jornada", back_populates="etapas")
+
+
+class UsuarioJornada(Base):
+    __tablename__ = "usuarios_jornadas"
+    __table_args__ = (
+        Index("ix_usuarios_jornadas_usuario_jornada", "usuario_id", "jornada_id", "concluida"),
+        Index("ix_usuarios_jornadas_jornada", "jornada_id"),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    usuario_id = Column(Integer, ForeignKey("usuarios.id"), nullable=False)
+    jornada_id = Column(Integer, ForeignKey("jornadas.id"), nullable=False)
+    etapa_atual_id = Column(Integer, ForeignKey("etapas_jornada.id"), nullable=True)
+    data_inicio = Column(DateTime, default=datetime.utcnow)
+    data_conclusao = Column(DateTime, nullable=True)
+    concluida = Column(Boolean, default=False)
+    
+    usuario = relationship("Usuario", back_populates="jornadas")
+    jornada = relationship("Jornada")
+    etapa_atual = relationship("EtapaJornada")
+
+
+class SchemaMigracao(Base):
+    """Revisões de schema aplicadas ao banco (ver aplicar_migracoes)"""
+    __tablename__ = "schema_migracoes"
+    revisao = Column(Integer, primary_key=True)
+    nome = Column(String, nullable=False)
+    data_aplicacao = Column(DateTime, default=datetime.utcnow)
+
+
+class FatoDiarioUnidade(Base):
+    """Rollup por unidade e dia usado pelos relatórios (ver recalcular_fatos_diarios)"""
+    __tablename__ = "fatos_diarios_unidade"
+    __table_args__ = (
+        Index("ix_fatos_diarios_unidade_dia", "unidade_id", "data", unique=True),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    unidade_id = Column(Integer, ForeignKey("unidades.id"), nullable=False)
+    data = Column(Date, nullable=False)
+    aulas = Column(Integer, default=0)  # Aulas agendadas no dia
+    capacidade = Column(Integer, default=0)  # Soma dos limites de inscrição dessas aulas
+    reservas = Column(Integer, default=0)  # Reservas das aulas do dia (inclui canceladas)
+    cancelamentos = Column(Integer, default=0)
+    presencas = Column(Integer, default=0)
+    faltas = Column(Integer, default=0)
+    leads = Column(Integer, default=0)  # Visitantes pela data da visita
+    conversoes = Column(Integer, default=0)
+    receita_contratos = Column(Float, default=0.0)  # Soma mensal dos contratos ativos no dia
+    data_atualizacao = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class IndiceBusca(Base):
+    """Entrada da busca global (/busca), mantida pelos listeners de vivio/busca.py"""
+    __tablename__ = "indice_busca"
+    __table_args__ = (
+        Index("ix_indice_busca_tipo_referencia", "tipo", "referencia_id", unique=True),
+        Index("ix_indice_busca_unidade_tipo", "unidade_id", "tipo"),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    tipo = Column(String, nullable=False)  # usuario, visitante, aula, membro_equipe, exercicio
+    referencia_id = Column(Integer, nullable=False)  # id na tabela de origem
+    unidade_id = Column(Integer, nullable=True)  # None = visível em todas as unidades
+    titulo = Column(String, nullable=False)
+    subtitulo = Column(String, nullable=True)
+    texto = Column(Text, nullable=False)  # Termos normalizados (minúsculas, sem acentos)
+    data_atualizacao = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
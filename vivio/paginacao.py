@@ -0,0 +1,205 @@
+"""
+Paginação por cursor (keyset), projeção de campos e totais em cache das listagens
+"""
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, event, func, or_
+from datetime import date, datetime
+from typing import Callable, Optional
+from collections import OrderedDict
+import base64
+import json
+import threading
+import time
+
+from vivio.config import PAGINACAO_LIMITE_MAX, TOTAIS_CACHE_MAX, TOTAIS_CACHE_TTL
+from vivio.database import SessionLocal, valores_atributo
+
+
+# ============================================================
+# Cursor
+# ============================================================
+
+
+def codificar_cursor(valores: list) -> str:
+    """Valores das colunas de ordenação da última linha, em base64 (url-safe)"""
+    dados = json.dumps([v.isoformat() if isinstance(v, (datetime, date)) else v for v in valores],
+                       separators=(",", ":"))
+    return base64.urlsafe_b64encode(dados.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str, ordem: list) -> list:
+    """Inverso de codificar_cursor, convertendo cada valor para o tipo da coluna"""
+    try:
+        valores = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(valores, list) or len(valores) != len(ordem):
+            raise ValueError
+        convertidos = []
+        for valor, (coluna, _) in zip(valores, ordem):
+            tipo = coluna.type.python_type
+            if valor is None:
+                raise ValueError
+            if tipo is datetime:
+                valor = datetime.fromisoformat(valor)
+            elif not isinstance(valor, tipo):
+                raise ValueError
+            convertidos.append(valor)
+        return convertidos
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+
+def condicao_keyset(ordem: list, valores: list):
+    """
+    Linhas depois do cursor: (a > x) OR (a = x AND b > y) ..., com < nas
+    colunas decrescentes. Escrito por extenso (sem row values) para usar o
+    índice das colunas de ordenação em SQLite e Postgres
+    """
+    condicoes = []
+    for i, ((coluna, decrescente), valor) in enumerate(zip(ordem, valores)):
+        iguais = [c == v for (c, _), v in zip(ordem[:i], valores[:i])]
+        depois = coluna < valor if decrescente else coluna > valor
+        condicoes.append(and_(*iguais, depois))
+    return or_(*condicoes)
+
+
+# ============================================================
+# Projeção de campos
+# ============================================================
+
+
+def resolver_campos(campos: dict, fields: Optional[str]) -> list:
+    """Campos pedidos em fields= (separados por vírgula); todos quando vazio"""
+    if not fields:
+        return list(campos)
+    pedidos = [f.strip() for f in fields.split(",") if f.strip()]
+    invalidos = [f for f in pedidos if f not in campos]
+    if invalidos:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Campos inválidos: {', '.join(invalidos)}. Disponíveis: {', '.join(campos)}")
+    return list(dict.fromkeys(pedidos))
+
+
+def _serializar(valor):
+    return valor.isoformat() if isinstance(valor, (datetime, date)) else valor
+
+
+# ============================================================
+# Totais em cache
+# ============================================================
+
+
+# Tabelas com listagem paginada (os totais são invalidados quando mudam)
+TABELAS_PAGINADAS = {"usuarios", "visitantes", "programas", "exercicios"}
+
+# Totais das listagens: (tabela, unidade_id, *filtros) -> (expira_em, total).
+# unidade_id None indica listagem sem escopo de unidade. LRU limitado a
+# TOTAIS_CACHE_MAX entradas; as expiradas saem a cada gravação
+_cache_totais = OrderedDict()
+_cache_totais_lock = threading.Lock()
+
+
+def obter_total_cache(chave: tuple, calcular):
+    agora = time.monotonic()
+    with _cache_totais_lock:
+        em_cache = _cache_totais.get(chave)
+        if em_cache and em_cache[0] > agora:
+            _cache_totais.move_to_end(chave)
+            return em_cache[1]
+
+    total = calcular()
+    with _cache_totais_lock:
+        for expirada in [c for c, (expira_em, _) in _cache_totais.items() if expira_em <= agora]:
+            del _cache_totais[expirada]
+        _cache_totais[chave] = (agora + TOTAIS_CACHE_TTL, total)
+        _cache_totais.move_to_end(chave)
+        while len(_cache_totais) > TOTAIS_CACHE_MAX:
+            _cache_totais.popitem(last=False)
+    return total
+
+
+def invalidar_totais_cache(alteracoes: dict):
+    """
+    Remove os totais das tabelas alteradas. alteracoes: tabela -> unidades
+    alteradas (None na lista = registro sem unidade, invalida a tabela toda)
+    """
+    with _cache_totais_lock:
+        for chave in list(_cache_totais):
+            unidades = alteracoes.get(chave[0])
+            if unidades is None:
+                continue
+            if chave[1] is None or None in unidades or chave[1] in unidades:
+                del _cache_totais[chave]
+
+
+def _coletar_invalidacao_totais(session, flush_context):
+    alteracoes = session.info.setdefault("totais_alteracoes", {})
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        tabela = getattr(obj, "__tablename__", None)
+        if tabela not in TABELAS_PAGINADAS:
+            continue
+        unidades = alteracoes.setdefault(tabela, set())
+        valores = valores_atributo(obj, "unidade_id")
+        unidades.update(valores or [None])
+
+
+def _aplicar_invalidacao_totais(session):
+    alteracoes = session.info.pop("totais_alteracoes", None)
+    if alteracoes:
+        invalidar_totais_cache(alteracoes)
+
+
+def _descartar_invalidacao_totais(session):
+    session.info.pop("totais_alteracoes", None)
+
+
+event.listen(SessionLocal, "after_flush", _coletar_invalidacao_totais)
+event.listen(SessionLocal, "after_commit", _aplicar_invalidacao_totais)
+event.listen(SessionLocal, "after_rollback", _descartar_invalidacao_totais)
+
+
+# ============================================================
+# Listagem paginada
+# ============================================================
+
+
+def listar_paginado(db, response: Response, campos: dict, fields: Optional[str],
+                    filtros: list, ordem: list, cursor: Optional[str], limite: int,
+                    chave_total: tuple, formatar: Optional[Callable] = None) -> list:
+    """
+    Uma página da listagem, selecionando só as colunas dos campos pedidos.
+
+    campos: nome do campo na resposta -> coluna. ordem: [(coluna, decrescente)],
+    terminando em uma coluna única (id). A próxima página vem no cabeçalho
+    X-Proximo-Cursor (ausente na última) e o total, sem o cursor, em
+    X-Total-Count. formatar recebe o dict de cada linha (campos derivados)
+    """
+    limite = max(1, min(limite, PAGINACAO_LIMITE_MAX))
+    selecionados = resolver_campos(campos, fields)
+
+    colunas = [campos[nome].label(nome) for nome in selecionados]
+    colunas += [coluna.label(f"_ordem_{i}") for i, (coluna, _) in enumerate(ordem)]
+    query = db.query(*colunas).filter(*filtros)
+    if cursor:
+        query = query.filter(condicao_keyset(ordem, decodificar_cursor(cursor, ordem)))
+    query = query.order_by(*[coluna.desc() if decrescente else coluna.asc()
+                             for coluna, decrescente in ordem])
+
+    linhas = query.limit(limite + 1).all()
+    if len(linhas) > limite:
+        linhas = linhas[:limite]
+        ultima = linhas[-1]._mapping
+        response.headers["X-Proximo-Cursor"] = codificar_cursor(
+            [ultima[f"_ordem_{i}"] for i in range(len(ordem))])
+
+    chave_primaria = ordem[-1][0]
+    total = obter_total_cache(
+        chave_total,
+        lambda: db.query(func.count(chave_primaria)).filter(*filtros).scalar())
+    response.headers["X-Total-Count"] = str(total)
+
+    itens = []
+    for linha in linhas:
+        item = {nome: _serializar(linha._mapping[nome]) for nome in selecionados}
+        itens.append(formatar(item) if formatar else item)
+    return itens
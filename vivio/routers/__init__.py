@@ -0,0 +1,3 @@
+"""
+Routers da API, montados sob demanda por vivio.app.criar_app
+"""
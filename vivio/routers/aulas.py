@@ -0,0 +1,720 @@
+"""
+Endpoints de aulas, reservas e presença
+"""
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session, joinedload
+from datetime import datetime, timedelta
+from typing import Optional
+import hashlib
+import json
+import base64
+
+from vivio.auth import get_current_user
+from vivio.database import get_db
+from vivio.emails import enfileirar_emails
+from vivio.eventos import registrar_evento
+from vivio.exportacao import gerar_csv_streaming
+from vivio.fatos import marcar_fatos_pendentes
+from vivio.graficos import FORMATOS_GRAFICO, obter_grafico_circular
+from vivio.models import Attendance, EventoAula, Instrutor, MembroEquipe, ReservaAula, Sala, Usuario
+
+router = APIRouter()
+
+
+# ============================================================
+# Endpoints de Agendamento de Aulas
+# ============================================================
+
+
+@router.post("/aulas/criar")
+def criar_evento_aula(nome_aula: str,
+                      descricao: str,
+                      instrutor_id: int,
+                      sala_id: int,
+                      data_hora: str,
+                      limite_inscricoes: int,
+                      duracao_minutos: int = 60,
+                      dia_semana: str = None,
+                      grupos_permitidos: str = "[]",
+                      requer_reserva: bool = True,
+                      recorrente: bool = False,
+                      usuario: Usuario = Depends(get_current_user),
+                      db: Session = Depends(get_db)):
+    evento = EventoAula(nome_aula=nome_aula,
+                        descricao=descricao,
+                        instrutor_id=instrutor_id,
+                        sala_id=sala_id,
+                        data_hora=datetime.fromisoformat(data_hora),
+                        duracao_minutos=duracao_minutos,
+                        dia_semana=dia_semana,
+                        limite_inscricoes=limite_inscricoes,
+                        grupos_permitidos=grupos_permitidos,
+                        requer_reserva=requer_reserva,
+                        recorrente=recorrente,
+                        unidade_id=usuario.unidade_id or 1)
+    db.add(evento)
+    db.commit()
+    return {"mensagem": "Aula criada com sucesso!", "id": evento.id}
+
+
+@router.post("/aulas/criar-completa")
+def criar_evento_aula_completa(dados: dict,
+                                usuario: Usuario = Depends(get_current_user),
+                                db: Session = Depends(get_db)):
+    """
+    Cria uma aula com todos os campos do modal avançado
+    """
+    try:
+        data_hora_str = dados.get("data_hora")
+        if not data_hora_str:
+            raise HTTPException(status_code=400, detail="Data/hora obrigatória")
+        
+        data_hora = datetime.fromisoformat(data_hora_str.replace("Z", ""))
+        
+        data_fim = None
+        if dados.get("data_fim"):
+            data_fim = datetime.fromisoformat(dados["data_fim"].replace("Z", ""))
+        
+        grupos_json = "[]"
+        if dados.get("grupos_permitidos"):
+            grupos = dados["grupos_permitidos"]
+            grupos_json = json.dumps(grupos) if isinstance(grupos, list) else grupos
+        
+        dias_recorrencia = None
+        if dados.get("dias_semana_recorrencia"):
+            dias = dados["dias_semana_recorrencia"]
+            dias_recorrencia = json.dumps(dias) if isinstance(dias, list) else dias
+        
+        membro_equipe_id = None
+        if dados.get("membro_equipe_id"):
+            try:
+                membro_equipe_id = int(dados["membro_equipe_id"])
+                membro = db.query(MembroEquipe).filter(MembroEquipe.id == membro_equipe_id).first()
+                if membro:
+                    cor = membro.cor_agenda or "#123058"
+                else:
+                    cor = "#123058"
+            except:
+                cor = "#123058"
+        else:
+            cor = dados.get("cor", "#123058")
+        
+        evento = EventoAula(
+            nome_aula=dados.get("nome_aula", "Aula"),
+            descricao=dados.get("descricao", ""),
+            membro_equipe_id=membro_equipe_id,
+            instrutor_id=dados.get("instrutor_id"),
+            sala_id=dados.get("sala_id"),
+            sala_nome=dados.get("sala_nome"),
+            modo=dados.get("modo"),
+            data_hora=data_hora,
+            data_fim=data_fim,
+            dia_semana=dados.get("dia_semana"),
+            dias_semana_recorrencia=dias_recorrencia,
+            semanas_recorrencia=dados.get("semanas_recorrencia", 1),
+            duracao_minutos=dados.get("duracao_minutos", 60),
+            limite_inscricoes=dados.get("limite_inscricoes", 20),
+            participantes_alvo=dados.get("participantes_alvo"),
+            grupos_permitidos=grupos_json,
+            requer_reserva=dados.get("requer_reserva", True),
+            config_padrao_15dias=dados.get("config_padrao_15dias", True),
+            recorrente=dados.get("recorrente", False),
+            instrucoes=dados.get("instrucoes"),
+            observacoes=dados.get("observacoes"),
+            cor=cor,
+            unidade_id=usuario.unidade_id or 1,
+            ativa=True
+        )
+        
+        db.add(evento)
+        db.commit()
+        db.refresh(evento)
+        
+        instrutor_nome = "N/A"
+        if evento.membro_equipe:
+            instrutor_nome = evento.membro_equipe.nome
+        elif evento.instrutor:
+            instrutor_nome = evento.instrutor.nome
+        
+        return {
+            "mensagem": "Aula criada com sucesso!",
+            "id": evento.id,
+            "evento": {
+                "id": evento.id,
+                "title": evento.nome_aula,
+                "start": evento.data_hora.isoformat(),
+                "end": (evento.data_hora + timedelta(minutes=evento.duracao_minutos)).isoformat(),
+                "color": evento.cor,
+                "extendedProps": {
+                    "instrutor": instrutor_nome,
+                    "membro_equipe_id": evento.membro_equipe_id,
+                    "sala": evento.sala_nome or (evento.sala.nome if evento.sala else "N/A"),
+                    "modo": evento.modo,
+                    "reservas": 0,
+                    "limite": evento.limite_inscricoes
+                }
+            }
+        }
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/aulas")
+def listar_aulas(sala_id: Optional[int] = None,
+                 instrutor_id: Optional[int] = None,
+                 data_inicio: Optional[str] = None,
+                 data_fim: Optional[str] = None,
+                 usuario: Usuario = Depends(get_current_user),
+                 db: Session = Depends(get_db)):
+    query = db.query(EventoAula).filter(EventoAula.ativa == True)
+
+    if sala_id:
+        query = query.filter(EventoAula.sala_id == sala_id)
+    if instrutor_id:
+        query = query.filter(EventoAula.instrutor_id == instrutor_id)
+    if data_inicio:
+        query = query.filter(
+            EventoAula.data_hora >= datetime.fromisoformat(data_inicio))
+    if data_fim:
+        query = query.filter(
+            EventoAula.data_hora <= datetime.fromisoformat(data_fim))
+
+    aulas = query.order_by(EventoAula.data_hora).all()
+
+    return [{
+        "id": a.id,
+        "nome_aula": a.nome_aula,
+        "descricao": a.descricao,
+        "instrutor": a.instrutor.nome if a.instrutor else None,
+        "sala": a.sala.nome if a.sala else None,
+        "data_hora": a.data_hora.isoformat() if a.data_hora else None,
+        "duracao_minutos": a.duracao_minutos,
+        "limite_inscricoes": a.limite_inscricoes,
+        "total_reservas": a.reservas_ativas,
+        "foto_url": a.foto_url
+    } for a in aulas]
+
+
+@router.put("/aulas/{aula_id}")
+def atualizar_aula(aula_id: int,
+                   nome_aula: str = None,
+                   descricao: str = None,
+                   instrutor_id: int = None,
+                   sala_id: int = None,
+                   data_hora: str = None,
+                   duracao_minutos: int = None,
+                   limite_inscricoes: int = None,
+                   recorrente: bool = None,
+                   usuario: Usuario = Depends(get_current_user),
+                   db: Session = Depends(get_db)):
+    aula = db.query(EventoAula).filter(EventoAula.id == aula_id).first()
+    if not aula:
+        raise HTTPException(status_code=404, detail="Aula não encontrada")
+
+    if nome_aula is not None:
+        aula.nome_aula = nome_aula
+    if descricao is not None:
+        aula.descricao = descricao
+    if instrutor_id is not None:
+        aula.instrutor_id = instrutor_id
+    if sala_id is not None:
+        aula.sala_id = sala_id
+    if data_hora is not None:
+        aula.data_hora = datetime.fromisoformat(data_hora)
+    if duracao_minutos is not None:
+        aula.duracao_minutos = duracao_minutos
+    if limite_inscricoes is not None:
+        aula.limite_inscricoes = limite_inscricoes
+    if recorrente is not None:
+        aula.recorrente = recorrente
+
+    db.commit()
+    return {
+        "mensagem": "Aula atualizada com sucesso!",
+        "id": aula.id,
+        "nome_aula": aula.nome_aula,
+        "instrutor": aula.instrutor.nome if aula.instrutor else None,
+        "sala": aula.sala.nome if aula.sala else None,
+        "data_hora": aula.data_hora.isoformat() if aula.data_hora else None
+    }
+
+
+@router.delete("/aulas/{aula_id}")
+def deletar_aula(aula_id: int,
+                 usuario: Usuario = Depends(get_current_user),
+                 db: Session = Depends(get_db)):
+    aula = db.query(EventoAula).filter(EventoAula.id == aula_id).first()
+    if not aula:
+        raise HTTPException(status_code=404, detail="Aula não encontrada")
+
+    aula.ativa = False
+    db.commit()
+    return {"mensagem": "Aula removida com sucesso!"}
+
+
+# ============================================================
+# Endpoints de Reservas de Aulas
+# ============================================================
+
+
+@router.post("/aulas/{aula_id}/reservar")
+def reservar_aula(aula_id: int,
+                  usuario: Usuario = Depends(get_current_user),
+                  db: Session = Depends(get_db)):
+    aula = db.query(EventoAula).filter(EventoAula.id == aula_id).first()
+    if not aula:
+        raise HTTPException(status_code=404, detail="Aula não encontrada")
+
+    reserva_existente = db.query(ReservaAula).filter(
+        ReservaAula.evento_aula_id == aula_id,
+        ReservaAula.usuario_id == usuario.id,
+        ReservaAula.cancelada == False).first()
+
+    if reserva_existente:
+        raise HTTPException(status_code=400,
+                            detail="Você já reservou esta aula")
+
+    # Ocupa a vaga com UPDATE condicional: o banco serializa reservas
+    # concorrentes e nenhuma passa do limite de inscrições
+    vaga_ocupada = db.query(EventoAula).filter(
+        EventoAula.id == aula_id,
+        or_(EventoAula.limite_inscricoes == None,
+            EventoAula.reservas_ativas < EventoAula.limite_inscricoes)
+    ).update({EventoAula.reservas_ativas: EventoAula.reservas_ativas + 1},
+             synchronize_session=False)
+
+    if not vaga_ocupada:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Aula lotada")
+
+    # Reserva e contador são gravados na mesma transação
+    reserva = ReservaAula(evento_aula_id=aula_id, usuario_id=usuario.id)
+    db.add(reserva)
+    db.commit()
+    db.refresh(reserva)
+    
+    # Registrar evento para acionar jornadas
+    registrar_evento(db, "RESERVA_CRIADA", {
+        "usuario_id": usuario.id,
+        "usuario_nome": usuario.nome,
+        "aula_id": aula_id,
+        "aula_nome": aula.nome_aula,
+        "reserva_id": reserva.id
+    })
+
+    return {"mensagem": "Reserva realizada com sucesso!", "id": reserva.id}
+
+
+@router.get("/aulas/{aula_id}/reservas")
+def listar_reservas_aula(aula_id: int,
+                         usuario: Usuario = Depends(get_current_user),
+                         db: Session = Depends(get_db)):
+    reservas = db.query(ReservaAula).filter(
+        ReservaAula.evento_aula_id == aula_id).all()
+
+    return [{
+        "id": r.id,
+        "usuario_nome": r.usuario.nome if r.usuario else "Desconhecido",
+        "usuario_email": r.usuario.email if r.usuario else "",
+        "data_reserva": r.data_reserva.isoformat() if r.data_reserva else None,
+        "presente": r.presente,
+        "cancelada": r.cancelada
+    } for r in reservas]
+
+
+@router.put("/aulas/reservas/{reserva_id}/marcar-presenca")
+def marcar_presenca(
+    reserva_id: int,
+    status: str,  # presente, falta, justificada
+    observacoes: str = None,
+    usuario: Usuario = Depends(get_current_user),
+    db: Session = Depends(get_db)):
+    reserva = db.query(ReservaAula).filter(
+        ReservaAula.id == reserva_id).first()
+    if not reserva:
+        raise HTTPException(status_code=404, detail="Reserva não encontrada")
+
+    # Validar status
+    if status not in ["presente", "falta", "justificada"]:
+        raise HTTPException(
+            status_code=400,
+            detail="Status deve ser: presente, falta ou justificada")
+
+    # Atualizar campo legado na reserva (para compatibilidade)
+    reserva.presente = (status == "presente")
+
+    # GARANTIR UNICIDADE: Deletar TODOS os registros existentes de Attendance para esta reserva
+    db.query(Attendance).filter(
+        Attendance.reserva_aula_id == reserva.id).delete()
+
+    # Criar NOVO registro único e autoritativo
+    attendance = Attendance(reserva_aula_id=reserva.id,
+                            evento_aula_id=reserva.evento_aula_id,
+                            usuario_id=reserva.usuario_id,
+                            status=status,
+                            observacoes=observacoes,
+                            marcado_por=usuario.id)
+    db.add(attendance)
+    db.commit()
+
+    return {
+        "mensagem": "Presença registrada com sucesso!",
+        "attendance_id": attendance.id,
+        "status": status
+    }
+
+
+@router.delete("/aulas/reservas/{reserva_id}/cancelar")
+def cancelar_reserva(reserva_id: int,
+                     usuario: Usuario = Depends(get_current_user),
+                     db: Session = Depends(get_db)):
+    reserva = db.query(ReservaAula).filter(
+        ReservaAula.id == reserva_id,
+        ReservaAula.usuario_id == usuario.id).first()
+
+    if not reserva:
+        raise HTTPException(status_code=404, detail="Reserva não encontrada")
+
+    # Cancelamento condicional: só libera a vaga se esta requisição
+    # foi a que efetivamente cancelou a reserva
+    canceladas = db.query(ReservaAula).filter(
+        ReservaAula.id == reserva.id,
+        ReservaAula.cancelada == False
+    ).update({ReservaAula.cancelada: True,
+              ReservaAula.data_cancelamento: datetime.utcnow()},
+             synchronize_session=False)
+
+    if canceladas:
+        db.query(EventoAula).filter(
+            EventoAula.id == reserva.evento_aula_id,
+            EventoAula.reservas_ativas > 0
+        ).update({EventoAula.reservas_ativas: EventoAula.reservas_ativas - 1},
+                 synchronize_session=False)
+        marcar_fatos_pendentes(db, evento_aula_id=reserva.evento_aula_id)
+
+    db.commit()
+    return {"mensagem": "Reserva cancelada com sucesso!"}
+
+
+# ============================================================
+# Endpoint de Limpeza de Duplicatas (Administração)
+# ============================================================
+
+
+@router.post("/admin/attendance/limpar-duplicatas")
+def limpar_duplicatas_attendance(usuario: Usuario = Depends(get_current_user),
+                                 db: Session = Depends(get_db)):
+    """
+    Remove registros duplicados de Attendance, mantendo apenas o mais recente por reserva
+    """
+    # Buscar todas as reservas com mais de um registro de Attendance
+    from sqlalchemy import func
+
+    duplicatas = db.query(Attendance.reserva_aula_id,
+                          func.count(Attendance.id).label('count')).group_by(
+                              Attendance.reserva_aula_id).having(
+                                  func.count(Attendance.id) > 1).all()
+
+    total_removidos = 0
+
+    for reserva_id, count in duplicatas:
+        # Buscar todos os registros desta reserva
+        registros = db.query(Attendance).filter(
+            Attendance.reserva_aula_id == reserva_id).order_by(
+                Attendance.data_marcacao.desc()).all()
+
+        # Manter o mais recente, deletar os outros
+        for registro in registros[1:]:
+            db.delete(registro)
+            total_removidos += 1
+
+    db.commit()
+
+    return {
+        "mensagem": "Duplicatas removidas com sucesso!",
+        "reservas_afetadas": len(duplicatas),
+        "registros_removidos": total_removidos
+    }
+
+
+# ============================================================
+# Endpoints de Attendance (Presença Detalhada)
+# ============================================================
+
+
+@router.get("/aulas/{aula_id}/attendance")
+def listar_attendance_aula(aula_id: int,
+                           usuario: Usuario = Depends(get_current_user),
+                           db: Session = Depends(get_db)):
+    """
+    Lista todos os registros de presença de uma aula
+    """
+    attendance_records = db.query(Attendance).filter(
+        Attendance.evento_aula_id == aula_id).all()
+
+    return [{
+        "id":
+        a.id,
+        "usuario":
+        a.usuario.nome if a.usuario else "Desconhecido",
+        "status":
+        a.status,
+        "data_marcacao":
+        a.data_marcacao.isoformat() if a.data_marcacao else None,
+        "observacoes":
+        a.observacoes,
+        "marcado_por":
+        a.marcador.nome if a.marcador else "Sistema"
+    } for a in attendance_records]
+
+
+@router.get("/usuarios/{usuario_id}/attendance")
+def listar_attendance_usuario(usuario_id: int,
+                              data_inicio: Optional[str] = None,
+                              data_fim: Optional[str] = None,
+                              usuario: Usuario = Depends(get_current_user),
+                              db: Session = Depends(get_db)):
+    """
+    Lista histórico de presença de um usuário
+    """
+    query = db.query(Attendance).filter(Attendance.usuario_id == usuario_id)
+
+    if data_inicio:
+        query = query.filter(
+            Attendance.data_marcacao >= datetime.fromisoformat(data_inicio))
+    if data_fim:
+        query = query.filter(
+            Attendance.data_marcacao <= datetime.fromisoformat(data_fim))
+
+    attendance_records = query.order_by(Attendance.data_marcacao.desc()).all()
+
+    return [{
+        "id":
+        a.id,
+        "aula":
+        a.evento_aula.nome_aula if a.evento_aula else "N/A",
+        "status":
+        a.status,
+        "data_marcacao":
+        a.data_marcacao.isoformat() if a.data_marcacao else None,
+        "observacoes":
+        a.observacoes
+    } for a in attendance_records]
+
+
+@router.post("/aulas/{aula_id}/enviar-email-inscritos")
+def enviar_email_inscritos(aula_id: int,
+                           assunto: str,
+                           mensagem: str,
+                           usuario: Usuario = Depends(get_current_user),
+                           db: Session = Depends(get_db)):
+    """
+    Envia e-mail para todos os inscritos em uma aula
+    """
+    aula = db.query(EventoAula).options(
+        joinedload(EventoAula.instrutor),
+        joinedload(EventoAula.sala)
+    ).filter(EventoAula.id == aula_id).first()
+    if not aula:
+        raise HTTPException(status_code=404, detail="Aula não encontrada")
+
+    reservas = db.query(ReservaAula).options(
+        joinedload(ReservaAula.usuario)
+    ).filter(
+        ReservaAula.evento_aula_id == aula_id,
+        ReservaAula.cancelada == False).all()
+
+    if not reservas:
+        return {"mensagem": "Nenhum inscrito para enviar e-mail"}
+
+    # Template de e-mail com placeholders
+    corpo_email = f"""
+    <html>
+        <body style="font-family: Arial, sans-serif;">
+            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+                <h2 style="color: #62b1ca;">Myvivio CRM - {aula.nome_aula}</h2>
+                <p>{mensagem}</p>
+                <hr style="border: 1px solid #eee; margin: 20px 0;">
+                <p><strong>Detalhes da Aula:</strong></p>
+                <ul>
+                    <li>Aula: {aula.nome_aula}</li>
+                    <li>Instrutor: {aula.instrutor.nome if aula.instrutor else 'N/A'}</li>
+                    <li>Sala: {aula.sala.nome if aula.sala else 'N/A'}</li>
+                    <li>Data/Hora: {aula.data_hora.strftime('%d/%m/%Y às %H:%M') if aula.data_hora else 'N/A'}</li>
+                </ul>
+                <p style="color: #666; font-size: 12px;">Este é um e-mail automático do Myvivio CRM</p>
+            </div>
+        </body>
+    </html>
+    """
+
+    destinatarios = list(dict.fromkeys(
+        r.usuario.email for r in reservas if r.usuario and r.usuario.email
+    ))
+
+    emails = enfileirar_emails(db, [(d, assunto, corpo_email) for d in destinatarios],
+                               origem=f"AULA:{aula_id}")
+
+    return {
+        "mensagem": f"E-mails enfileirados para envio!",
+        "total_inscritos": len(reservas),
+        "emails_enfileirados": len(emails)
+    }
+
+
+@router.get("/aulas/{aula_id}/grafico")
+async def grafico_aula(aula_id: int,
+                       request: Request,
+                       formato: str = "json",
+                       usuario: Usuario = Depends(get_current_user),
+                       db: Session = Depends(get_db)):
+    """
+    Gera gráfico circular com estatísticas da aula (usando Attendance).
+    formato: json (PNG em base64, padrão), png ou svg
+    """
+    if formato != "json" and formato not in FORMATOS_GRAFICO:
+        raise HTTPException(status_code=400, detail="Formato inválido (use json, png ou svg)")
+
+    aula = db.query(EventoAula).filter(EventoAula.id == aula_id).first()
+    if not aula:
+        raise HTTPException(status_code=404, detail="Aula não encontrada")
+
+    # Usar SOMENTE Attendance como fonte autoritativa
+    contagem_status = dict(db.query(
+        Attendance.status, func.count(Attendance.id)
+    ).filter(
+        Attendance.evento_aula_id == aula_id
+    ).group_by(Attendance.status).all())
+
+    total_inscricoes = aula.reservas_ativas or 0
+    vagas_disponiveis = (aula.limite_inscricoes or 0) - total_inscricoes
+
+    dados_grafico = {
+        "Presentes": contagem_status.get("presente", 0),
+        "Faltas": contagem_status.get("falta", 0),
+        "Justificadas": contagem_status.get("justificada", 0),
+        "Vagas Disponíveis": vagas_disponiveis
+    }
+
+    # Remover zeros
+    dados_grafico = {k: v for k, v in dados_grafico.items() if v > 0}
+
+    if not dados_grafico:
+        return {"erro": "Sem dados para gráfico"}
+
+    formato_imagem = "png" if formato == "json" else formato
+    dados = tuple(dados_grafico.items())
+    chave = (aula_id, formato_imagem, dados)
+    etag = '"' + hashlib.sha1(repr(chave).encode()).hexdigest() + '"'
+
+    if formato != "json" and request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    conteudo = await obter_grafico_circular(chave, dados, formato_imagem)
+
+    if formato != "json":
+        return Response(content=conteudo,
+                        media_type=FORMATOS_GRAFICO[formato],
+                        headers={"ETag": etag, "Cache-Control": "private, max-age=60"})
+
+    return {
+        "aula": aula.nome_aula,
+        "grafico": f"data:image/png;base64,{base64.b64encode(conteudo).decode()}",
+        "dados": dados_grafico
+    }
+
+
+@router.get("/aulas/exportar-csv")
+def exportar_aulas_csv(data_inicio: str,
+                       data_fim: str,
+                       usuario: Usuario = Depends(get_current_user)):
+    """
+    Exporta aulas em CSV (inscritos vêm do contador reservas_ativas)
+    """
+    inicio = datetime.fromisoformat(data_inicio)
+    fim = datetime.fromisoformat(data_fim)
+
+    def consulta(db: Session):
+        return db.query(
+            EventoAula.id, EventoAula.nome_aula,
+            Instrutor.nome.label("instrutor_nome"),
+            Sala.nome.label("sala_nome"),
+            EventoAula.data_hora, EventoAula.duracao_minutos,
+            EventoAula.limite_inscricoes, EventoAula.reservas_ativas
+        ).outerjoin(
+            Instrutor, EventoAula.instrutor_id == Instrutor.id
+        ).outerjoin(
+            Sala, EventoAula.sala_id == Sala.id
+        ).filter(
+            EventoAula.ativa == True,
+            EventoAula.data_hora >= inicio,
+            EventoAula.data_hora <= fim
+        ).order_by(EventoAula.data_hora, EventoAula.id)
+
+    def formatar(a):
+        return [
+            a.id, a.nome_aula, a.instrutor_nome or '', a.sala_nome or '',
+            a.data_hora.isoformat() if a.data_hora else '', a.duracao_minutos,
+            a.limite_inscricoes,
+            a.reservas_ativas
+        ]
+
+    return StreamingResponse(
+        gerar_csv_streaming([
+            'ID', 'Aula', 'Instrutor', 'Sala', 'Data/Hora', 'Duração', 'Limite',
+            'Inscritos'
+        ], consulta, formatar),
+        media_type="text/csv; charset=utf-8",
+        headers={
+            "Content-Disposition":
+            f"attachment; filename=aulas_{data_inicio}_{data_fim}.csv"
+        })
+
+
+# ============================================================
+# Endpoints de Estatísticas e Relatórios
+# ============================================================
+
+
+@router.get("/aulas/{aula_id}/estatisticas")
+def estatisticas_aula(aula_id: int,
+                      usuario: Usuario = Depends(get_current_user),
+                      db: Session = Depends(get_db)):
+    aula = db.query(EventoAula).filter(EventoAula.id == aula_id).first()
+    if not aula:
+        raise HTTPException(status_code=404, detail="Aula não encontrada")
+
+    # Usar SOMENTE Attendance como fonte autoritativa
+    attendance_records = db.query(Attendance).filter(
+        Attendance.evento_aula_id == aula_id).all()
+    reservas = db.query(ReservaAula).filter(
+        ReservaAula.evento_aula_id == aula_id).all()
+
+    total_inscricoes = len([r for r in reservas if not r.cancelada])
+    total_canceladas = len([r for r in reservas if r.cancelada])
+
+    # Calcular presença/faltas SOMENTE usando Attendance
+    total_presentes = len(
+        [a for a in attendance_records if a.status == "presente"])
+    total_faltas = len([a for a in attendance_records if a.status == "falta"])
+    total_justificadas = len(
+        [a for a in attendance_records if a.status == "justificada"])
+
+    ocupacao_percentual = (total_inscricoes / aula.limite_inscricoes *
+                           100) if aula.limite_inscricoes > 0 else 0
+
+    return {
+        "aula_id": aula_id,
+        "nome_aula": aula.nome_aula,
+        "limite_inscricoes": aula.limite_inscricoes,
+        "total_inscricoes": total_inscricoes,
+        "total_presentes": total_presentes,
+        "total_faltas": total_faltas,
+        "total_justificadas": total_justificadas,
+        "total_canceladas": total_canceladas,
+        "ocupacao_percentual": round(ocupacao_percentual, 2),
+        "vagas_disponiveis": aula.limite_inscricoes - total_inscricoes
+    }
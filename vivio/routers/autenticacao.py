@@ -0,0 +1,94 @@
+"""
+Endpoints de autenticação
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from datetime import datetime
+
+from vivio.auth import (
+    criar_token_acesso, get_current_user, hash_senha_async, verificar_e_atualizar_senha_async)
+from vivio.database import get_db
+from vivio.eventos import registrar_evento
+from vivio.models import Usuario
+from vivio.schemas import LoginRequest, RegistroRequest
+
+router = APIRouter()
+
+
+# Os endpoints abaixo são async para que o Argon2 rode no executor de hash;
+# o trabalho no banco (SQLAlchemy síncrono) vai para o threadpool e não
+# bloqueia o loop
+
+
+def buscar_usuario_por_email(db: Session, email: str):
+    return db.query(Usuario).filter(Usuario.email == email).first()
+
+
+def salvar_usuario_registrado(db: Session, usuario: Usuario):
+    db.add(usuario)
+    db.commit()
+    db.refresh(usuario)
+    
+    # Registrar evento para acionar jornadas de onboarding
+    registrar_evento(db, "USUARIO_CRIADO", {
+        "usuario_id": usuario.id,
+        "usuario_nome": usuario.nome,
+        "usuario_email": usuario.email,
+        "unidade_id": usuario.unidade_id
+    })
+
+
+def registrar_login(db: Session, usuario: Usuario, novo_hash: str = None):
+    # Parâmetros do Argon2 mudaram desde o cadastro: regrava o hash
+    if novo_hash:
+        usuario.senha = novo_hash
+
+    usuario.ultima_atividade = datetime.utcnow()
+    db.commit()
+
+
+@router.post("/registrar")
+async def registrar(dados: RegistroRequest, db: Session = Depends(get_db)):
+    if await run_in_threadpool(buscar_usuario_por_email, db, dados.email):
+        raise HTTPException(status_code=400, detail="E-mail já cadastrado")
+
+    usuario = Usuario(email=dados.email,
+                      senha=await hash_senha_async(dados.senha),
+                      nome=dados.nome,
+                      tipo=dados.tipo,
+                      unidade_id=dados.unidade_id)
+    await run_in_threadpool(salvar_usuario_registrado, db, usuario)
+    
+    return {"mensagem": "Usuário registrado com sucesso!"}
+
+
+@router.post("/login")
+async def login(dados: LoginRequest, db: Session = Depends(get_db)):
+    usuario = await run_in_threadpool(buscar_usuario_por_email, db, dados.email)
+    if not usuario:
+        raise HTTPException(status_code=400, detail="Credenciais inválidas")
+
+    valida, novo_hash = await verificar_e_atualizar_senha_async(dados.senha, usuario.senha)
+    if not valida:
+        raise HTTPException(status_code=400, detail="Credenciais inválidas")
+
+    # Lido antes do commit, que expira o objeto (evita um SELECT no loop)
+    email = usuario.email
+    await run_in_threadpool(registrar_login, db, usuario, novo_hash)
+
+    token = criar_token_acesso({"sub": email})
+    return {"access_token": token, "tipo": "bearer"}
+
+
+@router.get("/me")
+def get_me(usuario: Usuario = Depends(get_current_user)):
+    """Retorna informações do usuário logado"""
+    return {
+        "id": usuario.id,
+        "nome": usuario.nome,
+        "email": usuario.email,
+        "tipo": usuario.tipo,
+        "unidade_id": usuario.unidade_id,
+        "ativo": usuario.ativo
+    }
@@ -0,0 +1,393 @@
+"""
+Endpoints de jornadas, eventos do sistema e outbox de e-mails
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import List
+import json
+
+from vivio.auth import get_admin_user, get_current_user
+from vivio.config import (
+    EVENTOS_CONCORRENCIA, EVENTOS_INTERVALO_SEGUNDOS, EVENTOS_LOTE, EVENTOS_MAX_TENTATIVAS)
+from vivio.database import get_db
+from vivio.emails import estado_outbox_email, notificar_outbox_email, obter_pool_smtp
+from vivio.eventos import estado_worker_eventos, processar_eventos, vazao_eventos
+from vivio.models import EmailOutbox, EtapaJornada, EventoSistema, Jornada, Usuario, UsuarioJornada
+from vivio.schemas import (
+    EtapaJornadaCreate, EtapaJornadaInDB, EtapaJornadaUpdate, JornadaCreate, JornadaInDB,
+    JornadaUpdate)
+
+router = APIRouter()
+
+
+@router.get("/admin/emails/outbox")
+def status_outbox_email(usuario: Usuario = Depends(get_admin_user),
+                        db: Session = Depends(get_db)):
+    """Situação da fila de saída de e-mails e falhas recentes"""
+    por_status = dict(db.query(EmailOutbox.status, func.count(EmailOutbox.id)).group_by(EmailOutbox.status).all())
+
+    mais_antigo = db.query(func.min(EmailOutbox.data_criacao)).filter(
+        EmailOutbox.status == "PENDENTE"
+    ).scalar()
+
+    falhas_recentes = db.query(EmailOutbox).filter(
+        EmailOutbox.status == "FALHA"
+    ).order_by(EmailOutbox.id.desc()).limit(20).all()
+
+    return {
+        "worker": estado_outbox_email,
+        "smtp_configurado": obter_pool_smtp() is not None,
+        "pendentes": por_status.get("PENDENTE", 0),
+        "em_envio": por_status.get("EM_ENVIO", 0),
+        "enviados": por_status.get("ENVIADO", 0),
+        "falhas": por_status.get("FALHA", 0),
+        "atraso_segundos": (datetime.utcnow() - mais_antigo).total_seconds() if mais_antigo else 0,
+        "falhas_recentes": [{
+            "id": e.id,
+            "destinatario": e.destinatario,
+            "assunto": e.assunto,
+            "origem": e.origem,
+            "tentativas": e.tentativas,
+            "ultimo_erro": e.ultimo_erro
+        } for e in falhas_recentes]
+    }
+
+
+@router.post("/admin/emails/outbox/{email_id}/reenviar")
+def reenviar_email_outbox(email_id: int,
+                          usuario: Usuario = Depends(get_admin_user),
+                          db: Session = Depends(get_db)):
+    """Devolve um e-mail com FALHA para a fila"""
+    atualizados = db.query(EmailOutbox).filter(
+        EmailOutbox.id == email_id,
+        EmailOutbox.status == "FALHA"
+    ).update({
+        EmailOutbox.status: "PENDENTE",
+        EmailOutbox.tentativas: 0,
+        EmailOutbox.proxima_tentativa: datetime.utcnow()
+    }, synchronize_session=False)
+    db.commit()
+
+    if not atualizados:
+        raise HTTPException(status_code=404, detail="E-mail com falha não encontrado")
+
+    notificar_outbox_email()
+    return {"mensagem": "E-mail devolvido para a fila", "id": email_id}
+
+
+# ============================================================
+# Endpoints de Jornadas e Automação
+# ============================================================
+
+
+@router.get("/automacao/jornadas", response_model=List[JornadaInDB])
+def listar_jornadas(usuario: Usuario = Depends(get_current_user),
+                    db: Session = Depends(get_db)):
+    """Lista todas as Jornadas do usuário"""
+    jornadas = db.query(Jornada).filter(
+        (Jornada.criado_por_id == usuario.id) | (Jornada.unidade_id == usuario.unidade_id)
+    ).order_by(Jornada.data_criacao.desc()).all()
+    
+    return jornadas
+
+
+@router.post("/automacao/jornadas", response_model=JornadaInDB)
+def criar_jornada(jornada: JornadaCreate,
+                  usuario: Usuario = Depends(get_current_user),
+                  db: Session = Depends(get_db)):
+    """Cria uma nova Jornada (Workflow)"""
+    db_jornada = Jornada(
+        nome=jornada.nome,
+        descricao=jornada.descricao,
+        gatilho_evento=jornada.gatilho_evento,
+        ativa=jornada.ativa,
+        unidade_id=usuario.unidade_id,
+        criado_por_id=usuario.id
+    )
+    db.add(db_jornada)
+    db.commit()
+    db.refresh(db_jornada)
+    return db_jornada
+
+
+@router.get("/automacao/jornadas/{jornada_id}", response_model=JornadaInDB)
+def obter_jornada(jornada_id: int,
+                  usuario: Usuario = Depends(get_current_user),
+                  db: Session = Depends(get_db)):
+    """Obtém uma jornada específica"""
+    jornada = db.query(Jornada).filter(Jornada.id == jornada_id).first()
+    
+    if not jornada:
+        raise HTTPException(status_code=404, detail="Jornada não encontrada")
+    
+    # Verificar permissão
+    if jornada.criado_por_id != usuario.id and jornada.unidade_id != usuario.unidade_id:
+        raise HTTPException(status_code=403, detail="Acesso negado")
+    
+    return jornada
+
+
+@router.put("/automacao/jornadas/{jornada_id}")
+def atualizar_jornada(jornada_id: int,
+                      dados: JornadaUpdate,
+                      usuario: Usuario = Depends(get_current_user),
+                      db: Session = Depends(get_db)):
+    """Atualiza uma jornada existente"""
+    jornada = db.query(Jornada).filter(
+        Jornada.id == jornada_id,
+        Jornada.criado_por_id == usuario.id
+    ).first()
+    
+    if not jornada:
+        raise HTTPException(status_code=404, detail="Jornada não encontrada")
+    
+    if dados.nome is not None:
+        jornada.nome = dados.nome
+    if dados.descricao is not None:
+        jornada.descricao = dados.descricao
+    if dados.gatilho_evento is not None:
+        jornada.gatilho_evento = dados.gatilho_evento
+    if dados.ativa is not None:
+        jornada.ativa = dados.ativa
+    
+    jornada.data_atualizacao = datetime.utcnow()
+    db.commit()
+    
+    return {"mensagem": "Jornada atualizada com sucesso"}
+
+
+@router.delete("/automacao/jornadas/{jornada_id}")
+def deletar_jornada(jornada_id: int,
+                    usuario: Usuario = Depends(get_current_user),
+                    db: Session = Depends(get_db)):
+    """Deleta uma jornada"""
+    jornada = db.query(Jornada).filter(
+        Jornada.id == jornada_id,
+        Jornada.criado_por_id == usuario.id
+    ).first()
+    
+    if not jornada:
+        raise HTTPException(status_code=404, detail="Jornada não encontrada")
+    
+    db.delete(jornada)
+    db.commit()
+    
+    return {"mensagem": "Jornada excluída com sucesso"}
+
+
+@router.get("/automacao/jornadas/{jornada_id}/etapas", response_model=List[EtapaJornadaInDB])
+def listar_etapas_jornada(jornada_id: int,
+                          usuario: Usuario = Depends(get_current_user),
+                          db: Session = Depends(get_db)):
+    """Lista todas as etapas de uma Jornada"""
+    jornada = db.query(Jornada).filter(Jornada.id == jornada_id).first()
+    
+    if not jornada:
+        raise HTTPException(status_code=404, detail="Jornada não encontrada")
+    
+    return db.query(EtapaJornada).filter(
+        EtapaJornada.jornada_id == jornada_id
+    ).order_by(EtapaJornada.ordem).all()
+
+
+@router.post("/automacao/jornadas/{jornada_id}/etapas", response_model=EtapaJornadaInDB)
+def adicionar_etapa_jornada(jornada_id: int,
+                            etapa: EtapaJornadaCreate,
+                            usuario: Usuario = Depends(get_current_user),
+                            db: Session = Depends(get_db)):
+    """Adiciona uma etapa (ação) a uma Jornada"""
+    db_jornada = db.query(Jornada).filter(
+        Jornada.id == jornada_id,
+        Jornada.criado_por_id == usuario.id
+    ).first()
+    
+    if not db_jornada:
+        raise HTTPException(status_code=404, detail="Jornada não encontrada")
+    
+    db_etapa = EtapaJornada(
+        jornada_id=jornada_id,
+        nome=etapa.nome,
+        ordem=etapa.ordem,
+        acao_tipo=etapa.acao_tipo,
+        acao_config=json.dumps(etapa.acao_config)
+    )
+    db.add(db_etapa)
+    db.commit()
+    db.refresh(db_etapa)
+    return db_etapa
+
+
+@router.put("/automacao/etapas/{etapa_id}")
+def atualizar_etapa(etapa_id: int,
+                    dados: EtapaJornadaUpdate,
+                    usuario: Usuario = Depends(get_current_user),
+                    db: Session = Depends(get_db)):
+    """Atualiza uma etapa existente"""
+    etapa = db.query(EtapaJornada).filter(EtapaJornada.id == etapa_id).first()
+    
+    if not etapa:
+        raise HTTPException(status_code=404, detail="Etapa não encontrada")
+    
+    # Verificar se usuário tem permissão
+    jornada = db.query(Jornada).filter(
+        Jornada.id == etapa.jornada_id,
+        Jornada.criado_por_id == usuario.id
+    ).first()
+    
+    if not jornada:
+        raise HTTPException(status_code=403, detail="Acesso negado")
+    
+    if dados.nome is not None:
+        etapa.nome = dados.nome
+    if dados.ordem is not None:
+        etapa.ordem = dados.ordem
+    if dados.acao_tipo is not None:
+        etapa.acao_tipo = dados.acao_tipo
+    if dados.acao_config is not None:
+        etapa.acao_config = json.dumps(dados.acao_config)
+    
+    db.commit()
+    
+    return {"mensagem": "Etapa atualizada com sucesso"}
+
+
+@router.delete("/automacao/etapas/{etapa_id}")
+def deletar_etapa(etapa_id: int,
+                  usuario: Usuario = Depends(get_current_user),
+                  db: Session = Depends(get_db)):
+    """Deleta uma etapa"""
+    etapa = db.query(EtapaJornada).filter(EtapaJornada.id == etapa_id).first()
+    
+    if not etapa:
+        raise HTTPException(status_code=404, detail="Etapa não encontrada")
+    
+    # Verificar se usuário tem permissão
+    jornada = db.query(Jornada).filter(
+        Jornada.id == etapa.jornada_id,
+        Jornada.criado_por_id == usuario.id
+    ).first()
+    
+    if not jornada:
+        raise HTTPException(status_code=403, detail="Acesso negado")
+    
+    db.delete(etapa)
+    db.commit()
+    
+    return {"mensagem": "Etapa excluída com sucesso"}
+
+
+@router.get("/automacao/jornadas/{jornada_id}/progresso")
+def obter_progresso_jornada(jornada_id: int,
+                            usuario: Usuario = Depends(get_current_user),
+                            db: Session = Depends(get_db)):
+    """Obtém o progresso de uma jornada (quantos usuários em cada etapa)"""
+    jornada = db.query(Jornada).filter(Jornada.id == jornada_id).first()
+    
+    if not jornada:
+        raise HTTPException(status_code=404, detail="Jornada não encontrada")
+    
+    # Buscar todas as instâncias dessa jornada
+    usuarios_jornada = db.query(UsuarioJornada).filter(
+        UsuarioJornada.jornada_id == jornada_id
+    ).all()
+    
+    # Contar usuários por etapa
+    etapas = {etapa.id: {"nome": etapa.nome, "ordem": etapa.ordem, "usuarios": 0} for etapa in jornada.etapas}
+    concluidos = 0
+    em_andamento = 0
+    
+    for uj in usuarios_jornada:
+        if uj.concluida:
+            concluidos += 1
+        else:
+            em_andamento += 1
+            if uj.etapa_atual_id and uj.etapa_atual_id in etapas:
+                etapas[uj.etapa_atual_id]["usuarios"] += 1
+    
+    return {
+        "jornada_id": jornada_id,
+        "nome": jornada.nome,
+        "total_usuarios": len(usuarios_jornada),
+        "em_andamento": em_andamento,
+        "concluidos": concluidos,
+        "etapas": list(etapas.values())
+    }
+
+
+@router.post("/automacao/processar")
+async def run_automacao(usuario: Usuario = Depends(get_current_user),
+                       db: Session = Depends(get_db)):
+    """Endpoint para processar eventos e avançar jornadas manualmente"""
+    if usuario.tipo != "admin":
+        raise HTTPException(status_code=403, detail="Acesso restrito a administradores")
+    
+    resultado = await processar_eventos(db)
+    return {"mensagem": "Processamento de automação e jornadas concluído", **resultado}
+
+
+@router.post("/admin/eventos/processar")
+async def endpoint_processar_eventos(usuario: Usuario = Depends(get_current_user),
+                                      db: Session = Depends(get_db)):
+    """Processa eventos pendentes manualmente"""
+    if usuario.tipo != "admin":
+        raise HTTPException(status_code=403, detail="Acesso restrito a administradores")
+    
+    resultado = await processar_eventos(db)
+    
+    return {"mensagem": "Eventos processados com sucesso", **resultado}
+
+
+@router.get("/admin/eventos/worker")
+def endpoint_status_worker_eventos(usuario: Usuario = Depends(get_admin_user),
+                                   db: Session = Depends(get_db)):
+    """Status do worker de eventos: atraso da fila e vazão recente"""
+    pendentes, mais_antigo = db.query(
+        func.count(EventoSistema.id),
+        func.min(EventoSistema.data_registro)
+    ).filter(EventoSistema.status == "PENDENTE").one()
+    em_erro = db.query(func.count(EventoSistema.id)).filter(EventoSistema.status == "ERRO").scalar()
+
+    atraso = (datetime.utcnow() - mais_antigo).total_seconds() if mais_antigo else 0
+
+    return {
+        **estado_worker_eventos,
+        "configuracao": {
+            "lote": EVENTOS_LOTE,
+            "concorrencia": EVENTOS_CONCORRENCIA,
+            "intervalo_segundos": EVENTOS_INTERVALO_SEGUNDOS,
+            "max_tentativas": EVENTOS_MAX_TENTATIVAS
+        },
+        "eventos_pendentes": pendentes,
+        "eventos_em_erro": em_erro,
+        "atraso_segundos": round(atraso, 1),
+        "vazao_eventos_por_segundo": vazao_eventos()
+    }
+
+
+@router.get("/admin/eventos/listar")
+def endpoint_listar_eventos(processados: bool = False,
+                            usuario: Usuario = Depends(get_current_user),
+                            db: Session = Depends(get_db)):
+    """Lista eventos do sistema"""
+    if usuario.tipo != "admin":
+        raise HTTPException(status_code=403, detail="Acesso restrito a administradores")
+    
+    eventos = db.query(EventoSistema).filter(
+        EventoSistema.processado == processados
+    ).order_by(EventoSistema.data_registro.desc()).limit(100).all()
+    
+    return {
+        "total": len(eventos),
+        "eventos": [{
+            "id": e.id,
+            "tipo": e.tipo,
+            "payload": json.loads(e.payload) if e.payload else {},
+            "data_registro": e.data_registro.isoformat(),
+            "processado": e.processado,
+            "status": e.status,
+            "tentativas": e.tentativas,
+            "ultimo_erro": e.ultimo_erro
+        } for e in eventos]
+    }
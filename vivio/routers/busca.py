@@ -0,0 +1,39 @@
+"""
+Endpoint da busca global (membros, visitantes, aulas, equipe e exercícios)
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from vivio.auth import UsuarioAutenticado, get_usuario_autenticado
+from vivio.busca import TIPOS_BUSCA, buscar_global
+from vivio.config import BUSCA_LIMITE_MAX, BUSCA_LIMITE_POR_TIPO
+from vivio.database import get_db
+
+router = APIRouter()
+
+
+@router.get("/busca")
+def busca_global(q: str,
+                 tipos: Optional[str] = None,
+                 limite: int = BUSCA_LIMITE_POR_TIPO,
+                 usuario: UsuarioAutenticado = Depends(get_usuario_autenticado),
+                 db: Session = Depends(get_db)):
+    """
+    Typeahead: até limite resultados por tipo (tipos separados por vírgula,
+    todos por padrão), tolerando erros de digitação, na unidade do usuário.
+    Usuários sem unidade não recebem resultados, exceto administradores
+    """
+    selecionados = [t.strip() for t in tipos.split(",") if t.strip()] if tipos else list(TIPOS_BUSCA)
+    invalidos = [t for t in selecionados if t not in TIPOS_BUSCA]
+    if invalidos:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Tipos inválidos: {', '.join(invalidos)}. Disponíveis: {', '.join(TIPOS_BUSCA)}")
+
+    limite = max(1, min(limite, BUSCA_LIMITE_MAX))
+    return {
+        "consulta": q,
+        "resultados": buscar_global(db, q, selecionados, usuario.unidade_id, limite,
+                                    admin=usuario.tipo == "admin")
+    }
@@ -0,0 +1,730 @@
+"""
+Endpoints de cadastros: programas, visitantes, usuários, unidades, salas, instrutores e equipe
+"""
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Optional
+import json
+
+from vivio.auth import get_current_user, hash_senha_async
+from vivio.config import PAGINACAO_LIMITE_PADRAO
+from vivio.database import get_db
+from vivio.models import Instrutor, MembroEquipe, Programa, Sala, Unidade, Usuario, Visitante
+from vivio.paginacao import listar_paginado
+
+router = APIRouter()
+
+
+# ============================================================
+# Endpoints de Programas
+# ============================================================
+
+
+# Campos disponíveis em fields= (sessoes vem do JSON gravado em descricao)
+CAMPOS_PROGRAMA = {
+    "id": Programa.id,
+    "nome": Programa.nome,
+    "status": Programa.status,
+    "usuarios_matriculados": Programa.usuarios_matriculados,
+    "data_inicio": Programa.data_inicio,
+    "data_fim": Programa.data_fim,
+    "descricao": Programa.descricao,
+    "sessoes": Programa.descricao,
+}
+
+
+def _formatar_programa(prog_data: dict) -> dict:
+    if "descricao" not in prog_data and "sessoes" not in prog_data:
+        return prog_data
+    descricao = prog_data.get("descricao", prog_data.get("sessoes"))
+    # Parse descricao if it contains JSON with sessions
+    try:
+        desc_data = json.loads(descricao) if descricao else {}
+        if isinstance(desc_data, dict) and "sessoes" in desc_data:
+            texto, sessoes = desc_data.get("texto", ""), desc_data.get("sessoes", [])
+        else:
+            texto, sessoes = descricao or "", []
+    except (json.JSONDecodeError, TypeError):
+        texto, sessoes = descricao or "", []
+    if "descricao" in prog_data:
+        prog_data["descricao"] = texto
+    if "sessoes" in prog_data:
+        prog_data["sessoes"] = sessoes
+    return prog_data
+
+
+@router.get("/programas")
+def listar_programas(response: Response,
+                     cursor: Optional[str] = None,
+                     limite: int = PAGINACAO_LIMITE_PADRAO,
+                     fields: Optional[str] = None,
+                     usuario: Usuario = Depends(get_current_user),
+                     db: Session = Depends(get_db)):
+    """Programas da unidade, paginados por cursor (cabeçalho X-Proximo-Cursor)"""
+    filtros = [Programa.unidade_id == usuario.unidade_id] if usuario.unidade_id else []
+    return listar_paginado(db, response, CAMPOS_PROGRAMA, fields, filtros,
+                           [(Programa.id, False)], cursor, limite,
+                           ("programas", usuario.unidade_id),
+                           formatar=_formatar_programa)
+
+
+@router.post("/programas/criar")
+async def criar_programa(request: Request,
+                   usuario: Usuario = Depends(get_current_user),
+                   db: Session = Depends(get_db)):
+    data = await request.json()
+    nome = data.get("nome", "Programa sem nome")
+    descricao = data.get("descricao", "")
+    status = data.get("status", "ativo")
+    unidade_id = data.get("unidade_id", usuario.unidade_id or 1)
+    sessoes = data.get("sessoes", [])
+    
+    # Store sessions as JSON in descricao if provided
+    if sessoes:
+        descricao_json = json.dumps({
+            "texto": descricao,
+            "sessoes": sessoes
+        })
+    else:
+        descricao_json = descricao
+    
+    programa = Programa(nome=nome,
+                        descricao=descricao_json,
+                        status=status,
+                        unidade_id=unidade_id,
+                        data_inicio=datetime.utcnow())
+    db.add(programa)
+    db.commit()
+
+    return {"mensagem": "Programa criado com sucesso!", "id": programa.id}
+
+
+@router.put("/programas/{programa_id}")
+async def atualizar_programa(programa_id: int,
+                             request: Request,
+                             usuario: Usuario = Depends(get_current_user),
+                             db: Session = Depends(get_db)):
+    programa = db.query(Programa).filter(Programa.id == programa_id).first()
+    if not programa:
+        raise HTTPException(status_code=404, detail="Programa não encontrado")
+    
+    data = await request.json()
+    
+    if "nome" in data:
+        programa.nome = data["nome"]
+    if "descricao" in data:
+        programa.descricao = data["descricao"]
+    if "status" in data:
+        programa.status = data["status"]
+    if "usuarios_matriculados" in data:
+        programa.usuarios_matriculados = data["usuarios_matriculados"]
+    if "data_fim" in data and data["data_fim"]:
+        programa.data_fim = datetime.fromisoformat(data["data_fim"].replace("Z", "+00:00"))
+    
+    db.commit()
+    return {"mensagem": "Programa atualizado com sucesso!", "id": programa.id}
+
+
+@router.post("/programas/{programa_id}/atribuir")
+async def atribuir_usuarios_programa(programa_id: int,
+                                     request: Request,
+                                     usuario: Usuario = Depends(get_current_user),
+                                     db: Session = Depends(get_db)):
+    programa = db.query(Programa).filter(Programa.id == programa_id).first()
+    if not programa:
+        raise HTTPException(status_code=404, detail="Programa não encontrado")
+    
+    data = await request.json()
+    usuario_ids = data.get("usuario_ids", [])
+    
+    # Update usuarios_matriculados count
+    programa.usuarios_matriculados = (programa.usuarios_matriculados or 0) + len(usuario_ids)
+    db.commit()
+    
+    return {
+        "mensagem": f"{len(usuario_ids)} usuário(s) atribuído(s) ao programa",
+        "programa_id": programa.id,
+        "total_matriculados": programa.usuarios_matriculados
+    }
+
+
+# ============================================================
+# Endpoints de Visitantes
+# ============================================================
+
+
+@router.post("/visitantes/registrar")
+def registrar_visitante(nome: str,
+                        email: str,
+                        telefone: str,
+                        unidade_id: int,
+                        db: Session = Depends(get_db)):
+    visitante = Visitante(nome=nome,
+                          email=email,
+                          telefone=telefone,
+                          unidade_id=unidade_id)
+    db.add(visitante)
+    db.commit()
+
+    return {"mensagem": "Visitante registrado com sucesso!"}
+
+
+CAMPOS_VISITANTE = {
+    "id": Visitante.id,
+    "nome": Visitante.nome,
+    "email": Visitante.email,
+    "telefone": Visitante.telefone,
+    "unidade_id": Visitante.unidade_id,
+    "data_visita": Visitante.data_visita,
+    "convertido": Visitante.convertido,
+    "lead_score": Visitante.lead_score,
+    "tipo_lead": Visitante.tipo_lead,
+    "empresa": Visitante.empresa,
+}
+
+
+@router.get("/visitantes")
+def listar_visitantes(response: Response,
+                      cursor: Optional[str] = None,
+                      limite: int = PAGINACAO_LIMITE_PADRAO,
+                      fields: Optional[str] = None,
+                      usuario: Usuario = Depends(get_current_user),
+                      db: Session = Depends(get_db)):
+    """Visitantes da unidade, paginados por cursor (cabeçalho X-Proximo-Cursor)"""
+    filtros = [Visitante.unidade_id == usuario.unidade_id] if usuario.unidade_id else []
+    return listar_paginado(db, response, CAMPOS_VISITANTE, fields, filtros,
+                           [(Visitante.id, False)], cursor, limite,
+                           ("visitantes", usuario.unidade_id))
+
+
+@router.get("/visitantes/{visitante_id}")
+def obter_visitante(visitante_id: int,
+                    usuario: Usuario = Depends(get_current_user),
+                    db: Session = Depends(get_db)):
+    visitante = db.query(Visitante).filter(Visitante.id == visitante_id).first()
+    if not visitante:
+        raise HTTPException(status_code=404, detail="Visitante não encontrado")
+    return {
+        "id": visitante.id,
+        "nome": visitante.nome,
+        "email": visitante.email,
+        "telefone": visitante.telefone,
+        "unidade_id": visitante.unidade_id,
+        "data_visita": visitante.data_visita.isoformat() if visitante.data_visita else None,
+        "convertido": visitante.convertido,
+        "lead_score": visitante.lead_score,
+        "tipo_lead": visitante.tipo_lead,
+        "empresa": visitante.empresa
+    }
+
+
+@router.post("/visitantes")
+def criar_visitante(nome: str,
+                    email: str,
+                    telefone: str = "",
+                    unidade_id: int = 1,
+                    tipo_lead: str = "Individual",
+                    empresa: str = None,
+                    usuario: Usuario = Depends(get_current_user),
+                    db: Session = Depends(get_db)):
+    visitante = Visitante(
+        nome=nome,
+        email=email,
+        telefone=telefone,
+        unidade_id=unidade_id,
+        tipo_lead=tipo_lead,
+        empresa=empresa
+    )
+    db.add(visitante)
+    db.commit()
+    db.refresh(visitante)
+    return {
+        "mensagem": "Visitante criado com sucesso!",
+        "id": visitante.id,
+        "visitante": {
+            "id": visitante.id,
+            "nome": visitante.nome,
+            "email": visitante.email,
+            "telefone": visitante.telefone,
+            "tipo_lead": visitante.tipo_lead,
+            "empresa": visitante.empresa
+        }
+    }
+
+
+@router.put("/visitantes/{visitante_id}")
+def atualizar_visitante(visitante_id: int,
+                        nome: str = None,
+                        email: str = None,
+                        telefone: str = None,
+                        convertido: bool = None,
+                        lead_score: int = None,
+                        tipo_lead: str = None,
+                        empresa: str = None,
+                        usuario: Usuario = Depends(get_current_user),
+                        db: Session = Depends(get_db)):
+    visitante = db.query(Visitante).filter(Visitante.id == visitante_id).first()
+    if not visitante:
+        raise HTTPException(status_code=404, detail="Visitante não encontrado")
+    
+    if nome is not None:
+        visitante.nome = nome
+    if email is not None:
+        visitante.email = email
+    if telefone is not None:
+        visitante.telefone = telefone
+    if convertido is not None:
+        visitante.convertido = convertido
+    if lead_score is not None:
+        visitante.lead_score = lead_score
+    if tipo_lead is not None:
+        visitante.tipo_lead = tipo_lead
+    if empresa is not None:
+        visitante.empresa = empresa
+    
+    db.commit()
+    return {"mensagem": "Visitante atualizado com sucesso!"}
+
+
+@router.delete("/visitantes/{visitante_id}")
+def deletar_visitante(visitante_id: int,
+                      usuario: Usuario = Depends(get_current_user),
+                      db: Session = Depends(get_db)):
+    visitante = db.query(Visitante).filter(Visitante.id == visitante_id).first()
+    if not visitante:
+        raise HTTPException(status_code=404, detail="Visitante não encontrado")
+    
+    db.delete(visitante)
+    db.commit()
+    return {"mensagem": "Visitante deletado com sucesso!"}
+
+
+# ============================================================
+# Endpoints de Usuários (Contatos/Membros)
+# ============================================================
+
+
+# A senha nunca entra na projeção
+CAMPOS_USUARIO = {
+    "id": Usuario.id,
+    "nome": Usuario.nome,
+    "email": Usuario.email,
+    "tipo": Usuario.tipo,
+    "unidade_id": Usuario.unidade_id,
+    "ativo": Usuario.ativo,
+    "data_cadastro": Usuario.data_cadastro,
+    "ultima_atividade": Usuario.ultima_atividade,
+    "risco_churn": Usuario.risco_churn,
+}
+
+
+@router.get("/usuarios")
+def listar_usuarios(response: Response,
+                    cursor: Optional[str] = None,
+                    limite: int = PAGINACAO_LIMITE_PADRAO,
+                    fields: Optional[str] = None,
+                    usuario: Usuario = Depends(get_current_user),
+                    db: Session = Depends(get_db)):
+    """Usuários da unidade, paginados por cursor (cabeçalho X-Proximo-Cursor)"""
+    filtros = [Usuario.unidade_id == usuario.unidade_id] if usuario.unidade_id else []
+    return listar_paginado(db, response, CAMPOS_USUARIO, fields, filtros,
+                           [(Usuario.id, False)], cursor, limite,
+                           ("usuarios", usuario.unidade_id))
+
+
+@router.get("/usuarios/{usuario_id}")
+def obter_usuario(usuario_id: int,
+                  usuario: Usuario = Depends(get_current_user),
+                  db: Session = Depends(get_db)):
+    user = db.query(Usuario).filter(Usuario.id == usuario_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="Usuário não encontrado")
+    return {
+        "id": user.id,
+        "nome": user.nome,
+        "email": user.email,
+        "tipo": user.tipo,
+        "unidade_id": user.unidade_id,
+        "ativo": user.ativo,
+        "data_cadastro": user.data_cadastro.isoformat() if user.data_cadastro else None,
+        "ultima_atividade": user.ultima_atividade.isoformat() if user.ultima_atividade else None,
+        "risco_churn": user.risco_churn
+    }
+
+
+def email_cadastrado(db: Session, email: str) -> bool:
+    return db.query(Usuario.id).filter(Usuario.email == email).first() is not None
+
+
+def salvar_usuario(db: Session, usuario: Usuario):
+    db.add(usuario)
+    db.commit()
+    db.refresh(usuario)
+
+
+@router.post("/usuarios")
+async def criar_usuario(nome: str,
+                        email: str,
+                        senha: str,
+                        tipo: str = "aluno",
+                        unidade_id: int = 1,
+                        usuario: Usuario = Depends(get_current_user),
+                        db: Session = Depends(get_db)):
+    # Async por causa do hash (executor próprio); o banco vai para o threadpool
+    if await run_in_threadpool(email_cadastrado, db, email):
+        raise HTTPException(status_code=400, detail="Email já cadastrado")
+    
+    novo_usuario = Usuario(
+        nome=nome,
+        email=email,
+        senha=await hash_senha_async(senha),
+        tipo=tipo,
+        unidade_id=unidade_id
+    )
+    await run_in_threadpool(salvar_usuario, db, novo_usuario)
+    return {
+        "mensagem": "Usuário criado com sucesso!",
+        "id": novo_usuario.id,
+        "usuario": {
+            "id": novo_usuario.id,
+            "nome": novo_usuario.nome,
+            "email": novo_usuario.email,
+            "tipo": novo_usuario.tipo
+        }
+    }
+
+
+@router.put("/usuarios/{usuario_id}")
+def atualizar_usuario(usuario_id: int,
+                      nome: str = None,
+                      email: str = None,
+                      tipo: str = None,
+                      ativo: bool = None,
+                      risco_churn: float = None,
+                      usuario: Usuario = Depends(get_current_user),
+                      db: Session = Depends(get_db)):
+    user = db.query(Usuario).filter(Usuario.id == usuario_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="Usuário não encontrado")
+    
+    if nome is not None:
+        user.nome = nome
+    if email is not None:
+        existing = db.query(Usuario).filter(Usuario.email == email, Usuario.id != usuario_id).first()
+        if existing:
+            raise HTTPException(status_code=400, detail="Email já cadastrado por outro usuário")
+        user.email = email
+    if tipo is not None:
+        user.tipo = tipo
+    if ativo is not None:
+        user.ativo = ativo
+    if risco_churn is not None:
+        user.risco_churn = risco_churn
+    
+    user.ultima_atividade = datetime.utcnow()
+    db.commit()
+    return {"mensagem": "Usuário atualizado com sucesso!"}
+
+
+@router.delete("/usuarios/{usuario_id}")
+def deletar_usuario(usuario_id: int,
+                    usuario: Usuario = Depends(get_current_user),
+                    db: Session = Depends(get_db)):
+    user = db.query(Usuario).filter(Usuario.id == usuario_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="Usuário não encontrado")
+    
+    if user.id == usuario.id:
+        raise HTTPException(status_code=400, detail="Não é possível deletar seu próprio usuário")
+    
+    db.delete(user)
+    db.commit()
+    return {"mensagem": "Usuário deletado com sucesso!"}
+
+
+# ============================================================
+# Endpoints de Unidades
+# ============================================================
+
+
+@router.get("/unidades")
+def listar_unidades(usuario: Usuario = Depends(get_current_user),
+                    db: Session = Depends(get_db)):
+    unidades = db.query(Unidade).all()
+    return [{
+        "id": u.id,
+        "nome": u.nome,
+        "endereco": u.endereco,
+        "risco_desistencia": u.risco_desistencia
+    } for u in unidades]
+
+
+@router.post("/unidades/criar")
+def criar_unidade(nome: str,
+                  endereco: str,
+                  usuario: Usuario = Depends(get_current_user),
+                  db: Session = Depends(get_db)):
+    unidade = Unidade(nome=nome, endereco=endereco)
+    db.add(unidade)
+    db.commit()
+
+    return {"mensagem": "Unidade criada com sucesso!", "id": unidade.id}
+
+
+# ============================================================
+# Endpoints de Salas
+# ============================================================
+
+
+@router.get("/salas")
+def listar_salas(usuario: Usuario = Depends(get_current_user),
+                 db: Session = Depends(get_db)):
+    salas = db.query(Sala).filter(Sala.ativa == True).all()
+    return [{
+        "id": s.id,
+        "nome": s.nome,
+        "capacidade": s.capacidade,
+        "unidade_id": s.unidade_id
+    } for s in salas]
+
+
+@router.post("/salas/criar")
+def criar_sala(nome: str,
+               capacidade: int,
+               unidade_id: int,
+               usuario: Usuario = Depends(get_current_user),
+               db: Session = Depends(get_db)):
+    sala = Sala(nome=nome, capacidade=capacidade, unidade_id=unidade_id)
+    db.add(sala)
+    db.commit()
+    return {"mensagem": "Sala criada com sucesso!", "id": sala.id}
+
+
+# ============================================================
+# Endpoints de Instrutores
+# ============================================================
+
+
+@router.get("/instrutores")
+def listar_instrutores(usuario: Usuario = Depends(get_current_user),
+                       db: Session = Depends(get_db)):
+    instrutores = db.query(Instrutor).filter(Instrutor.ativo == True).all()
+    return [{
+        "id": i.id,
+        "nome": i.nome,
+        "email": i.email,
+        "especialidades": i.especialidades,
+        "foto_url": i.foto_url
+    } for i in instrutores]
+
+
+@router.post("/instrutores/criar")
+def criar_instrutor(nome: str,
+                    email: str,
+                    especialidades: str,
+                    unidade_id: int,
+                    foto_url: str = None,
+                    usuario: Usuario = Depends(get_current_user),
+                    db: Session = Depends(get_db)):
+    instrutor = Instrutor(nome=nome,
+                          email=email,
+                          especialidades=especialidades,
+                          unidade_id=unidade_id,
+                          foto_url=foto_url)
+    db.add(instrutor)
+    db.commit()
+    return {"mensagem": "Instrutor criado com sucesso!", "id": instrutor.id}
+
+
+# ============================================================
+# Endpoints de Membros da Equipe
+# ============================================================
+
+
+@router.get("/membros-equipe")
+def listar_membros_equipe(ativo: Optional[bool] = True,
+                          cargo: Optional[str] = None,
+                          usuario: Usuario = Depends(get_current_user),
+                          db: Session = Depends(get_db)):
+    query = db.query(MembroEquipe)
+    
+    if ativo is not None:
+        query = query.filter(MembroEquipe.ativo == ativo)
+    
+    if cargo:
+        query = query.filter(MembroEquipe.cargo == cargo)
+    
+    membros = query.order_by(MembroEquipe.nome).all()
+    
+    return [{
+        "id": m.id,
+        "nome": m.nome,
+        "email": m.email,
+        "telefone": m.telefone,
+        "cargo": m.cargo,
+        "especialidades": json.loads(m.especialidades) if m.especialidades else [],
+        "foto_url": m.foto_url,
+        "data_admissao": m.data_admissao.isoformat() if m.data_admissao else None,
+        "horario_trabalho": json.loads(m.horario_trabalho) if m.horario_trabalho else None,
+        "cor_agenda": m.cor_agenda,
+        "observacoes": m.observacoes,
+        "ativo": m.ativo,
+        "created_at": m.created_at.isoformat() if m.created_at else None
+    } for m in membros]
+
+
+@router.get("/membros-equipe/{membro_id}")
+def obter_membro_equipe(membro_id: int,
+                        usuario: Usuario = Depends(get_current_user),
+                        db: Session = Depends(get_db)):
+    membro = db.query(MembroEquipe).filter(MembroEquipe.id == membro_id).first()
+    
+    if not membro:
+        raise HTTPException(status_code=404, detail="Membro não encontrado")
+    
+    return {
+        "id": membro.id,
+        "nome": membro.nome,
+        "email": membro.email,
+        "telefone": membro.telefone,
+        "cargo": membro.cargo,
+        "especialidades": json.loads(membro.especialidades) if membro.especialidades else [],
+        "foto_url": membro.foto_url,
+        "data_admissao": membro.data_admissao.isoformat() if membro.data_admissao else None,
+        "horario_trabalho": json.loads(membro.horario_trabalho) if membro.horario_trabalho else None,
+        "cor_agenda": membro.cor_agenda,
+        "observacoes": membro.observacoes,
+        "ativo": membro.ativo
+    }
+
+
+@router.post("/membros-equipe")
+def criar_membro_equipe(dados: dict,
+                        usuario: Usuario = Depends(get_current_user),
+                        db: Session = Depends(get_db)):
+    especialidades = dados.get("especialidades", [])
+    if isinstance(especialidades, list):
+        especialidades = json.dumps(especialidades)
+    
+    horario_trabalho = dados.get("horario_trabalho")
+    if horario_trabalho and isinstance(horario_trabalho, dict):
+        horario_trabalho = json.dumps(horario_trabalho)
+    
+    data_admissao = None
+    if dados.get("data_admissao"):
+        try:
+            data_admissao = datetime.fromisoformat(dados["data_admissao"].replace("Z", ""))
+        except:
+            data_admissao = datetime.utcnow()
+    else:
+        data_admissao = datetime.utcnow()
+    
+    membro = MembroEquipe(
+        nome=dados.get("nome"),
+        email=dados.get("email"),
+        telefone=dados.get("telefone"),
+        cargo=dados.get("cargo"),
+        especialidades=especialidades,
+        foto_url=dados.get("foto_url"),
+        data_admissao=data_admissao,
+        horario_trabalho=horario_trabalho,
+        cor_agenda=dados.get("cor_agenda", "#123058"),
+        observacoes=dados.get("observacoes"),
+        unidade_id=usuario.unidade_id or 1,
+        ativo=True
+    )
+    
+    db.add(membro)
+    db.commit()
+    db.refresh(membro)
+    
+    return {
+        "mensagem": "Membro da equipe criado com sucesso!",
+        "id": membro.id,
+        "membro": {
+            "id": membro.id,
+            "nome": membro.nome,
+            "email": membro.email,
+            "cargo": membro.cargo
+        }
+    }
+
+
+@router.put("/membros-equipe/{membro_id}")
+def atualizar_membro_equipe(membro_id: int,
+                            dados: dict,
+                            usuario: Usuario = Depends(get_current_user),
+                            db: Session = Depends(get_db)):
+    membro = db.query(MembroEquipe).filter(MembroEquipe.id == membro_id).first()
+    
+    if not membro:
+        raise HTTPException(status_code=404, detail="Membro não encontrado")
+    
+    if "nome" in dados:
+        membro.nome = dados["nome"]
+    if "email" in dados:
+        membro.email = dados["email"]
+    if "telefone" in dados:
+        membro.telefone = dados["telefone"]
+    if "cargo" in dados:
+        membro.cargo = dados["cargo"]
+    if "especialidades" in dados:
+        esp = dados["especialidades"]
+        membro.especialidades = json.dumps(esp) if isinstance(esp, list) else esp
+    if "foto_url" in dados:
+        membro.foto_url = dados["foto_url"]
+    if "data_admissao" in dados:
+        try:
+            membro.data_admissao = datetime.fromisoformat(dados["data_admissao"].replace("Z", ""))
+        except:
+            pass
+    if "horario_trabalho" in dados:
+        ht = dados["horario_trabalho"]
+        membro.horario_trabalho = json.dumps(ht) if isinstance(ht, dict) else ht
+    if "cor_agenda" in dados:
+        membro.cor_agenda = dados["cor_agenda"]
+    if "observacoes" in dados:
+        membro.observacoes = dados["observacoes"]
+    if "ativo" in dados:
+        membro.ativo = dados["ativo"]
+    
+    membro.updated_at = datetime.utcnow()
+    db.commit()
+    
+    return {"mensagem": "Membro atualizado com sucesso!", "id": membro.id}
+
+
+@router.delete("/membros-equipe/{membro_id}")
+def excluir_membro_equipe(membro_id: int,
+                          usuario: Usuario = Depends(get_current_user),
+                          db: Session = Depends(get_db)):
+    membro = db.query(MembroEquipe).filter(MembroEquipe.id == membro_id).first()
+    
+    if not membro:
+        raise HTTPException(status_code=404, detail="Membro não encontrado")
+    
+    membro.ativo = False
+    membro.updated_at = datetime.utcnow()
+    db.commit()
+    
+    return {"mensagem": "Membro desativado com sucesso!"}
+
+
+@router.get("/membros-equipe/cargos/lista")
+def listar_cargos_equipe(usuario: Usuario = Depends(get_current_user)):
+    return {
+        "cargos": [
+            {"id": "instrutor", "nome": "Instrutor", "descricao": "Conduz aulas e treinos em grupo"},
+            {"id": "personal", "nome": "Personal Trainer", "descricao": "Treinos individuais personalizados"},
+            {"id": "recepcionista", "nome": "Recepcionista", "descricao": "Atendimento e recepção"},
+            {"id": "gerente", "nome": "Gerente", "descricao": "Gestão geral da unidade"},
+            {"id": "coordenador", "nome": "Coordenador", "descricao": "Coordenação de equipes e atividades"},
+            {"id": "nutricionista", "nome": "Nutricionista", "descricao": "Orientação nutricional"},
+            {"id": "fisioterapeuta", "nome": "Fisioterapeuta", "descricao": "Reabilitação e prevenção"},
+            {"id": "avaliador", "nome": "Avaliador Físico", "descricao": "Avaliações físicas e prescrição"},
+            {"id": "administrativo", "nome": "Administrativo", "descricao": "Suporte administrativo"},
+            {"id": "manutencao", "nome": "Manutenção", "descricao": "Manutenção de equipamentos e instalações"}
+        ]
+    }
@@ -0,0 +1,563 @@
+"""
+Endpoints de agendas e calendário
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, joinedload
+from datetime import datetime, timedelta
+from typing import Optional
+
+from vivio.auth import get_current_user
+from vivio.database import get_db
+from vivio.exportacao import gerar_csv_streaming
+from vivio.models import Agenda, EventoAula, EventoCalendario, MembroEquipe, ReservaAula, Usuario
+
+router = APIRouter()
+
+
+# ============================================================
+# Endpoints de Agendas
+# ============================================================
+
+
+@router.get("/agendas/historico")
+def listar_agendas(usuario: Usuario = Depends(get_current_user),
+                   db: Session = Depends(get_db)):
+    agendas = db.query(Agenda).filter(
+        Agenda.usuario_id == usuario.id).order_by(
+            Agenda.data.desc()).limit(30).all()
+
+    return [{
+        "id": a.id,
+        "titulo": a.titulo,
+        "descricao": a.descricao,
+        "data": a.data.isoformat(),
+        "concluida": a.concluida,
+        "tipo_atividade": a.tipo_atividade,
+        "duracao_minutos": a.duracao_minutos
+    } for a in agendas]
+
+
+@router.post("/agendas/criar")
+def criar_agenda(titulo: str,
+                 descricao: str,
+                 tipo_atividade: str,
+                 duracao_minutos: int,
+                 usuario: Usuario = Depends(get_current_user),
+                 db: Session = Depends(get_db)):
+    agenda = Agenda(usuario_id=usuario.id,
+                    titulo=titulo,
+                    descricao=descricao,
+                    tipo_atividade=tipo_atividade,
+                    duracao_minutos=duracao_minutos)
+    db.add(agenda)
+    db.commit()
+    db.refresh(agenda)
+
+    return {"mensagem": "Agenda criada com sucesso!", "id": agenda.id}
+
+
+@router.put("/agendas/{agenda_id}/concluir")
+def concluir_agenda(agenda_id: int,
+                    usuario: Usuario = Depends(get_current_user),
+                    db: Session = Depends(get_db)):
+    agenda = db.query(Agenda).filter(Agenda.id == agenda_id,
+                                     Agenda.usuario_id == usuario.id).first()
+    if not agenda:
+        raise HTTPException(status_code=404, detail="Agenda não encontrada")
+
+    agenda.concluida = True
+    db.commit()
+
+    return {"mensagem": "Agenda concluída!"}
+
+
+# ============================================================
+# Endpoints de Calendário (Agenda da Unidade e Pessoal)
+# ============================================================
+
+@router.get("/unidades/{unidade_id}/membros_equipe")
+def get_membros_equipe(unidade_id: int, db: Session = Depends(get_db)):
+    """
+    Retorna a lista de membros da equipe (instrutores/gestores) de uma unidade
+    no formato esperado pelo FullCalendar (Resources).
+    """
+    membros = db.query(Usuario).filter(
+        Usuario.unidade_id == unidade_id,
+        Usuario.tipo.in_(["instrutor", "admin", "gestor"])
+    ).all()
+    
+    return [{
+        "id": str(m.id),
+        "title": m.nome,
+        "extendedProps": {
+            "tipo": m.tipo,
+            "email": m.email
+        }
+    } for m in membros]
+
+@router.get("/calendario/unidade/{unidade_id}")
+def get_calendario_unidade(
+    unidade_id: int,
+    data_inicio: str = None,
+    data_fim: str = None,
+    db: Session = Depends(get_db),
+    usuario: Usuario = Depends(get_current_user)
+):
+    # Instrutor, membro da equipe e sala vêm no mesmo SELECT (LEFT OUTER JOIN)
+    # e as reservas do contador reservas_ativas: o número de consultas não
+    # cresce com a quantidade de aulas no período
+    query = db.query(EventoAula).options(
+        joinedload(EventoAula.instrutor),
+        joinedload(EventoAula.membro_equipe),
+        joinedload(EventoAula.sala)
+    ).filter(
+        EventoAula.unidade_id == unidade_id,
+        EventoAula.ativa == True
+    )
+    
+    if data_inicio:
+        try:
+            dt_inicio = datetime.fromisoformat(data_inicio.replace('Z', '+00:00'))
+            query = query.filter(EventoAula.data_hora >= dt_inicio)
+        except:
+            pass
+    
+    if data_fim:
+        try:
+            dt_fim = datetime.fromisoformat(data_fim.replace('Z', '+00:00'))
+            if 'T' not in data_fim:
+                dt_fim = dt_fim.replace(hour=23, minute=59, second=59)
+            query = query.filter(EventoAula.data_hora <= dt_fim)
+        except:
+            pass
+    
+    aulas = query.all()
+
+    eventos_unidade = []
+    for aula in aulas:
+        instrutor_nome = "N/A"
+        if aula.membro_equipe_id:
+            if aula.membro_equipe:
+                instrutor_nome = aula.membro_equipe.nome
+        elif aula.instrutor:
+            instrutor_nome = aula.instrutor.nome
+            
+        eventos_unidade.append({
+            "id": aula.id,
+            "title": aula.nome_aula,
+            "start": aula.data_hora.isoformat() if aula.data_hora else None,
+            "end": (aula.data_hora + timedelta(minutes=aula.duracao_minutos)).isoformat() if aula.data_hora else None,
+            "resourceId": str(aula.membro_equipe_id or aula.instrutor_id) if (aula.membro_equipe_id or aula.instrutor_id) else None,
+            "extendedProps": {
+                "instrutor": instrutor_nome,
+                "membro_equipe_id": aula.membro_equipe_id,
+                "sala": aula.sala_nome or (aula.sala.nome if aula.sala else "N/A"),
+                "modo": aula.modo,
+                "reservas": aula.reservas_ativas,
+                "limite": aula.limite_inscricoes
+            },
+            "color": aula.cor or "#62b1ca"
+        })
+    
+    return eventos_unidade
+
+
+@router.get("/calendario/pessoal")
+def get_calendario_pessoal(
+    data_inicio: str = None,
+    data_fim: str = None,
+    db: Session = Depends(get_db),
+    gestor: Usuario = Depends(get_current_user)
+):
+    dt_inicio = None
+    dt_fim = None
+    
+    if data_inicio:
+        try:
+            dt_inicio = datetime.fromisoformat(data_inicio.replace('Z', '+00:00'))
+        except:
+            pass
+    
+    if data_fim:
+        try:
+            dt_fim = datetime.fromisoformat(data_fim.replace('Z', '+00:00'))
+            if 'T' not in data_fim:
+                dt_fim = dt_fim.replace(hour=23, minute=59, second=59)
+        except:
+            pass
+    
+    query_pessoal = db.query(EventoCalendario).filter(
+        EventoCalendario.usuario_id == gestor.id
+    )
+    if dt_inicio:
+        query_pessoal = query_pessoal.filter(EventoCalendario.data_inicio >= dt_inicio)
+    if dt_fim:
+        query_pessoal = query_pessoal.filter(EventoCalendario.data_inicio <= dt_fim)
+    
+    eventos_pessoais = query_pessoal.all()
+
+    eventos = []
+    for ev in eventos_pessoais:
+        eventos.append({
+            "id": ev.id,
+            "title": ev.titulo,
+            "start": ev.data_inicio.isoformat() if ev.data_inicio else None,
+            "end": ev.data_fim.isoformat() if ev.data_fim else None,
+            "color": ev.cor
+        })
+
+    reservas = db.query(ReservaAula).filter(
+        ReservaAula.usuario_id == gestor.id,
+        ReservaAula.cancelada == False
+    ).all()
+
+    for res in reservas:
+        aula = res.evento_aula
+        if aula:
+            eventos.append({
+                "id": aula.id,
+                "title": f"RESERVADO: {aula.nome_aula}",
+                "start": aula.data_hora.isoformat() if aula.data_hora else None,
+                "end": (aula.data_hora + timedelta(minutes=aula.duracao_minutos)).isoformat() if aula.data_hora else None,
+                "color": "#123058"
+            })
+    
+    membro_equipe = db.query(MembroEquipe).filter(
+        MembroEquipe.email == gestor.email
+    ).first()
+    
+    if membro_equipe:
+        aulas_atribuidas = db.query(EventoAula).filter(
+            EventoAula.membro_equipe_id == membro_equipe.id,
+            EventoAula.ativa == True
+        ).all()
+        
+        for aula in aulas_atribuidas:
+            hora_fim = aula.data_hora + timedelta(minutes=aula.duracao_minutos) if aula.data_hora else None
+            eventos.append({
+                "id": f"aula_{aula.id}",
+                "title": f"AULA: {aula.nome_aula}",
+                "start": aula.data_hora.isoformat() if aula.data_hora else None,
+                "end": hora_fim.isoformat() if hora_fim else None,
+                "color": aula.cor or membro_equipe.cor_agenda or "#667eea",
+                "extendedProps": {
+                    "tipo": "aula_atribuida",
+                    "sala": aula.sala_nome or (aula.sala.nome if aula.sala else "N/A"),
+                    "modo": aula.modo,
+                    "reservas": aula.reservas_ativas,
+                    "limite": aula.limite_inscricoes
+                }
+            })
+    
+    aulas_instrutor = db.query(EventoAula).filter(
+        EventoAula.instrutor_id == gestor.id,
+        EventoAula.ativa == True
+    ).all()
+    
+    ids_existentes = set(e.get("id") for e in eventos)
+    for aula in aulas_instrutor:
+        aula_id = f"instrutor_{aula.id}"
+        if aula_id not in ids_existentes:
+            hora_fim = aula.data_hora + timedelta(minutes=aula.duracao_minutos) if aula.data_hora else None
+            eventos.append({
+                "id": aula_id,
+                "title": f"INSTRUTOR: {aula.nome_aula}",
+                "start": aula.data_hora.isoformat() if aula.data_hora else None,
+                "end": hora_fim.isoformat() if hora_fim else None,
+                "color": "#62b1ca",
+                "extendedProps": {
+                    "tipo": "aula_instrutor",
+                    "sala": aula.sala_nome or (aula.sala.nome if aula.sala else "N/A")
+                }
+            })
+            
+    return eventos
+
+
+@router.get("/calendario/membro/{membro_id}")
+def get_calendario_membro(
+    membro_id: int,
+    db: Session = Depends(get_db),
+    usuario: Usuario = Depends(get_current_user)
+):
+    """
+    Retorna eventos do calendário pessoal de um membro da equipe
+    """
+    membro = db.query(MembroEquipe).filter(MembroEquipe.id == membro_id).first()
+    if not membro:
+        raise HTTPException(status_code=404, detail="Membro não encontrado")
+    
+    aulas = db.query(EventoAula).filter(
+        EventoAula.membro_equipe_id == membro_id,
+        EventoAula.ativa == True
+    ).all()
+    
+    eventos = []
+    for aula in aulas:
+        hora_fim = aula.data_hora + timedelta(minutes=aula.duracao_minutos) if aula.data_hora else None
+        eventos.append({
+            "id": aula.id,
+            "title": aula.nome_aula,
+            "start": aula.data_hora.isoformat() if aula.data_hora else None,
+            "end": hora_fim.isoformat() if hora_fim else None,
+            "color": aula.cor or membro.cor_agenda or "#123058",
+            "extendedProps": {
+                "tipo": "aula",
+                "instrutor": membro.nome,
+                "instrutor_id": membro.id,
+                "sala": aula.sala_nome or (aula.sala.nome if aula.sala else "N/A"),
+                "modo": aula.modo,
+                "reservas": aula.reservas_ativas,
+                "limite": aula.limite_inscricoes
+            }
+        })
+    
+    return eventos
+
+
+@router.get("/calendario/aulas-unidade")
+def get_calendario_aulas_unidade(
+    data_inicio: str = None,
+    data_fim: str = None,
+    db: Session = Depends(get_db),
+    usuario: Usuario = Depends(get_current_user)
+):
+    """
+    Retorna todas as aulas da unidade para exibição em Aulas em Andamento
+    """
+    query = db.query(EventoAula).filter(EventoAula.ativa == True)
+    
+    if usuario.unidade_id:
+        query = query.filter(EventoAula.unidade_id == usuario.unidade_id)
+    
+    if data_inicio:
+        try:
+            dt_inicio = datetime.fromisoformat(data_inicio.replace('Z', '+00:00'))
+            query = query.filter(EventoAula.data_hora >= dt_inicio)
+        except:
+            pass
+    
+    if data_fim:
+        try:
+            dt_fim = datetime.fromisoformat(data_fim.replace('Z', '+00:00'))
+            query = query.filter(EventoAula.data_hora <= dt_fim)
+        except:
+            pass
+    
+    aulas = query.order_by(EventoAula.data_hora).all()
+    
+    eventos = []
+    for aula in aulas:
+        hora_fim = aula.data_hora + timedelta(minutes=aula.duracao_minutos) if aula.data_hora else None
+        
+        instrutor_nome = "N/A"
+        instrutor_cor = "#123058"
+        if aula.membro_equipe:
+            instrutor_nome = aula.membro_equipe.nome
+            instrutor_cor = aula.membro_equipe.cor_agenda or "#123058"
+        elif aula.instrutor:
+            instrutor_nome = aula.instrutor.nome
+        
+        eventos.append({
+            "id": aula.id,
+            "title": aula.nome_aula,
+            "start": aula.data_hora.isoformat() if aula.data_hora else None,
+            "end": hora_fim.isoformat() if hora_fim else None,
+            "color": aula.cor or instrutor_cor,
+            "extendedProps": {
+                "tipo": "aula",
+                "instrutor": instrutor_nome,
+                "membro_equipe_id": aula.membro_equipe_id,
+                "sala": aula.sala_nome or (aula.sala.nome if aula.sala else "N/A"),
+                "modo": aula.modo,
+                "reservas": aula.reservas_ativas,
+                "limite": aula.limite_inscricoes,
+                "requer_reserva": aula.requer_reserva,
+                "recorrente": aula.recorrente
+            }
+        })
+    
+    return eventos
+
+
+# ============================================================
+# Endpoints de Calendário
+# ============================================================
+
+
+@router.post("/calendario/eventos/criar")
+def criar_evento_calendario(titulo: str,
+                            descricao: str,
+                            data_inicio: str,
+                            data_fim: str,
+                            tipo_evento: str,
+                            lembrete: bool = False,
+                            usuario: Usuario = Depends(get_current_user),
+                            db: Session = Depends(get_db)):
+    evento = EventoCalendario(usuario_id=usuario.id,
+                              titulo=titulo,
+                              descricao=descricao,
+                              data_inicio=datetime.fromisoformat(data_inicio),
+                              data_fim=datetime.fromisoformat(data_fim),
+                              tipo_evento=tipo_evento,
+                              lembrete=lembrete)
+    db.add(evento)
+    db.commit()
+    return {"mensagem": "Evento criado com sucesso!", "id": evento.id}
+
+
+@router.get("/calendario/eventos")
+def listar_eventos_calendario(data_inicio: Optional[str] = None,
+                              data_fim: Optional[str] = None,
+                              tipo_evento: Optional[str] = None,
+                              usuario: Usuario = Depends(get_current_user),
+                              db: Session = Depends(get_db)):
+    query = db.query(EventoCalendario).filter(
+        EventoCalendario.usuario_id == usuario.id)
+
+    if data_inicio:
+        query = query.filter(EventoCalendario.data_inicio >=
+                             datetime.fromisoformat(data_inicio))
+    if data_fim:
+        query = query.filter(
+            EventoCalendario.data_fim <= datetime.fromisoformat(data_fim))
+    if tipo_evento:
+        query = query.filter(EventoCalendario.tipo_evento == tipo_evento)
+
+    eventos = query.order_by(EventoCalendario.data_inicio).all()
+
+    return [{
+        "id": e.id,
+        "titulo": e.titulo,
+        "descricao": e.descricao,
+        "data_inicio": e.data_inicio.isoformat() if e.data_inicio else None,
+        "data_fim": e.data_fim.isoformat() if e.data_fim else None,
+        "tipo_evento": e.tipo_evento,
+        "status": e.status,
+        "lembrete": e.lembrete,
+        "cor": e.cor
+    } for e in eventos]
+
+
+@router.put("/calendario/eventos/{evento_id}")
+def atualizar_evento_calendario(evento_id: int,
+                                titulo: str = None,
+                                descricao: str = None,
+                                data_inicio: str = None,
+                                data_fim: str = None,
+                                tipo_evento: str = None,
+                                lembrete: bool = None,
+                                cor: str = None,
+                                usuario: Usuario = Depends(get_current_user),
+                                db: Session = Depends(get_db)):
+    evento = db.query(EventoCalendario).filter(
+        EventoCalendario.id == evento_id,
+        EventoCalendario.usuario_id == usuario.id).first()
+
+    if not evento:
+        raise HTTPException(status_code=404, detail="Evento não encontrado")
+
+    if titulo is not None:
+        evento.titulo = titulo
+    if descricao is not None:
+        evento.descricao = descricao
+    if data_inicio is not None:
+        evento.data_inicio = datetime.fromisoformat(data_inicio)
+    if data_fim is not None:
+        evento.data_fim = datetime.fromisoformat(data_fim)
+    if tipo_evento is not None:
+        evento.tipo_evento = tipo_evento
+    if lembrete is not None:
+        evento.lembrete = lembrete
+    if cor is not None:
+        evento.cor = cor
+
+    db.commit()
+    return {
+        "mensagem": "Evento atualizado com sucesso!",
+        "id": evento.id,
+        "titulo": evento.titulo,
+        "descricao": evento.descricao,
+        "data_inicio": evento.data_inicio.isoformat() if evento.data_inicio else None,
+        "data_fim": evento.data_fim.isoformat() if evento.data_fim else None,
+        "tipo_evento": evento.tipo_evento,
+        "status": evento.status,
+        "lembrete": evento.lembrete,
+        "cor": evento.cor
+    }
+
+
+@router.put("/calendario/eventos/{evento_id}/marcar-cumprida")
+def marcar_evento_cumprida(evento_id: int,
+                           usuario: Usuario = Depends(get_current_user),
+                           db: Session = Depends(get_db)):
+    evento = db.query(EventoCalendario).filter(
+        EventoCalendario.id == evento_id,
+        EventoCalendario.usuario_id == usuario.id).first()
+
+    if not evento:
+        raise HTTPException(status_code=404, detail="Evento não encontrado")
+
+    evento.status = "cumprida"
+    db.commit()
+    return {"mensagem": "Evento marcado como cumprido!"}
+
+
+@router.delete("/calendario/eventos/{evento_id}")
+def deletar_evento_calendario(evento_id: int,
+                              usuario: Usuario = Depends(get_current_user),
+                              db: Session = Depends(get_db)):
+    evento = db.query(EventoCalendario).filter(
+        EventoCalendario.id == evento_id,
+        EventoCalendario.usuario_id == usuario.id).first()
+
+    if not evento:
+        raise HTTPException(status_code=404, detail="Evento não encontrado")
+
+    db.delete(evento)
+    db.commit()
+    return {"mensagem": "Evento deletado com sucesso!"}
+
+
+@router.get("/calendario/exportar-csv")
+def exportar_calendario_csv(data_inicio: str,
+                            data_fim: str,
+                            usuario: Usuario = Depends(get_current_user)):
+    """
+    Exporta eventos do calendário em CSV
+    """
+    usuario_id = usuario.id
+    inicio = datetime.fromisoformat(data_inicio)
+    fim = datetime.fromisoformat(data_fim)
+
+    def consulta(db: Session):
+        return db.query(
+            EventoCalendario.id, EventoCalendario.titulo,
+            EventoCalendario.descricao, EventoCalendario.data_inicio,
+            EventoCalendario.data_fim, EventoCalendario.tipo_evento,
+            EventoCalendario.status
+        ).filter(
+            EventoCalendario.usuario_id == usuario_id,
+            EventoCalendario.data_inicio >= inicio,
+            EventoCalendario.data_fim <= fim
+        ).order_by(EventoCalendario.data_inicio, EventoCalendario.id)
+
+    def formatar(e):
+        return [
+            e.id, e.titulo, e.descricao,
+            e.data_inicio.isoformat() if e.data_inicio else '',
+            e.data_fim.isoformat() if e.data_fim else '', e.tipo_evento,
+            e.status
+        ]
+
+    return StreamingResponse(
+        gerar_csv_streaming([
+            'ID', 'Título', 'Descrição', 'Data Início', 'Data Fim', 'Tipo',
+            'Status'
+        ], consulta, formatar),
+        media_type="text/csv; charset=utf-8",
+        headers={
+            "Content-Disposition":
+            f"attachment; filename=calendario_{data_inicio}_{data_fim}.csv"
+        })
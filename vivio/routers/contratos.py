@@ -0,0 +1,158 @@
+"""
+Endpoints de contratos B2B
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+
+from vivio.auth import get_admin_user, get_current_user
+from vivio.database import get_db
+from vivio.eventos import registrar_evento
+from vivio.models import Contrato, Usuario
+from vivio.schemas import ContratoCreate, ContratoResponse, ContratoUpdate
+
+router = APIRouter()
+
+
+# ============================================================
+# Endpoints - Contratos B2B
+# ============================================================
+
+
+@router.get("/contratos")
+def listar_contratos(usuario: Usuario = Depends(get_current_user),
+                     db: Session = Depends(get_db)):
+    """Lista todos os contratos da unidade"""
+    contratos = db.query(Contrato).filter(
+        Contrato.unidade_id == usuario.unidade_id).order_by(
+            Contrato.data_inicio.desc()).all()
+    
+    return [ContratoResponse.from_orm(c) for c in contratos]
+
+
+@router.post("/contratos", response_model=ContratoResponse)
+def criar_contrato(dados: ContratoCreate,
+                   usuario: Usuario = Depends(get_admin_user),
+                   db: Session = Depends(get_db)):
+    """Cria um novo contrato (admin only)"""
+    contrato = Contrato(**dados.dict())
+    db.add(contrato)
+    db.commit()
+    db.refresh(contrato)
+    
+    registrar_evento(db, "CONTRATO_CRIADO", {
+        "contrato_id": contrato.id,
+        "unidade_id": contrato.unidade_id,
+        "valor_mensal": contrato.valor_mensal
+    })
+    
+    return contrato
+
+
+@router.get("/contratos/{contrato_id}", response_model=ContratoResponse)
+def obter_contrato(contrato_id: int,
+                   usuario: Usuario = Depends(get_current_user),
+                   db: Session = Depends(get_db)):
+    """Obtém detalhes de um contrato específico"""
+    contrato = db.query(Contrato).filter(
+        Contrato.id == contrato_id,
+        Contrato.unidade_id == usuario.unidade_id).first()
+    
+    if not contrato:
+        raise HTTPException(status_code=404, detail="Contrato não encontrado")
+    
+    return contrato
+
+
+@router.put("/contratos/{contrato_id}", response_model=ContratoResponse)
+def atualizar_contrato(contrato_id: int,
+                       dados: ContratoUpdate,
+                       usuario: Usuario = Depends(get_admin_user),
+                       db: Session = Depends(get_db)):
+    """Atualiza um contrato existente"""
+    contrato = db.query(Contrato).filter(
+        Contrato.id == contrato_id,
+        Contrato.unidade_id == usuario.unidade_id).first()
+    
+    if not contrato:
+        raise HTTPException(status_code=404, detail="Contrato não encontrado")
+    
+    for key, value in dados.dict(exclude_unset=True).items():
+        setattr(contrato, key, value)
+    
+    db.commit()
+    db.refresh(contrato)
+    
+    return contrato
+
+
+@router.delete("/contratos/{contrato_id}")
+def deletar_contrato(contrato_id: int,
+                     usuario: Usuario = Depends(get_admin_user),
+                     db: Session = Depends(get_db)):
+    """Deleta um contrato"""
+    contrato = db.query(Contrato).filter(
+        Contrato.id == contrato_id,
+        Contrato.unidade_id == usuario.unidade_id).first()
+    
+    if not contrato:
+        raise HTTPException(status_code=404, detail="Contrato não encontrado")
+    
+    db.delete(contrato)
+    db.commit()
+    
+    return {"mensagem": "Contrato deletado com sucesso"}
+
+
+@router.post("/contratos/{contrato_id}/renovar", response_model=ContratoResponse)
+def renovar_contrato(contrato_id: int,
+                     meses: int = 12,
+                     usuario: Usuario = Depends(get_admin_user),
+                     db: Session = Depends(get_db)):
+    """Renova um contrato existente"""
+    contrato = db.query(Contrato).filter(
+        Contrato.id == contrato_id,
+        Contrato.unidade_id == usuario.unidade_id).first()
+    
+    if not contrato:
+        raise HTTPException(status_code=404, detail="Contrato não encontrado")
+    
+    contrato.data_fim = contrato.data_fim + timedelta(days=30 * meses)
+    contrato.status = "ativo"
+    
+    db.commit()
+    db.refresh(contrato)
+    
+    registrar_evento(db, "CONTRATO_RENOVADO", {
+        "contrato_id": contrato.id,
+        "unidade_id": contrato.unidade_id,
+        "nova_data_fim": contrato.data_fim.isoformat()
+    })
+    
+    return contrato
+
+
+@router.get("/contratos/expirados/lista")
+def listar_contratos_expirados(usuario: Usuario = Depends(get_admin_user),
+                                db: Session = Depends(get_db)):
+    """Lista contratos que estão expirando em até 30 dias"""
+    hoje = datetime.utcnow()
+    limite = hoje + timedelta(days=30)
+    
+    contratos = db.query(Contrato).filter(
+        Contrato.unidade_id == usuario.unidade_id,
+        Contrato.data_fim <= limite,
+        Contrato.data_fim >= hoje,
+        Contrato.status == "ativo"
+    ).all()
+    
+    resultado = []
+    for c in contratos:
+        dias_restantes = (c.data_fim - hoje).days
+        resultado.append({
+            **ContratoResponse.from_orm(c).dict(),
+            "dias_restantes": dias_restantes,
+            "status_alerta": "critico" if dias_restantes <= 15 else "atencao"
+        })
+    
+    return resultado
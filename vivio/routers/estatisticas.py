@@ -0,0 +1,190 @@
+"""
+Endpoints de estatísticas do painel (com cache)
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import case, event, func
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import Session
+import threading
+import time
+
+from vivio.auth import UsuarioAutenticado, get_current_user, get_usuario_autenticado
+from vivio.config import STATS_CACHE_TTL
+from vivio.database import SessionLocal, get_db, valores_atributo
+from vivio.models import MetricaEngajamento, Programa, Unidade, Usuario, Visitante
+
+router = APIRouter()
+
+
+# ============================================================
+# Endpoints de Estatísticas
+# ============================================================
+
+
+# Cache das estatísticas: (nome, unidade_id) -> (expira_em, valor).
+# unidade_id None indica estatística global (todas as unidades)
+_cache_stats = {}
+_cache_stats_lock = threading.Lock()
+
+
+def obter_stats_cache(chave: tuple, calcular):
+    agora = time.monotonic()
+    with _cache_stats_lock:
+        em_cache = _cache_stats.get(chave)
+        if em_cache and em_cache[0] > agora:
+            return em_cache[1]
+
+    valor = calcular()
+    if valor is not None:
+        with _cache_stats_lock:
+            _cache_stats[chave] = (agora + STATS_CACHE_TTL, valor)
+    return valor
+
+
+def invalidar_stats_cache(unidade_ids: set):
+    """Remove as estatísticas das unidades alteradas e as globais"""
+    with _cache_stats_lock:
+        for chave in list(_cache_stats):
+            if chave[1] is None or chave[1] in unidade_ids:
+                del _cache_stats[chave]
+
+
+# Colunas lidas pelas estatísticas: alterar outras (ex.: ultima_atividade a
+# cada login) não invalida o cache. Inserções e exclusões sempre invalidam
+COLUNAS_STATS = {
+    Usuario: ["unidade_id", "ativo"],
+    Visitante: ["unidade_id"],
+    Programa: ["unidade_id", "status"],
+    Unidade: ["nome", "risco_desistencia"],
+}
+
+
+def _coletar_invalidacao_stats(session, flush_context):
+    unidades = session.info.setdefault("stats_unidades", set())
+    alterados = [(obj, True) for obj in list(session.new) + list(session.deleted)]
+    alterados += [(obj, False) for obj in session.dirty]
+    for obj, sempre in alterados:
+        colunas = COLUNAS_STATS.get(type(obj))
+        if colunas is None:
+            continue
+        estado = sa_inspect(obj)
+        if not sempre and not any(estado.attrs[c].history.has_changes() for c in colunas):
+            continue
+        atributo = "id" if isinstance(obj, Unidade) else "unidade_id"
+        unidades.update(valores_atributo(obj, atributo))
+        unidades.add(None)
+
+
+def _aplicar_invalidacao_stats(session):
+    unidades = session.info.pop("stats_unidades", None)
+    if unidades:
+        invalidar_stats_cache(unidades)
+
+
+def _descartar_invalidacao_stats(session):
+    session.info.pop("stats_unidades", None)
+
+
+event.listen(SessionLocal, "after_flush", _coletar_invalidacao_stats)
+event.listen(SessionLocal, "after_commit", _aplicar_invalidacao_stats)
+event.listen(SessionLocal, "after_rollback", _descartar_invalidacao_stats)
+
+
+def calcular_stats_overview(db: Session) -> dict:
+    total_usuarios, usuarios_ativos = db.query(
+        func.count(Usuario.id),
+        func.coalesce(func.sum(case((Usuario.ativo == True, 1), else_=0)), 0)
+    ).one()
+
+    total_visitantes = db.query(func.count(Visitante.id)).scalar()
+
+    risco_medio = db.query(
+        func.coalesce(func.avg(Unidade.risco_desistencia), 0)
+    ).scalar()
+
+    programas_expirados, programas_nao_atribuidos, programas_atribuidos = db.query(
+        func.coalesce(func.sum(case((Programa.status == "expirado", 1), else_=0)), 0),
+        func.coalesce(func.sum(case((Programa.status == "não atribuído", 1), else_=0)), 0),
+        func.coalesce(func.sum(case((Programa.status == "atribuído", 1), else_=0)), 0)
+    ).one()
+
+    return {
+        "risco_desistencia": round(risco_medio, 2),
+        "usuarios_totais": total_usuarios,
+        "visitantes": total_visitantes,
+        "usuarios_ativos": usuarios_ativos,
+        "programas": {
+            "expirados":
+            programas_expirados,
+            "nao_atribuidos":
+            programas_nao_atribuidos,
+            "atribuidos":
+            programas_atribuidos,
+            "total":
+            programas_expirados + programas_nao_atribuidos +
+            programas_atribuidos
+        }
+    }
+
+
+@router.get("/stats/overview")
+def stats_overview(usuario: UsuarioAutenticado = Depends(get_usuario_autenticado),
+                   db: Session = Depends(get_db)):
+    return obter_stats_cache(("overview", None), lambda: calcular_stats_overview(db))
+
+
+@router.get("/stats/unidade/{unidade_id}")
+def stats_unidade(unidade_id: int,
+                  usuario: UsuarioAutenticado = Depends(get_usuario_autenticado),
+                  db: Session = Depends(get_db)):
+    def calcular():
+        unidade = db.query(Unidade.nome, Unidade.risco_desistencia).filter(
+            Unidade.id == unidade_id).first()
+        if not unidade:
+            return None
+
+        usuarios, usuarios_ativos = db.query(
+            func.count(Usuario.id),
+            func.coalesce(func.sum(case((Usuario.ativo == True, 1), else_=0)), 0)
+        ).filter(Usuario.unidade_id == unidade_id).one()
+
+        return {
+            "unidade": unidade.nome,
+            "risco_desistencia": unidade.risco_desistencia,
+            "usuarios": usuarios,
+            "usuarios_ativos": usuarios_ativos
+        }
+
+    resultado = obter_stats_cache(("unidade", unidade_id), calcular)
+    if resultado is None:
+        raise HTTPException(status_code=404, detail="Unidade não encontrada")
+    return resultado
+
+
+# ============================================================
+# Endpoints de Métricas IA
+# ============================================================
+
+
+@router.get("/metricas/ia")
+def metricas_ia(unidade_id: int,
+                usuario: Usuario = Depends(get_current_user),
+                db: Session = Depends(get_db)):
+    metrica = db.query(MetricaEngajamento).filter(
+        MetricaEngajamento.unidade_id == unidade_id).order_by(
+            MetricaEngajamento.data.desc()).first()
+
+    if not metrica:
+        return {
+            "engajamento": 0,
+            "roi": 0,
+            "produtividade": 0,
+            "usuarios_ativos": 0
+        }
+
+    return {
+        "engajamento": metrica.taxa_engajamento,
+        "roi": metrica.roi,
+        "produtividade": metrica.produtividade,
+        "usuarios_ativos": metrica.usuarios_ativos
+    }
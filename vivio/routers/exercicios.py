@@ -0,0 +1,296 @@
+"""
+Endpoints de exercícios
+"""
+from fastapi import APIRouter, Depends, File, HTTPException, Response, UploadFile
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Optional
+import shutil
+from pathlib import Path
+
+from vivio.auth import get_current_user
+from vivio.busca import filtro_busca_exercicios
+from vivio.config import PAGINACAO_LIMITE_PADRAO
+from vivio.database import get_db
+from vivio.models import Exercicio, Usuario
+from vivio.paginacao import listar_paginado
+from vivio.schemas import ExercicioCreate, ExercicioUpdate
+
+router = APIRouter()
+
+
+@router.post("/exercicios")
+def criar_exercicio(exercicio: ExercicioCreate,
+                    usuario: Usuario = Depends(get_current_user),
+                    db: Session = Depends(get_db)):
+    novo_exercicio = Exercicio(nome=exercicio.nome,
+                               tipo=exercicio.tipo,
+                               quem_pode_utilizar=exercicio.quem_pode_utilizar,
+                               elaborado_por=exercicio.elaborado_por,
+                               descricao=exercicio.descricao,
+                               foto_url=exercicio.foto_url,
+                               video_url=exercicio.video_url,
+                               favorito=exercicio.favorito,
+                               oculto=exercicio.oculto,
+                               unidade_id=usuario.unidade_id,
+                               criado_por_id=usuario.id)
+    db.add(novo_exercicio)
+    db.commit()
+    db.refresh(novo_exercicio)
+    return {
+        "id":
+        novo_exercicio.id,
+        "nome":
+        novo_exercicio.nome,
+        "tipo":
+        novo_exercicio.tipo,
+        "quem_pode_utilizar":
+        novo_exercicio.quem_pode_utilizar,
+        "elaborado_por":
+        novo_exercicio.elaborado_por,
+        "descricao":
+        novo_exercicio.descricao,
+        "foto_url":
+        novo_exercicio.foto_url,
+        "video_url":
+        novo_exercicio.video_url,
+        "favorito":
+        novo_exercicio.favorito,
+        "oculto":
+        novo_exercicio.oculto,
+        "data_criacao":
+        novo_exercicio.data_criacao.isoformat()
+        if novo_exercicio.data_criacao else None
+    }
+
+
+CAMPOS_EXERCICIO = {
+    "id": Exercicio.id,
+    "nome": Exercicio.nome,
+    "tipo": Exercicio.tipo,
+    "quem_pode_utilizar": Exercicio.quem_pode_utilizar,
+    "elaborado_por": Exercicio.elaborado_por,
+    "descricao": Exercicio.descricao,
+    "foto_url": Exercicio.foto_url,
+    "video_url": Exercicio.video_url,
+    "favorito": Exercicio.favorito,
+    "oculto": Exercicio.oculto,
+    "data_criacao": Exercicio.data_criacao,
+}
+
+
+@router.get("/exercicios")
+def listar_exercicios(response: Response,
+                      busca: Optional[str] = None,
+                      tipo: Optional[str] = None,
+                      favoritos: Optional[bool] = None,
+                      ocultos: Optional[bool] = False,
+                      ordenar: Optional[str] = None,
+                      cursor: Optional[str] = None,
+                      limite: int = PAGINACAO_LIMITE_PADRAO,
+                      fields: Optional[str] = None,
+                      usuario: Usuario = Depends(get_current_user),
+                      db: Session = Depends(get_db)):
+    """
+    Exercícios da unidade (e os sem unidade, compartilhados), paginados por
+    cursor (cabeçalho X-Proximo-Cursor). Com busca, ordena por relevância
+    (ordenar=nome ou recentes para mudar)
+    """
+    filtros = []
+    if usuario.unidade_id:
+        filtros.append(or_(Exercicio.unidade_id == usuario.unidade_id,
+                           Exercicio.unidade_id.is_(None)))
+
+    if not ocultos:
+        filtros.append(Exercicio.oculto == False)
+
+    ordem = None
+    if busca:
+        busca_indexada = filtro_busca_exercicios(busca)
+        if busca_indexada is None:
+            filtros.append(Exercicio.nome.ilike(f"%{busca}%"))
+        else:
+            filtro, relevancia = busca_indexada
+            filtros.append(filtro)
+            if ordenar in (None, "relevancia"):
+                ordem = [(relevancia, False), (Exercicio.id, False)]
+
+    if tipo:
+        filtros.append(Exercicio.tipo == tipo)
+
+    if favoritos is not None:
+        filtros.append(Exercicio.favorito == favoritos)
+
+    # A ordenação termina no id para o cursor ser único. data_criacao é
+    # gravada na inserção, então "recentes" equivale a id decrescente
+    if ordem is None:
+        if ordenar in (None, "nome", "relevancia"):
+            ordem = [(Exercicio.nome, False), (Exercicio.id, False)]
+        elif ordenar == "recentes":
+            ordem = [(Exercicio.id, True)]
+        else:
+            ordem = [(Exercicio.id, False)]
+
+    return listar_paginado(db, response, CAMPOS_EXERCICIO, fields, filtros, ordem, cursor, limite,
+                           ("exercicios", usuario.unidade_id, busca, tipo, favoritos, bool(ocultos)))
+
+
+@router.get("/exercicios/{exercicio_id}")
+def obter_exercicio(exercicio_id: int,
+                    usuario: Usuario = Depends(get_current_user),
+                    db: Session = Depends(get_db)):
+    exercicio = db.query(Exercicio).filter(
+        Exercicio.id == exercicio_id).first()
+    if not exercicio:
+        raise HTTPException(status_code=404, detail="Exercício não encontrado")
+
+    return {
+        "id":
+        exercicio.id,
+        "nome":
+        exercicio.nome,
+        "tipo":
+        exercicio.tipo,
+        "quem_pode_utilizar":
+        exercicio.quem_pode_utilizar,
+        "elaborado_por":
+        exercicio.elaborado_por,
+        "descricao":
+        exercicio.descricao,
+        "foto_url":
+        exercicio.foto_url,
+        "video_url":
+        exercicio.video_url,
+        "favorito":
+        exercicio.favorito,
+        "oculto":
+        exercicio.oculto,
+        "data_criacao":
+        exercicio.data_criacao.isoformat() if exercicio.data_criacao else None,
+        "data_atualizacao":
+        exercicio.data_atualizacao.isoformat()
+        if exercicio.data_atualizacao else None
+    }
+
+
+@router.put("/exercicios/{exercicio_id}")
+def atualizar_exercicio(exercicio_id: int,
+                        dados: ExercicioUpdate,
+                        usuario: Usuario = Depends(get_current_user),
+                        db: Session = Depends(get_db)):
+    exercicio = db.query(Exercicio).filter(
+        Exercicio.id == exercicio_id).first()
+    if not exercicio:
+        raise HTTPException(status_code=404, detail="Exercício não encontrado")
+
+    if dados.nome is not None:
+        exercicio.nome = dados.nome
+    if dados.tipo is not None:
+        exercicio.tipo = dados.tipo
+    if dados.quem_pode_utilizar is not None:
+        exercicio.quem_pode_utilizar = dados.quem_pode_utilizar
+    if dados.elaborado_por is not None:
+        exercicio.elaborado_por = dados.elaborado_por
+    if dados.descricao is not None:
+        exercicio.descricao = dados.descricao
+    if dados.foto_url is not None:
+        exercicio.foto_url = dados.foto_url
+    if dados.video_url is not None:
+        exercicio.video_url = dados.video_url
+    if dados.favorito is not None:
+        exercicio.favorito = dados.favorito
+    if dados.oculto is not None:
+        exercicio.oculto = dados.oculto
+
+    exercicio.data_atualizacao = datetime.utcnow()
+    db.commit()
+    db.refresh(exercicio)
+
+    return {
+        "id": exercicio.id,
+        "nome": exercicio.nome,
+        "tipo": exercicio.tipo,
+        "favorito": exercicio.favorito,
+        "oculto": exercicio.oculto
+    }
+
+
+@router.delete("/exercicios/{exercicio_id}")
+def deletar_exercicio(exercicio_id: int,
+                      usuario: Usuario = Depends(get_current_user),
+                      db: Session = Depends(get_db)):
+    exercicio = db.query(Exercicio).filter(
+        Exercicio.id == exercicio_id).first()
+    if not exercicio:
+        raise HTTPException(status_code=404, detail="Exercício não encontrado")
+
+    db.delete(exercicio)
+    db.commit()
+    return {"mensagem": "Exercício excluído com sucesso"}
+
+# Criar diretórios para uploads se não existirem
+UPLOAD_DIR = Path("static/uploads")
+EXERCICIOS_FOTOS_DIR = UPLOAD_DIR / "exercicios" / "fotos"
+EXERCICIOS_VIDEOS_DIR = UPLOAD_DIR / "exercicios" / "videos"
+EXERCICIOS_FOTOS_DIR.mkdir(parents=True, exist_ok=True)
+EXERCICIOS_VIDEOS_DIR.mkdir(parents=True, exist_ok=True)
+
+
+@router.post("/exercicios/upload-foto")
+async def upload_foto_exercicio(file: UploadFile = File(...),
+                                usuario: Usuario = Depends(get_current_user)):
+    # Validar tipo de arquivo
+    allowed_types = ["image/jpeg", "image/jpg", "image/png"]
+    if file.content_type not in allowed_types:
+        raise HTTPException(
+            status_code=400,
+            detail="Formato não permitido. Use JPG, JPEG ou PNG")
+
+    # Gerar nome único do arquivo
+    file_extension = file.filename.split(".")[-1]
+    unique_filename = f"{datetime.utcnow().timestamp()}_{usuario.id}.{file_extension}"
+    file_path = EXERCICIOS_FOTOS_DIR / unique_filename
+
+    # Salvar arquivo
+    with file_path.open("wb") as buffer:
+        shutil.copyfileobj(file.file, buffer)
+
+    # Retornar URL relativa
+    relative_url = f"/static/uploads/exercicios/fotos/{unique_filename}"
+    return {"foto_url": relative_url, "mensagem": "Foto enviada com sucesso"}
+
+
+@router.post("/exercicios/upload-video")
+async def upload_video_exercicio(file: UploadFile = File(...),
+                                 usuario: Usuario = Depends(get_current_user)):
+    # Validar tipo de arquivo
+    allowed_types = ["video/mp4", "video/webm", "video/quicktime"]
+    if file.content_type not in allowed_types:
+        raise HTTPException(
+            status_code=400,
+            detail="Formato não permitido. Use MP4, WEBM ou MOV")
+
+    # Validar tamanho (40 MB máximo)
+    max_size = 40 * 1024 * 1024  # 40 MB em bytes
+    file.file.seek(0, 2)  # Ir para o final do arquivo
+    file_size = file.file.tell()
+    file.file.seek(0)  # Voltar para o início
+
+    if file_size > max_size:
+        raise HTTPException(
+            status_code=400,
+            detail="Arquivo muito grande. Tamanho máximo: 40 MB")
+
+    # Gerar nome único do arquivo
+    file_extension = file.filename.split(".")[-1]
+    unique_filename = f"{datetime.utcnow().timestamp()}_{usuario.id}.{file_extension}"
+    file_path = EXERCICIOS_VIDEOS_DIR / unique_filename
+
+    # Salvar arquivo
+    with file_path.open("wb") as buffer:
+        shutil.copyfileobj(file.file, buffer)
+
+    # Retornar URL relativa
+    relative_url = f"/static/uploads/exercicios/videos/{unique_filename}"
+    return {"video_url": relative_url, "mensagem": "Vídeo enviado com sucesso"}
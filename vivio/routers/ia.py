@@ -0,0 +1,186 @@
+"""
+Endpoints de IA e Machine Learning
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from typing import Optional
+
+from vivio.auth import get_admin_user, get_current_user
+from vivio.churn import pontuar_risco_churn, prever_risco_churn
+from vivio.database import get_db
+from vivio.models import Contrato, JobTreinamento, Unidade, Usuario
+from vivio.treinamento import (
+    enfileirar_job_treinamento, enfileirar_treino_todas_unidades, serializar_job_treinamento)
+
+router = APIRouter()
+
+
+# ============================================================
+# Endpoints de IA e Machine Learning
+# ============================================================
+
+
+@router.post("/admin/ia/treinar_churn")
+def endpoint_treinar_churn_todas(usuario: Usuario = Depends(get_current_user)):
+    """Enfileira o treinamento de churn de todas as unidades em paralelo"""
+    if usuario.tipo != "admin":
+        raise HTTPException(status_code=403, detail="Acesso restrito a administradores")
+    
+    job_ids = enfileirar_treino_todas_unidades(origem="MANUAL")
+    return {"job_ids": job_ids, "total": len(job_ids)}
+
+
+@router.post("/admin/ia/treinar_churn/{unidade_id}")
+def endpoint_treinar_churn(unidade_id: int,
+                           chunksize: Optional[int] = None,
+                           usuario: Usuario = Depends(get_current_user),
+                           db: Session = Depends(get_db)):
+    """Enfileira o treinamento do modelo de churn da unidade e retorna o job"""
+    if usuario.tipo != "admin":
+        raise HTTPException(status_code=403, detail="Acesso restrito a administradores")
+    
+    if chunksize is not None and chunksize <= 0:
+        raise HTTPException(status_code=400, detail="chunksize deve ser maior que zero")
+    
+    if not db.query(Unidade).get(unidade_id):
+        raise HTTPException(status_code=404, detail="Unidade não encontrada")
+    
+    job = enfileirar_job_treinamento(db, unidade_id, origem="MANUAL", chunksize=chunksize)
+    return serializar_job_treinamento(job)
+
+
+@router.get("/admin/ia/jobs_treinamento")
+def endpoint_listar_jobs_treinamento(limite: int = 50,
+                                     usuario: Usuario = Depends(get_current_user),
+                                     db: Session = Depends(get_db)):
+    """Lista os jobs de treinamento mais recentes"""
+    if usuario.tipo != "admin":
+        raise HTTPException(status_code=403, detail="Acesso restrito a administradores")
+    
+    jobs = db.query(JobTreinamento).order_by(JobTreinamento.id.desc()).limit(min(limite, 200)).all()
+    return [serializar_job_treinamento(j) for j in jobs]
+
+
+@router.get("/admin/ia/jobs_treinamento/{job_id}")
+def endpoint_status_job_treinamento(job_id: int,
+                                    usuario: Usuario = Depends(get_current_user),
+                                    db: Session = Depends(get_db)):
+    """Status e progresso de um job de treinamento"""
+    if usuario.tipo != "admin":
+        raise HTTPException(status_code=403, detail="Acesso restrito a administradores")
+    
+    job = db.query(JobTreinamento).get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job não encontrado")
+    
+    return serializar_job_treinamento(job)
+
+
+@router.get("/admin/ia/riscos_churn")
+def endpoint_listar_riscos_churn(usuario: Usuario = Depends(get_current_user),
+                                  db: Session = Depends(get_db)):
+    """Lista todos os usuários com seus riscos de churn calculados"""
+    if usuario.tipo != "admin":
+        raise HTTPException(status_code=403, detail="Acesso restrito a administradores")
+    
+    import pandas as pd
+
+    df = pontuar_risco_churn(db, usuario.unidade_id)
+    
+    riscos = []
+    for u in df.itertuples():
+        risco = float(u.risco)
+        riscos.append({
+            "id": int(u.id),
+            "nome": u.nome,
+            "email": u.email,
+            "risco_churn": round(risco * 100, 2),
+            "nivel": "ALTO" if risco > 0.75 else "MÉDIO" if risco > 0.40 else "BAIXO",
+            "ultima_atividade": u.ultima_atividade.isoformat() if not pd.isna(u.ultima_atividade) else None
+        })
+    
+    riscos.sort(key=lambda x: x['risco_churn'], reverse=True)
+    
+    return {
+        "total": len(riscos),
+        "alto_risco": len([r for r in riscos if r['nivel'] == 'ALTO']),
+        "medio_risco": len([r for r in riscos if r['nivel'] == 'MÉDIO']),
+        "baixo_risco": len([r for r in riscos if r['nivel'] == 'BAIXO']),
+        "usuarios": riscos
+    }
+
+
+@router.get("/usuarios/{usuario_id}/risco_churn")
+def endpoint_risco_churn_usuario(usuario_id: int,
+                                  usuario: Usuario = Depends(get_current_user),
+                                  db: Session = Depends(get_db)):
+    """Calcula e retorna risco de churn de um usuário específico"""
+    if usuario.tipo != "admin":
+        raise HTTPException(status_code=403, detail="Acesso restrito a administradores")
+    
+    usuario_alvo = db.query(Usuario).get(usuario_id)
+    if not usuario_alvo:
+        raise HTTPException(status_code=404, detail="Usuário não encontrado")
+    
+    risco = prever_risco_churn(db, usuario_alvo)
+    
+    return {
+        "usuario_id": usuario_id,
+        "nome": usuario_alvo.nome,
+        "risco_churn": round(risco * 100, 2),
+        "nivel": "ALTO" if risco > 0.75 else "MÉDIO" if risco > 0.40 else "BAIXO"
+    }
+
+
+@router.get("/admin/ia/riscos_renovacao")
+def listar_riscos_renovacao(usuario: Usuario = Depends(get_admin_user),
+                             db: Session = Depends(get_db)):
+    """Lista contratos B2B em risco de não renovação"""
+    hoje = datetime.utcnow()
+    limite = hoje + timedelta(days=90)
+    
+    contratos = db.query(Contrato).filter(
+        Contrato.unidade_id == usuario.unidade_id,
+        Contrato.data_fim <= limite,
+        Contrato.data_fim >= hoje,
+        Contrato.status == "ativo"
+    ).all()
+    
+    riscos = []
+    for c in contratos:
+        dias_restantes = (c.data_fim - hoje).days
+        risco_percentual = 100 - (dias_restantes / 90 * 100)
+        
+        usuarios_ativos = db.query(Usuario).filter(
+            Usuario.unidade_id == c.unidade_id,
+            Usuario.ativo == True
+        ).count()
+        
+        nivel = "CRITICO" if dias_restantes <= 15 else "ALTO" if dias_restantes <= 30 else "MEDIO"
+        
+        riscos.append({
+            "contrato_id": c.id,
+            "nome": c.nome,
+            "valor_mensal": c.valor_mensal,
+            "data_fim": c.data_fim.isoformat(),
+            "dias_restantes": dias_restantes,
+            "risco_nao_renovacao": round(risco_percentual, 2),
+            "nivel": nivel,
+            "usuarios_ativos": usuarios_ativos,
+            "limite_usuarios": c.limite_usuarios,
+            "taxa_uso": round((usuarios_ativos / c.limite_usuarios * 100), 2) if c.limite_usuarios else None
+        })
+    
+    riscos.sort(key=lambda x: x['dias_restantes'])
+    
+    receita_em_risco = sum([r['valor_mensal'] for r in riscos if r['nivel'] in ['CRITICO', 'ALTO']])
+    
+    return {
+        "total_contratos": len(riscos),
+        "criticos": len([r for r in riscos if r['nivel'] == 'CRITICO']),
+        "alto_risco": len([r for r in riscos if r['nivel'] == 'ALTO']),
+        "medio_risco": len([r for r in riscos if r['nivel'] == 'MEDIO']),
+        "receita_mensal_em_risco": receita_em_risco,
+        "contratos": riscos
+    }
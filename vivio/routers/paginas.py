@@ -0,0 +1,28 @@
+"""
+Páginas HTML (index e demo)
+"""
+from fastapi import APIRouter
+from fastapi.responses import FileResponse
+
+
+router = APIRouter()
+
+
+@router.get("/")
+async def root():
+    response = FileResponse("templates/index.html")
+    response.headers[
+        "Cache-Control"] = "no-cache, no-store, must-revalidate, max-age=0"
+    response.headers["Pragma"] = "no-cache"
+    response.headers["Expires"] = "0"
+    return response
+
+
+@router.get("/demo")
+async def demo():
+    response = FileResponse("templates/demo.html")
+    response.headers[
+        "Cache-Control"] = "no-cache, no-store, must-revalidate, max-age=0"
+    response.headers["Pragma"] = "no-cache"
+    response.headers["Expires"] = "0"
+    return response
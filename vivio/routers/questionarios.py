@@ -0,0 +1,467 @@
+"""
+Endpoints de questionários, seções e perguntas
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from datetime import datetime
+import json
+
+from vivio.auth import get_current_user
+from vivio.database import get_db
+from vivio.models import OpcaoPergunta, Pergunta, Questionario, Secao, Usuario
+from vivio.schemas import (
+    PerguntaCreate, QuestionarioCreate, QuestionarioUpdate, SecaoCreate, SecaoUpdate)
+
+router = APIRouter()
+
+
+@router.get("/questionarios")
+def listar_questionarios(usuario: Usuario = Depends(get_current_user),
+                         db: Session = Depends(get_db)):
+    questionarios = db.query(Questionario).filter(
+        Questionario.criado_por_id == usuario.id).order_by(
+            Questionario.data_criacao.desc()).all()
+
+    resultado = []
+    for q in questionarios:
+        resultado.append({
+            "id":
+            q.id,
+            "titulo":
+            q.titulo,
+            "descricao":
+            q.descricao,
+            "status":
+            q.status,
+            "categoria":
+            q.categoria,
+            "thumbnail_url":
+            q.thumbnail_url,
+            "data_criacao":
+            q.data_criacao.isoformat(),
+            "data_atualizacao":
+            q.data_atualizacao.isoformat(),
+            "data_publicacao":
+            q.data_publicacao.isoformat() if q.data_publicacao else None,
+            "total_perguntas":
+            len(q.perguntas)
+        })
+
+    return resultado
+
+
+@router.post("/questionarios")
+def criar_questionario(dados: QuestionarioCreate,
+                       usuario: Usuario = Depends(get_current_user),
+                       db: Session = Depends(get_db)):
+    questionario = Questionario(titulo=dados.titulo,
+                                descricao=dados.descricao,
+                                categoria=dados.categoria,
+                                thumbnail_url=dados.thumbnail_url,
+                                status="rascunho",
+                                unidade_id=usuario.unidade_id,
+                                criado_por_id=usuario.id,
+                                configuracoes=json.dumps(dados.configuracoes)
+                                if dados.configuracoes else None)
+
+    db.add(questionario)
+    db.commit()
+    db.refresh(questionario)
+
+    return {
+        "id": questionario.id,
+        "titulo": questionario.titulo,
+        "descricao": questionario.descricao,
+        "status": questionario.status,
+        "data_criacao": questionario.data_criacao.isoformat(),
+        "mensagem": "Questionário criado com sucesso"
+    }
+
+
+@router.get("/questionarios/{questionario_id}")
+def obter_questionario(questionario_id: int,
+                       usuario: Usuario = Depends(get_current_user),
+                       db: Session = Depends(get_db)):
+    questionario = db.query(Questionario).filter(
+        Questionario.id == questionario_id,
+        Questionario.criado_por_id == usuario.id).first()
+
+    if not questionario:
+        raise HTTPException(status_code=404,
+                            detail="Questionário não encontrado")
+
+    perguntas = []
+    for p in questionario.perguntas:
+        opcoes = []
+        for o in p.opcoes:
+            opcoes.append({
+                "id": o.id,
+                "texto": o.texto,
+                "ordem": o.ordem,
+                "valor": o.valor
+            })
+
+        perguntas.append({
+            "id": p.id,
+            "tipo": p.tipo,
+            "titulo": p.titulo,
+            "descricao": p.descricao,
+            "obrigatoria": p.obrigatoria,
+            "ordem": p.ordem,
+            "configuracoes":
+            json.loads(p.configuracoes) if p.configuracoes else {},
+            "opcoes": opcoes
+        })
+
+    return {
+        "id":
+        questionario.id,
+        "titulo":
+        questionario.titulo,
+        "descricao":
+        questionario.descricao,
+        "status":
+        questionario.status,
+        "categoria":
+        questionario.categoria,
+        "thumbnail_url":
+        questionario.thumbnail_url,
+        "data_criacao":
+        questionario.data_criacao.isoformat(),
+        "data_atualizacao":
+        questionario.data_atualizacao.isoformat(),
+        "data_publicacao":
+        questionario.data_publicacao.isoformat()
+        if questionario.data_publicacao else None,
+        "configuracoes":
+        json.loads(questionario.configuracoes)
+        if questionario.configuracoes else {},
+        "perguntas":
+        perguntas
+    }
+
+
+@router.put("/questionarios/{questionario_id}")
+def atualizar_questionario(questionario_id: int,
+                           dados: QuestionarioUpdate,
+                           usuario: Usuario = Depends(get_current_user),
+                           db: Session = Depends(get_db)):
+    questionario = db.query(Questionario).filter(
+        Questionario.id == questionario_id,
+        Questionario.criado_por_id == usuario.id).first()
+
+    if not questionario:
+        raise HTTPException(status_code=404,
+                            detail="Questionário não encontrado")
+
+    if dados.titulo is not None:
+        questionario.titulo = dados.titulo
+    if dados.descricao is not None:
+        questionario.descricao = dados.descricao
+    if dados.categoria is not None:
+        questionario.categoria = dados.categoria
+    if dados.thumbnail_url is not None:
+        questionario.thumbnail_url = dados.thumbnail_url
+    if dados.status is not None:
+        questionario.status = dados.status
+        if dados.status == "publicado" and not questionario.data_publicacao:
+            questionario.data_publicacao = datetime.utcnow()
+    if dados.configuracoes is not None:
+        questionario.configuracoes = json.dumps(dados.configuracoes)
+
+    questionario.data_atualizacao = datetime.utcnow()
+    db.commit()
+
+    return {"mensagem": "Questionário atualizado com sucesso"}
+
+
+@router.delete("/questionarios/{questionario_id}")
+def deletar_questionario(questionario_id: int,
+                         usuario: Usuario = Depends(get_current_user),
+                         db: Session = Depends(get_db)):
+    questionario = db.query(Questionario).filter(
+        Questionario.id == questionario_id,
+        Questionario.criado_por_id == usuario.id).first()
+
+    if not questionario:
+        raise HTTPException(status_code=404,
+                            detail="Questionário não encontrado")
+
+    db.delete(questionario)
+    db.commit()
+
+    return {"mensagem": "Questionário excluído com sucesso"}
+
+
+# ============================================================
+# Endpoints de Seções
+# ============================================================
+
+
+@router.get("/questionarios/{questionario_id}/secoes")
+def listar_secoes(questionario_id: int,
+                  usuario: Usuario = Depends(get_current_user),
+                  db: Session = Depends(get_db)):
+    questionario = db.query(Questionario).filter(
+        Questionario.id == questionario_id,
+        Questionario.criado_por_id == usuario.id).first()
+
+    if not questionario:
+        raise HTTPException(status_code=404,
+                            detail="Questionário não encontrado")
+
+    secoes = db.query(Secao).filter(
+        Secao.questionario_id == questionario_id).order_by(Secao.ordem).all()
+
+    resultado = []
+    for secao in secoes:
+        perguntas = []
+        for p in secao.perguntas:
+            perguntas.append({
+                "id": p.id,
+                "tipo": p.tipo,
+                "titulo": p.titulo,
+                "descricao": p.descricao,
+                "obrigatoria": p.obrigatoria,
+                "ordem": p.ordem,
+                "configuracoes":
+                json.loads(p.configuracoes) if p.configuracoes else {}
+            })
+
+        resultado.append({
+            "id": secao.id,
+            "titulo": secao.titulo,
+            "descricao": secao.descricao,
+            "ordem": secao.ordem,
+            "perguntas": perguntas
+        })
+
+    return resultado
+
+
+@router.post("/questionarios/{questionario_id}/secoes")
+def criar_secao(questionario_id: int,
+                dados: SecaoCreate,
+                usuario: Usuario = Depends(get_current_user),
+                db: Session = Depends(get_db)):
+    questionario = db.query(Questionario).filter(
+        Questionario.id == questionario_id,
+        Questionario.criado_por_id == usuario.id).first()
+
+    if not questionario:
+        raise HTTPException(status_code=404,
+                            detail="Questionário não encontrado")
+
+    secao = Secao(questionario_id=questionario_id,
+                  titulo=dados.titulo,
+                  descricao=dados.descricao,
+                  ordem=dados.ordem)
+
+    db.add(secao)
+    db.commit()
+    db.refresh(secao)
+
+    return {
+        "id": secao.id,
+        "titulo": secao.titulo,
+        "descricao": secao.descricao,
+        "ordem": secao.ordem,
+        "perguntas": []
+    }
+
+
+@router.put("/questionarios/{questionario_id}/secoes/{secao_id}")
+def atualizar_secao(questionario_id: int,
+                    secao_id: int,
+                    dados: SecaoUpdate,
+                    usuario: Usuario = Depends(get_current_user),
+                    db: Session = Depends(get_db)):
+    secao = db.query(Secao).join(Questionario).filter(
+        Secao.id == secao_id, Secao.questionario_id == questionario_id,
+        Questionario.criado_por_id == usuario.id).first()
+
+    if not secao:
+        raise HTTPException(status_code=404, detail="Seção não encontrada")
+
+    if dados.titulo is not None:
+        secao.titulo = dados.titulo
+    if dados.descricao is not None:
+        secao.descricao = dados.descricao
+    if dados.ordem is not None:
+        secao.ordem = dados.ordem
+
+    db.commit()
+
+    return {"mensagem": "Seção atualizada com sucesso"}
+
+
+@router.delete("/questionarios/{questionario_id}/secoes/{secao_id}")
+def deletar_secao(questionario_id: int,
+                  secao_id: int,
+                  usuario: Usuario = Depends(get_current_user),
+                  db: Session = Depends(get_db)):
+    secao = db.query(Secao).join(Questionario).filter(
+        Secao.id == secao_id, Secao.questionario_id == questionario_id,
+        Questionario.criado_por_id == usuario.id).first()
+
+    if not secao:
+        raise HTTPException(status_code=404, detail="Seção não encontrada")
+
+    db.delete(secao)
+    db.commit()
+
+    return {"mensagem": "Seção excluída com sucesso"}
+
+
+# ============================================================
+# Endpoints de Perguntas
+# ============================================================
+
+
+@router.post("/questionarios/{questionario_id}/perguntas")
+def adicionar_pergunta(questionario_id: int,
+                       dados: PerguntaCreate,
+                       usuario: Usuario = Depends(get_current_user),
+                       db: Session = Depends(get_db)):
+    questionario = db.query(Questionario).filter(
+        Questionario.id == questionario_id,
+        Questionario.criado_por_id == usuario.id).first()
+
+    if not questionario:
+        raise HTTPException(status_code=404,
+                            detail="Questionário não encontrado")
+
+    pergunta = Pergunta(questionario_id=questionario_id,
+                        secao_id=dados.secao_id,
+                        tipo=dados.tipo,
+                        titulo=dados.titulo,
+                        descricao=dados.descricao,
+                        obrigatoria=dados.obrigatoria,
+                        ordem=dados.ordem,
+                        configuracoes=json.dumps(dados.configuracoes)
+                        if dados.configuracoes else None)
+
+    db.add(pergunta)
+    db.commit()
+    db.refresh(pergunta)
+
+    if dados.opcoes:
+        for opcao_data in dados.opcoes:
+            opcao = OpcaoPergunta(pergunta_id=pergunta.id,
+                                  texto=opcao_data.texto,
+                                  ordem=opcao_data.ordem,
+                                  valor=opcao_data.valor)
+            db.add(opcao)
+        db.commit()
+
+    questionario.data_atualizacao = datetime.utcnow()
+    db.commit()
+
+    return {"id": pergunta.id, "mensagem": "Pergunta adicionada com sucesso"}
+
+
+@router.put("/perguntas/{pergunta_id}")
+def atualizar_pergunta(pergunta_id: int,
+                       dados: PerguntaCreate,
+                       usuario: Usuario = Depends(get_current_user),
+                       db: Session = Depends(get_db)):
+    pergunta = db.query(Pergunta).join(Questionario).filter(
+        Pergunta.id == pergunta_id,
+        Questionario.criado_por_id == usuario.id).first()
+
+    if not pergunta:
+        raise HTTPException(status_code=404, detail="Pergunta não encontrada")
+
+    pergunta.tipo = dados.tipo
+    pergunta.titulo = dados.titulo
+    pergunta.descricao = dados.descricao
+    pergunta.obrigatoria = dados.obrigatoria
+    pergunta.ordem = dados.ordem
+    pergunta.configuracoes = json.dumps(
+        dados.configuracoes) if dados.configuracoes else None
+
+    db.query(OpcaoPergunta).filter(
+        OpcaoPergunta.pergunta_id == pergunta_id).delete()
+
+    if dados.opcoes:
+        for opcao_data in dados.opcoes:
+            opcao = OpcaoPergunta(pergunta_id=pergunta.id,
+                                  texto=opcao_data.texto,
+                                  ordem=opcao_data.ordem,
+                                  valor=opcao_data.valor)
+            db.add(opcao)
+
+    pergunta.questionario.data_atualizacao = datetime.utcnow()
+    db.commit()
+
+    return {"mensagem": "Pergunta atualizada com sucesso"}
+
+
+@router.delete("/perguntas/{pergunta_id}")
+def deletar_pergunta(pergunta_id: int,
+                     usuario: Usuario = Depends(get_current_user),
+                     db: Session = Depends(get_db)):
+    pergunta = db.query(Pergunta).join(Questionario).filter(
+        Pergunta.id == pergunta_id,
+        Questionario.criado_por_id == usuario.id).first()
+
+    if not pergunta:
+        raise HTTPException(status_code=404, detail="Pergunta não encontrada")
+
+    questionario = pergunta.questionario
+    db.delete(pergunta)
+    questionario.data_atualizacao = datetime.utcnow()
+    db.commit()
+
+    return {"mensagem": "Pergunta excluída com sucesso"}
+
+
+@router.post("/questionarios/{questionario_id}/duplicar")
+def duplicar_questionario(questionario_id: int,
+                          usuario: Usuario = Depends(get_current_user),
+                          db: Session = Depends(get_db)):
+    questionario_original = db.query(Questionario).filter(
+        Questionario.id == questionario_id,
+        Questionario.criado_por_id == usuario.id).first()
+
+    if not questionario_original:
+        raise HTTPException(status_code=404,
+                            detail="Questionário não encontrado")
+
+    novo_questionario = Questionario(
+        titulo=f"{questionario_original.titulo} (Cópia)",
+        descricao=questionario_original.descricao,
+        status="rascunho",
+        unidade_id=questionario_original.unidade_id,
+        criado_por_id=usuario.id,
+        configuracoes=questionario_original.configuracoes)
+
+    db.add(novo_questionario)
+    db.commit()
+    db.refresh(novo_questionario)
+
+    for pergunta_original in questionario_original.perguntas:
+        nova_pergunta = Pergunta(questionario_id=novo_questionario.id,
+                                 tipo=pergunta_original.tipo,
+                                 titulo=pergunta_original.titulo,
+                                 descricao=pergunta_original.descricao,
+                                 obrigatoria=pergunta_original.obrigatoria,
+                                 ordem=pergunta_original.ordem,
+                                 configuracoes=pergunta_original.configuracoes)
+        db.add(nova_pergunta)
+        db.commit()
+        db.refresh(nova_pergunta)
+
+        for opcao_original in pergunta_original.opcoes:
+            nova_opcao = OpcaoPergunta(pergunta_id=nova_pergunta.id,
+                                       texto=opcao_original.texto,
+                                       ordem=opcao_original.ordem,
+                                       valor=opcao_original.valor)
+            db.add(nova_opcao)
+
+    db.commit()
+
+    return {
+        "id": novo_questionario.id,
+        "mensagem": "Questionário duplicado com sucesso"
+    }
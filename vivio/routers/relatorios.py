@@ -0,0 +1,468 @@
+"""
+Endpoints de relatórios do painel
+"""
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, case, func
+from sqlalchemy.orm import Session
+from datetime import date, datetime, timedelta
+from typing import Optional
+import csv
+
+from vivio.auth import UsuarioAutenticado, get_admin_user, get_current_user, get_usuario_autenticado
+from vivio.database import get_db
+from vivio.exportacao import gerar_csv_streaming
+from vivio.fatos import receita_contratos_no_dia, reconstruir_fatos_diarios, somar_fatos_diarios
+from vivio.models import (
+    Attendance, Contrato, EventoAula, Grupo, Instrutor, Jornada, Questionario, ReservaAula,
+    Sala, Usuario, UsuarioJornada, Visitante)
+
+router = APIRouter()
+
+
+@router.get("/painel/exportar_usuarios_csv")
+def exportar_usuarios_csv(usuario: Usuario = Depends(get_current_user),
+                          db: Session = Depends(get_db)):
+    """Exporta dados de usuários para CSV com análise de risco"""
+    if usuario.tipo != "admin":
+        raise HTTPException(status_code=403, detail="Acesso restrito a administradores")
+    
+    unidade_id = usuario.unidade_id
+    
+    def consulta(db: Session):
+        return db.query(
+            Usuario.id, Usuario.nome, Usuario.email, Usuario.tipo, Usuario.ativo,
+            Usuario.risco_churn, Usuario.data_cadastro, Usuario.ultima_atividade
+        ).filter(Usuario.unidade_id == unidade_id).order_by(Usuario.id)
+    
+    def formatar(u):
+        risco = u.risco_churn or 0
+        return [
+            u.id,
+            u.nome,
+            u.email,
+            u.tipo,
+            "Sim" if u.ativo else "Não",
+            round(risco * 100, 2),
+            "ALTO" if risco > 0.75 else "MÉDIO" if risco > 0.40 else "BAIXO",
+            u.data_cadastro.strftime("%d/%m/%Y") if u.data_cadastro else "",
+            u.ultima_atividade.strftime("%d/%m/%Y") if u.ultima_atividade else ""
+        ]
+    
+    return StreamingResponse(
+        gerar_csv_streaming([
+            "ID", "Nome", "Email", "Tipo", "Ativo", "Risco_Churn_%",
+            "Nivel_Risco", "Data_Cadastro", "Ultima_Atividade"
+        ], consulta, formatar, bom=True),
+        media_type="text/csv; charset=utf-8",
+        headers={
+            "Content-Disposition":
+            f"attachment; filename=usuarios_viviocrm_{datetime.utcnow().strftime('%Y%m%d')}.csv"
+        })
+
+
+# ============================================
+# ENDPOINTS DE RELATÓRIOS - PAINEL
+# ============================================
+
+def intervalo_relatorio(data_inicio: str = None, data_fim: str = None):
+    """
+    Converte os filtros de data dos relatórios. Uma data_fim sem horário
+    inclui o dia inteiro (o limite retornado é exclusivo)
+    """
+    try:
+        inicio = datetime.fromisoformat(data_inicio) if data_inicio else None
+        fim = datetime.fromisoformat(data_fim) if data_fim else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Data inválida (use AAAA-MM-DD)")
+    
+    if fim is not None and len(data_fim) == 10:
+        fim += timedelta(days=1)
+    elif fim is not None:
+        fim += timedelta(microseconds=1)
+    
+    return inicio, fim
+
+
+def consulta_relatorio_aulas(db: Session, unidade_id: int, inicio: datetime = None, fim: datetime = None):
+    """
+    Uma linha por aula da unidade com instrutor, sala e as contagens de
+    reservas, cancelamentos e presenças, tudo em um único GROUP BY
+    """
+    query = db.query(
+        EventoAula.id,
+        EventoAula.nome_aula,
+        EventoAula.data_hora,
+        EventoAula.limite_inscricoes,
+        Instrutor.nome.label("instrutor_nome"),
+        Sala.nome.label("sala_nome"),
+        func.count(ReservaAula.id.distinct()).label("reservas"),
+        func.count(case((ReservaAula.cancelada == True, ReservaAula.id)).distinct()).label("cancelamentos"),
+        func.count(Attendance.id.distinct()).label("presencas")
+    ).outerjoin(
+        Instrutor, EventoAula.instrutor_id == Instrutor.id
+    ).outerjoin(
+        Sala, EventoAula.sala_id == Sala.id
+    ).outerjoin(
+        ReservaAula, ReservaAula.evento_aula_id == EventoAula.id
+    ).outerjoin(
+        Attendance, and_(Attendance.reserva_aula_id == ReservaAula.id,
+                         Attendance.status == 'presente')
+    ).filter(
+        EventoAula.unidade_id == unidade_id
+    )
+    
+    if inicio:
+        query = query.filter(EventoAula.data_hora >= inicio)
+    if fim:
+        query = query.filter(EventoAula.data_hora < fim)
+    
+    return query.group_by(
+        EventoAula.id, Instrutor.nome, Sala.nome
+    ).order_by(EventoAula.data_hora, EventoAula.id)
+
+
+def taxa_presenca(linha) -> float:
+    return round((linha.presencas / linha.reservas * 100), 1) if linha.reservas > 0 else 0
+
+
+@router.get("/relatorios/aulas")
+def relatorio_aulas(data_inicio: str = None, data_fim: str = None,
+                    usuario: UsuarioAutenticado = Depends(get_usuario_autenticado),
+                    db: Session = Depends(get_db)):
+    """Retorna dados para relatório de aulas (totais vêm dos fatos diários)"""
+    inicio, fim = intervalo_relatorio(data_inicio, data_fim)
+    totais = somar_fatos_diarios(db, usuario.unidade_id,
+                                 inicio.date() if inicio else None,
+                                 (fim - timedelta(microseconds=1)).date() if fim else None)
+    
+    total_aulas = totais["aulas"]
+    total_reservas = totais["reservas"]
+    total_presencas = totais["presencas"]
+    cancelamentos = totais["cancelamentos"]
+    
+    taxa_ocupacao = 0
+    capacidade_total = totais["capacidade"]
+    if capacidade_total > 0:
+        taxa_ocupacao = round((total_reservas / capacidade_total) * 100, 1)
+    
+    aulas = consulta_relatorio_aulas(db, usuario.unidade_id, inicio, fim).limit(50).all()
+    
+    aulas_dados = []
+    for a in aulas:
+        aulas_dados.append({
+            "data": a.data_hora.strftime("%d/%m/%Y") if a.data_hora else "",
+            "nome": a.nome_aula,
+            "instrutor": a.instrutor_nome or "-",
+            "sala": a.sala_nome or "-",
+            "reservas": a.reservas,
+            "presencas": a.presencas,
+            "taxa": taxa_presenca(a)
+        })
+    
+    return {
+        "total_aulas": total_aulas,
+        "total_presencas": total_presencas,
+        "taxa_ocupacao": taxa_ocupacao,
+        "cancelamentos": cancelamentos,
+        "aulas": aulas_dados
+    }
+
+
+@router.get("/relatorios/automacao")
+def relatorio_automacao(usuario: UsuarioAutenticado = Depends(get_usuario_autenticado),
+                        db: Session = Depends(get_db)):
+    """Retorna dados para relatório de automação"""
+    jornadas_ativas = db.query(Jornada).filter(
+        Jornada.unidade_id == usuario.unidade_id,
+        Jornada.ativa == True
+    ).count()
+    
+    grupos_ativos = db.query(Grupo).filter(
+        Grupo.unidade_id == usuario.unidade_id,
+        Grupo.ativo == True
+    ).count()
+    
+    usuarios_em_jornadas = db.query(UsuarioJornada).join(Jornada).filter(
+        Jornada.unidade_id == usuario.unidade_id,
+        UsuarioJornada.status == 'em_progresso'
+    ).count()
+    
+    questionarios_total = db.query(Questionario).filter(
+        Questionario.unidade_id == usuario.unidade_id
+    ).count()
+    
+    return {
+        "jornadas_ativas": jornadas_ativas,
+        "questionarios_respondidos": questionarios_total,
+        "grupos_ativos": grupos_ativos,
+        "usuarios_em_jornadas": usuarios_em_jornadas
+    }
+
+
+@router.get("/relatorios/loja")
+def relatorio_loja(usuario: UsuarioAutenticado = Depends(get_usuario_autenticado),
+                   db: Session = Depends(get_db)):
+    """Retorna dados para relatório da loja (estrutura inicial)"""
+    return {
+        "total_vendas": 0,
+        "receita_total": 0,
+        "produtos_vendidos": 0,
+        "mais_vendido": "-"
+    }
+
+
+@router.get("/relatorios/equipe")
+def relatorio_equipe(usuario: UsuarioAutenticado = Depends(get_usuario_autenticado),
+                     db: Session = Depends(get_db)):
+    """Retorna dados para relatório da equipe"""
+    instrutores = db.query(Instrutor).filter(
+        Instrutor.unidade_id == usuario.unidade_id
+    ).all()
+    
+    total_instrutores = len(instrutores)
+    
+    aulas_por_instrutor = {}
+    for inst in instrutores:
+        count = db.query(EventoAula).filter(EventoAula.instrutor_id == inst.id).count()
+        aulas_por_instrutor[inst.nome] = count
+    
+    total_aulas = sum(aulas_por_instrutor.values())
+    destaque = max(aulas_por_instrutor, key=aulas_por_instrutor.get) if aulas_por_instrutor else "-"
+    
+    return {
+        "total_instrutores": total_instrutores,
+        "horas_trabalhadas": total_aulas * 1,
+        "aulas_ministradas": total_aulas,
+        "destaque": destaque
+    }
+
+
+@router.get("/relatorios/contratos")
+def relatorio_contratos(usuario: UsuarioAutenticado = Depends(get_usuario_autenticado),
+                        db: Session = Depends(get_db)):
+    """Retorna dados para relatório de contratos B2B"""
+    hoje = datetime.utcnow()
+    
+    ativos, em_risco = db.query(
+        func.count(Contrato.id),
+        func.coalesce(func.sum(case((Contrato.data_fim < hoje + timedelta(days=31), 1), else_=0)), 0)
+    ).filter(
+        Contrato.unidade_id == usuario.unidade_id,
+        Contrato.status == "ativo"
+    ).one()
+    
+    receita_mensal = receita_contratos_no_dia(db, usuario.unidade_id, hoje.date())
+    
+    return {
+        "contratos_ativos": ativos,
+        "receita_mensal": receita_mensal,
+        "renovacoes": 0,
+        "em_risco": em_risco
+    }
+
+
+@router.get("/relatorios/visitantes")
+def relatorio_visitantes(usuario: UsuarioAutenticado = Depends(get_usuario_autenticado),
+                         db: Session = Depends(get_db)):
+    """Retorna dados para relatório de visitantes/leads"""
+    totais = somar_fatos_diarios(db, usuario.unidade_id)
+    
+    total_leads = totais["leads"]
+    conversoes = totais["conversoes"]
+    taxa_conversao = round((conversoes / total_leads * 100), 1) if total_leads > 0 else 0
+    
+    tipo_lead = func.coalesce(Visitante.tipo_lead, "Individual")
+    tipo_principal = db.query(tipo_lead).filter(
+        Visitante.unidade_id == usuario.unidade_id
+    ).group_by(tipo_lead).order_by(func.count(Visitante.id).desc()).limit(1).scalar() or "-"
+    
+    return {
+        "total_leads": total_leads,
+        "conversoes": conversoes,
+        "taxa_conversao": taxa_conversao,
+        "origem_principal": tipo_principal
+    }
+
+
+@router.get("/relatorios/financeiro")
+def relatorio_financeiro(usuario: UsuarioAutenticado = Depends(get_usuario_autenticado),
+                         db: Session = Depends(get_db)):
+    """Retorna dados para relatório financeiro (crescimento em relação a 30 dias atrás)"""
+    hoje = datetime.utcnow().date()
+    receita_b2b = receita_contratos_no_dia(db, usuario.unidade_id, hoje)
+    receita_anterior = receita_contratos_no_dia(db, usuario.unidade_id, hoje - timedelta(days=30))
+    receita_b2c = 0
+    receita_total = receita_b2b + receita_b2c
+    
+    crescimento = 0
+    if receita_anterior > 0:
+        crescimento = round((receita_b2b - receita_anterior) / receita_anterior * 100, 1)
+    
+    return {
+        "receita_total": receita_total,
+        "receita_b2b": receita_b2b,
+        "receita_b2c": receita_b2c,
+        "crescimento": crescimento
+    }
+
+
+@router.post("/admin/fatos/reconstruir")
+def endpoint_reconstruir_fatos(unidade_id: Optional[int] = None,
+                               data_inicio: Optional[str] = None,
+                               data_fim: Optional[str] = None,
+                               usuario: Usuario = Depends(get_admin_user),
+                               db: Session = Depends(get_db)):
+    """Reconstrói os fatos diários (por padrão, todo o histórico de todas as unidades)"""
+    try:
+        inicio = date.fromisoformat(data_inicio) if data_inicio else None
+        fim = date.fromisoformat(data_fim) if data_fim else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Data inválida (use AAAA-MM-DD)")
+    
+    return reconstruir_fatos_diarios(db, unidade_id, inicio, fim)
+
+
+@router.get("/relatorios/{tipo}/download")
+def download_relatorio(tipo: str, formato: str = "csv",
+                       data_inicio: str = None, data_fim: str = None,
+                       usuario: UsuarioAutenticado = Depends(get_usuario_autenticado),
+                       db: Session = Depends(get_db)):
+    """Gera arquivo de download para relatórios"""
+    from io import BytesIO, StringIO
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib import colors
+    
+    data = []
+    headers = []
+    titulo = ""
+    
+    if tipo == "aulas":
+        titulo = "Relatório de Aulas"
+        headers = ["Data", "Aula", "Instrutor", "Sala", "Reservas", "Presenças", "Taxa"]
+        inicio, fim = intervalo_relatorio(data_inicio, data_fim)
+        aulas = consulta_relatorio_aulas(db, usuario.unidade_id, inicio, fim).limit(100).all()
+        for a in aulas:
+            data.append([
+                a.data_hora.strftime("%d/%m/%Y") if a.data_hora else "",
+                a.nome_aula,
+                a.instrutor_nome or "-",
+                a.sala_nome or "-",
+                a.reservas,
+                a.presencas,
+                f"{taxa_presenca(a)}%"
+            ])
+    
+    elif tipo == "automacao":
+        titulo = "Relatório de Automação"
+        headers = ["Tipo", "Nome", "Status", "Criado em"]
+        jornadas = db.query(Jornada).filter(Jornada.unidade_id == usuario.unidade_id).all()
+        for j in jornadas:
+            data.append([
+                "Jornada",
+                j.nome,
+                "Ativa" if j.ativa else "Inativa",
+                j.data_criacao.strftime("%d/%m/%Y") if j.data_criacao else ""
+            ])
+    
+    elif tipo == "contratos":
+        titulo = "Relatório de Contratos"
+        headers = ["Nome", "Valor Mensal", "Início", "Fim", "Status", "Limite Usuários"]
+        contratos = db.query(Contrato).filter(Contrato.unidade_id == usuario.unidade_id).all()
+        for c in contratos:
+            data.append([
+                c.nome,
+                f"R$ {c.valor_mensal:,.2f}",
+                c.data_inicio.strftime("%d/%m/%Y") if c.data_inicio else "",
+                c.data_fim.strftime("%d/%m/%Y") if c.data_fim else "",
+                c.status,
+                c.limite_usuarios
+            ])
+    
+    elif tipo == "equipe":
+        titulo = "Relatório da Equipe"
+        headers = ["Nome", "Email", "Especialidades"]
+        instrutores = db.query(Instrutor).filter(Instrutor.unidade_id == usuario.unidade_id).all()
+        for i in instrutores:
+            data.append([i.nome, i.email, i.especialidades or "-"])
+    
+    elif tipo == "visitantes":
+        titulo = "Relatório de Visitantes"
+        headers = ["Nome", "Email", "Telefone", "Tipo Lead", "Convertido"]
+        visitantes = db.query(Visitante).filter(Visitante.unidade_id == usuario.unidade_id).all()
+        for v in visitantes:
+            data.append([
+                v.nome,
+                v.email or "-",
+                v.telefone or "-",
+                v.tipo_lead or "Individual",
+                "Sim" if v.convertido else "Não"
+            ])
+    
+    elif tipo == "financeiro":
+        titulo = "Relatório Financeiro"
+        headers = ["Tipo", "Descrição", "Valor"]
+        contratos = db.query(Contrato).filter(
+            Contrato.unidade_id == usuario.unidade_id,
+            Contrato.status == "ativo"
+        ).all()
+        for c in contratos:
+            data.append(["B2B", c.nome, f"R$ {c.valor_mensal:,.2f}"])
+    
+    else:
+        raise HTTPException(status_code=400, detail="Tipo de relatório não suportado")
+    
+    nome_arquivo = f"relatorio_{tipo}_{datetime.utcnow().strftime('%Y%m%d')}"
+    
+    if formato == "csv":
+        output = StringIO()
+        output.write('\ufeff')
+        writer = csv.writer(output)
+        writer.writerow(headers)
+        writer.writerows(data)
+        
+        return Response(
+            content=output.getvalue().encode("utf-8"),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": f"attachment; filename={nome_arquivo}.csv"}
+        )
+    
+    elif formato == "pdf":
+        buffer = BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4)
+        elements = []
+        
+        styles = getSampleStyleSheet()
+        elements.append(Paragraph(titulo, styles['Heading1']))
+        elements.append(Paragraph(f"Gerado em: {datetime.utcnow().strftime('%d/%m/%Y %H:%M')}", styles['Normal']))
+        elements.append(Paragraph("<br/><br/>", styles['Normal']))
+        
+        table_data = [headers] + data
+        table = Table(table_data)
+        table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f2746')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 9),
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e8e8e8')),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f7fa')])
+        ]))
+        
+        elements.append(table)
+        doc.build(elements)
+        
+        return Response(
+            content=buffer.getvalue(),
+            media_type="application/pdf",
+            headers={"Content-Disposition": f"attachment; filename={nome_arquivo}.pdf"}
+        )
+    
+    raise HTTPException(status_code=400, detail="Formato não suportado")
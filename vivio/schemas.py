@@ -0,0 +1,240 @@
+"""
+Schemas Pydantic das requisições e respostas
+"""
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+# ============================================================
+# Schemas Pydantic - Autenticação
+# ============================================================
+
+
+class RegistroRequest(BaseModel):
+    email: str
+    senha: str
+    nome: str
+    tipo: str
+    unidade_id: int
+
+
+class LoginRequest(BaseModel):
+    email: str
+    senha: str
+
+
+# ============================================================
+# Schemas Pydantic - Exercícios
+# ============================================================
+
+
+class ExercicioCreate(BaseModel):
+    nome: str
+    tipo: Optional[str] = None
+    quem_pode_utilizar: Optional[str] = None
+    elaborado_por: Optional[str] = None
+    descricao: Optional[str] = None
+    foto_url: Optional[str] = None
+    video_url: Optional[str] = None
+    favorito: bool = False
+    oculto: bool = False
+
+
+class ExercicioUpdate(BaseModel):
+    nome: Optional[str] = None
+    tipo: Optional[str] = None
+    quem_pode_utilizar: Optional[str] = None
+    elaborado_por: Optional[str] = None
+    descricao: Optional[str] = None
+    foto_url: Optional[str] = None
+    video_url: Optional[str] = None
+    favorito: Optional[bool] = None
+    oculto: Optional[bool] = None
+# ============================================================
+# Schemas Pydantic - Questionários
+# ============================================================
+
+
+class SecaoCreate(BaseModel):
+    titulo: Optional[str] = None
+    descricao: Optional[str] = None
+    ordem: int
+
+
+class SecaoUpdate(BaseModel):
+    titulo: Optional[str] = None
+    descricao: Optional[str] = None
+    ordem: Optional[int] = None
+
+
+class OpcaoPerguntaCreate(BaseModel):
+    texto: str
+    ordem: int
+    valor: Optional[str] = None
+
+
+class PerguntaCreate(BaseModel):
+    tipo: str
+    titulo: str
+    descricao: Optional[str] = None
+    obrigatoria: bool = False
+    ordem: int
+    secao_id: Optional[int] = None
+    configuracoes: Optional[dict] = None
+    opcoes: Optional[List[OpcaoPerguntaCreate]] = []
+
+
+class QuestionarioCreate(BaseModel):
+    titulo: str
+    descricao: Optional[str] = None
+    categoria: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    configuracoes: Optional[dict] = None
+
+
+class QuestionarioUpdate(BaseModel):
+    titulo: Optional[str] = None
+    descricao: Optional[str] = None
+    status: Optional[str] = None
+    categoria: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    configuracoes: Optional[dict] = None
+
+
+# ============================================================
+# Schemas Pydantic - Contratos B2B
+# ============================================================
+
+
+class ContratoCreate(BaseModel):
+    unidade_id: int
+    nome: str
+    data_inicio: datetime
+    data_fim: datetime
+    valor_mensal: float
+    limite_usuarios: Optional[int] = None
+
+
+class ContratoUpdate(BaseModel):
+    nome: Optional[str] = None
+    data_inicio: Optional[datetime] = None
+    data_fim: Optional[datetime] = None
+    valor_mensal: Optional[float] = None
+    limite_usuarios: Optional[int] = None
+    status: Optional[str] = None
+
+
+class ContratoResponse(BaseModel):
+    id: int
+    unidade_id: int
+    nome: str
+    data_inicio: datetime
+    data_fim: datetime
+    valor_mensal: float
+    limite_usuarios: Optional[int] = None
+    status: str
+    
+    class Config:
+        from_attributes = True
+
+
+# ============================================================
+# Schemas Pydantic - Grupos
+# ============================================================
+
+
+class GrupoCreate(BaseModel):
+    nome: str
+    descricao: Optional[str] = None
+    status: str = "ativo"
+    criterios: Optional[dict] = None
+    cor: str = "#62b1ca"
+    jornada_id: Optional[int] = None
+    automacao_ativa: bool = False
+    tipo_grupo: str = "manual"
+
+
+class GrupoUpdate(BaseModel):
+    nome: Optional[str] = None
+    descricao: Optional[str] = None
+    status: Optional[str] = None
+    criterios: Optional[dict] = None
+    cor: Optional[str] = None
+    jornada_id: Optional[int] = None
+    automacao_ativa: Optional[bool] = None
+    tamanho_atual: Optional[int] = None
+    crescimento_semanal: Optional[float] = None
+
+
+# ============================================================
+# Schemas Pydantic - Jornadas e Automação
+# ============================================================
+
+
+class JornadaBase(BaseModel):
+    nome: str
+    descricao: Optional[str] = None
+    gatilho_evento: str = Field(..., description="Evento que inicia a jornada (ex: USUARIO_CRIADO, CHURN_ALERTA)")
+    ativa: Optional[bool] = True
+
+
+class JornadaCreate(JornadaBase):
+    pass
+
+
+class JornadaUpdate(BaseModel):
+    nome: Optional[str] = None
+    descricao: Optional[str] = None
+    gatilho_evento: Optional[str] = None
+    ativa: Optional[bool] = None
+
+
+class JornadaInDB(JornadaBase):
+    id: int
+    unidade_id: Optional[int] = None
+    criado_por_id: Optional[int] = None
+    data_criacao: datetime
+    data_atualizacao: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class EtapaJornadaBase(BaseModel):
+    nome: str
+    ordem: int
+    acao_tipo: str = Field(..., description="Tipo de ação (ex: ENVIAR_EMAIL, CRIAR_TAREFA, MUDAR_STATUS)")
+    acao_config: dict = Field(..., description="Configuração JSON da ação")
+
+
+class EtapaJornadaCreate(EtapaJornadaBase):
+    pass
+
+
+class EtapaJornadaUpdate(BaseModel):
+    nome: Optional[str] = None
+    ordem: Optional[int] = None
+    acao_tipo: Optional[str] = None
+    acao_config: Optional[dict] = None
+
+
+class EtapaJornadaInDB(EtapaJornadaBase):
+    id: int
+    jornada_id: int
+    
+    class Config:
+        from_attributes = True
+
+
+class UsuarioJornadaInDB(BaseModel):
+    id: int
+    usuario_id: int
+    jornada_id: int
+    etapa_atual_id: Optional[int] = None
+    data_inicio: datetime
+    data_conclusao: Optional[datetime] = None
+    concluida: bool
+    
+    class Config:
+        from_attributes = True
@@ -0,0 +1,294 @@
+"""
+Jobs de treinamento de churn em pool de processos e agendamento noturno
+"""
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+import asyncio
+import threading
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from vivio.churn import treinar_modelo_churn
+from vivio.config import (
+    CHURN_TREINO_HEARTBEAT_SEGUNDOS, CHURN_TREINO_HORA, CHURN_TREINO_JOB_EXPIRA_SEGUNDOS,
+    CHURN_TREINO_PROCESSOS)
+from vivio.database import SessionLocal
+from vivio.models import JobTreinamento, Unidade
+
+
+# ============================================================
+# Jobs de Treinamento de Churn (pool de processos)
+# ============================================================
+
+_pool_treinamento = None
+_pool_treinamento_lock = threading.Lock()
+
+# Jobs enviados ao pool deste processo e ainda não finalizados. O heartbeat
+# deles mostra aos outros processos que não foram abandonados
+_jobs_locais = set()
+_heartbeat_thread = None
+
+STATUS_JOB_ATIVO = ["PENDENTE", "EXECUTANDO"]
+
+
+def obter_pool_treinamento() -> ProcessPoolExecutor:
+    """Pool de processos (spawn) criado sob demanda para os treinamentos"""
+    global _pool_treinamento
+    with _pool_treinamento_lock:
+        if _pool_treinamento is None:
+            _pool_treinamento = ProcessPoolExecutor(
+                max_workers=CHURN_TREINO_PROCESSOS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool_treinamento
+
+
+def encerrar_pool_treinamento():
+    global _pool_treinamento
+    with _pool_treinamento_lock:
+        if _pool_treinamento is not None:
+            _pool_treinamento.shutdown(wait=False, cancel_futures=True)
+            _pool_treinamento = None
+
+
+def _manter_heartbeat_jobs():
+    """Thread do processo dono: renova heartbeat_em dos jobs locais ativos"""
+    while True:
+        time.sleep(CHURN_TREINO_HEARTBEAT_SEGUNDOS)
+        with _pool_treinamento_lock:
+            job_ids = list(_jobs_locais)
+        if not job_ids:
+            continue
+        db = SessionLocal()
+        try:
+            db.query(JobTreinamento).filter(
+                JobTreinamento.id.in_(job_ids),
+                JobTreinamento.status.in_(STATUS_JOB_ATIVO)
+            ).update({"heartbeat_em": datetime.utcnow()}, synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            print(f"[ERRO] Falha ao renovar heartbeat dos jobs de treinamento: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+
+def _registrar_job_local(job_id: int):
+    global _heartbeat_thread
+    with _pool_treinamento_lock:
+        _jobs_locais.add(job_id)
+        if _heartbeat_thread is None:
+            _heartbeat_thread = threading.Thread(target=_manter_heartbeat_jobs,
+                                                 name="heartbeat_treinamento", daemon=True)
+            _heartbeat_thread.start()
+
+
+def atualizar_job_treinamento(db: Session, job_id: int, **campos):
+    db.query(JobTreinamento).filter(JobTreinamento.id == job_id).update(
+        campos, synchronize_session=False
+    )
+    db.commit()
+
+
+def executar_job_treinamento(job_id: int, chunksize: int = None):
+    """Executa um job de treinamento dentro de um processo do pool"""
+    db = SessionLocal()
+    try:
+        job = db.query(JobTreinamento).get(job_id)
+        if not job:
+            return
+        
+        atualizar_job_treinamento(db, job_id, status="EXECUTANDO", progresso=0,
+                                  etapa="Iniciando", data_inicio=datetime.utcnow())
+        
+        def progresso(percentual, etapa):
+            atualizar_job_treinamento(db, job_id, progresso=percentual, etapa=etapa)
+        
+        resultado = treinar_modelo_churn(db, job.unidade_id, chunksize=chunksize, progresso=progresso)
+        
+        atualizar_job_treinamento(
+            db, job_id,
+            status="CONCLUIDO" if resultado["sucesso"] else "ERRO",
+            progresso=100,
+            etapa="Finalizado",
+            mensagem=resultado["mensagem"],
+            data_fim=datetime.utcnow()
+        )
+    except Exception as e:
+        db.rollback()
+        atualizar_job_treinamento(db, job_id, status="ERRO", etapa="Falha",
+                                  mensagem=str(e), data_fim=datetime.utcnow())
+    finally:
+        db.close()
+
+
+def _finalizar_job_treinamento(job_id: int, futuro):
+    """
+    Callback do pool: se o processo morreu (ou o job foi cancelado) antes de
+    registrar o resultado, marca o job como ERRO
+    """
+    with _pool_treinamento_lock:
+        _jobs_locais.discard(job_id)
+
+    erro = "Job cancelado" if futuro.cancelled() else futuro.exception()
+    if not erro:
+        return
+    
+    print(f"[ERRO] Job de treinamento {job_id} interrompido: {erro}")
+    db = SessionLocal()
+    try:
+        db.query(JobTreinamento).filter(
+            JobTreinamento.id == job_id,
+            JobTreinamento.status.in_(STATUS_JOB_ATIVO)
+        ).update({
+            "status": "ERRO",
+            "mensagem": str(erro),
+            "data_fim": datetime.utcnow()
+        }, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+    
+    # Um processo morto quebra o pool inteiro: força a criação de um novo
+    if isinstance(erro, BrokenProcessPool):
+        encerrar_pool_treinamento()
+
+
+def _job_ativo(db: Session, unidade_id: int):
+    return db.query(JobTreinamento).filter(
+        JobTreinamento.unidade_id == unidade_id,
+        JobTreinamento.status.in_(STATUS_JOB_ATIVO)
+    ).first()
+
+
+def enfileirar_job_treinamento(db: Session, unidade_id: int, origem: str = "MANUAL",
+                               chunksize: int = None) -> JobTreinamento:
+    """
+    Cria o job e o envia ao pool de processos. Se a unidade já tem um job
+    pendente ou em execução, ele é retornado no lugar de um novo
+    """
+    expirar_jobs_treinamento(db, unidade_id)
+    existente = _job_ativo(db, unidade_id)
+    if existente:
+        return existente
+    
+    job = JobTreinamento(unidade_id=unidade_id, origem=origem, etapa="Na fila",
+                         heartbeat_em=datetime.utcnow())
+    db.add(job)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Outro processo enfileirou um job para a unidade entre a consulta e o
+        # INSERT (índice único ux_jobs_treinamento_unidade_ativo)
+        db.rollback()
+        existente = _job_ativo(db, unidade_id)
+        if existente is None:
+            raise
+        return existente
+    db.refresh(job)
+    
+    _registrar_job_local(job.id)
+    futuro = obter_pool_treinamento().submit(executar_job_treinamento, job.id, chunksize)
+    futuro.add_done_callback(lambda f, job_id=job.id: _finalizar_job_treinamento(job_id, f))
+    
+    print(f"[IA] Job de treinamento {job.id} enfileirado para unidade {unidade_id} ({origem})")
+    return job
+
+
+def expirar_jobs_treinamento(db: Session, unidade_id: int = None) -> int:
+    """
+    Marca como ERRO os jobs ativos sem heartbeat há mais de
+    CHURN_TREINO_JOB_EXPIRA_SEGUNDOS: o processo dono caiu e eles não vão
+    terminar. Jobs de outros processos vivos não são tocados
+    """
+    limite = datetime.utcnow() - timedelta(seconds=CHURN_TREINO_JOB_EXPIRA_SEGUNDOS)
+    query = db.query(JobTreinamento).filter(
+        JobTreinamento.status.in_(STATUS_JOB_ATIVO),
+        func.coalesce(JobTreinamento.heartbeat_em, JobTreinamento.data_inicio,
+                      JobTreinamento.data_criacao) < limite
+    )
+    if unidade_id is not None:
+        query = query.filter(JobTreinamento.unidade_id == unidade_id)
+    total = query.update({
+        "status": "ERRO",
+        "mensagem": "Interrompido: processo do job parou de responder",
+        "data_fim": datetime.utcnow()
+    }, synchronize_session=False)
+    db.commit()
+    return total
+
+
+def recuperar_jobs_treinamento_interrompidos():
+    """Jobs que estavam ativos em um processo que parou não vão terminar"""
+    db = SessionLocal()
+    try:
+        total = expirar_jobs_treinamento(db)
+        if total:
+            print(f"⚠️ {total} job(s) de treinamento interrompido(s) marcados como ERRO")
+    finally:
+        db.close()
+
+
+def serializar_job_treinamento(job: JobTreinamento) -> dict:
+    return {
+        "job_id": job.id,
+        "unidade_id": job.unidade_id,
+        "status": job.status,
+        "progresso": job.progresso,
+        "etapa": job.etapa,
+        "origem": job.origem,
+        "mensagem": job.mensagem,
+        "data_criacao": job.data_criacao.isoformat() if job.data_criacao else None,
+        "data_inicio": job.data_inicio.isoformat() if job.data_inicio else None,
+        "data_fim": job.data_fim.isoformat() if job.data_fim else None
+    }
+
+
+def enfileirar_treino_todas_unidades(origem: str = "AGENDADO", desde: datetime = None) -> list:
+    """
+    Enfileira um job por unidade; o pool os executa em paralelo. Com desde,
+    pula as unidades que já têm job da mesma origem criado a partir dele
+    """
+    db = SessionLocal()
+    try:
+        query = db.query(Unidade.id)
+        if desde is not None:
+            query = query.filter(~db.query(JobTreinamento.id).filter(
+                JobTreinamento.unidade_id == Unidade.id,
+                JobTreinamento.origem == origem,
+                JobTreinamento.data_criacao >= desde
+            ).exists())
+        unidade_ids = [u.id for u in query.all()]
+        return [enfileirar_job_treinamento(db, uid, origem=origem).id for uid in unidade_ids]
+    finally:
+        db.close()
+
+
+def segundos_ate_proximo_treino(agora: datetime) -> float:
+    hora, minuto = [int(p) for p in CHURN_TREINO_HORA.split(":")]
+    proximo = agora.replace(hour=hora, minute=minuto, second=0, microsecond=0)
+    if proximo <= agora:
+        proximo += timedelta(days=1)
+    return (proximo - agora).total_seconds()
+
+
+async def agendador_treino_churn():
+    """
+    Dispara o treinamento de todas as unidades uma vez por dia em
+    CHURN_TREINO_HORA. Com vários processos de tarefas, todos acordam no mesmo
+    horário: o primeiro enfileira e os demais pulam as unidades que já têm
+    job agendado nas últimas 12 horas (e o índice único barra a corrida)
+    """
+    print(f"[IA] Treinamento noturno de churn agendado para {CHURN_TREINO_HORA}")
+    while True:
+        await asyncio.sleep(segundos_ate_proximo_treino(datetime.now()))
+        try:
+            job_ids = await asyncio.to_thread(enfileirar_treino_todas_unidades, "AGENDADO",
+                                              datetime.utcnow() - timedelta(hours=12))
+            print(f"[IA] Treinamento noturno: {len(job_ids)} job(s) enfileirado(s)")
+        except Exception as e:
+            print(f"[ERRO] Falha ao agendar treinamento noturno: {e}")